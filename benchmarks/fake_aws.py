@@ -0,0 +1,478 @@
+"""
+In-process fake of the ECS, EC2 and SSM APIs used by ecsctl.
+
+The fake answers calls of real botocore clients: it hooks the client event
+system the same way ``botocore.stub.Stubber`` does, so requests still go
+through parameter validation, event handlers, instrumentation and error
+handling, and only the HTTP round trip is replaced. Unlike a stub it holds a
+generated cluster and answers any sequence of calls, enforcing the page sizes
+and batch limits of the real services. A configurable latency is slept in
+the calling thread, so concurrent fan-outs overlap exactly like network
+calls do.
+
+Example:
+    >>> fake = FakeAWS(services=1000, tasks=10000, hosts=500, latency=0.02)
+    >>> ecs = fake.session('ap-southeast-1').client('ecs')
+    >>> ecs.list_tasks(cluster=fake.cluster_name)['taskArns'][:1]
+    ['arn:aws:ecs:ap-southeast-1:123456789012:task/bench/00000000000000000000000000000000']
+"""
+
+import copy
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.session import Session as BotocoreSession
+
+ACCOUNT_ID = '123456789012'
+
+# Page sizes of the list operations: (default, maximum)
+PAGE_SIZES = {
+    'ListClusters': (100, 100),
+    'ListServices': (10, 100),
+    'ListTasks': (100, 100),
+    'ListContainerInstances': (100, 100),
+    'ListTaskDefinitions': (100, 100),
+    'ListTaskDefinitionFamilies': (100, 100),
+    'DescribeInstanceInformation': (10, 50),
+}
+
+# Maximum number of items accepted by a describe call
+BATCH_LIMITS = {
+    'DescribeServices': ('services', 10),
+    'DescribeTasks': ('tasks', 100),
+    'DescribeContainerInstances': ('containerInstances', 100),
+    'DescribeInstances': ('InstanceIds', 1000),
+}
+
+# Key of the API parameters in botocore's per-call request context
+_PARAMS_KEY = 'fake_aws_params'
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+# Cluster query language attributes of list_container_instances, read from
+# the EC2 instance
+_QUERY_ATTRIBUTES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'ec2InstanceId': lambda instance: instance['InstanceId'],
+    'attribute:ecs.instance-type': lambda instance: instance['InstanceType'],
+    'attribute:ecs.availability-zone': lambda instance: instance['Placement']['AvailabilityZone'],
+}
+
+
+class FakeAWSError(Exception):
+    """A service error returned by the fake.
+
+    Attributes:
+        code (str): AWS error code, e.g. ``InvalidParameterException``
+        status (int): HTTP status of the error response
+    """
+
+    def __init__(self, code: str, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+
+class FakeAWS:
+    """A generated ECS cluster served through botocore clients.
+
+    Tasks are spread evenly over services and hosts; every task runs one or
+    two containers. Each service has its own task definition family with
+    ``revisions`` revisions. SSM knows ``ssm_coverage`` of the hosts, of
+    which all but every tenth are online.
+
+    Attributes:
+        cluster_name (str): Name of the generated cluster
+        latency (float): Seconds slept per call
+        calls (Dict[str, int]): Number of calls per operation
+    """
+
+    def __init__(
+        self,
+        services: int = 1000,
+        tasks: int = 10000,
+        hosts: int = 500,
+        revisions: int = 3,
+        latency: float = 0.0,
+        cluster_name: str = 'bench',
+        region: str = 'ap-southeast-1',
+        ssm_coverage: float = 0.9
+    ) -> None:
+        self.cluster_name = cluster_name
+        self.region = region
+        self.latency = latency
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._generate(services, tasks, hosts, revisions, ssm_coverage)
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            'ListClusters': self._list_clusters,
+            'ListServices': self._list_services,
+            'DescribeServices': self._describe_services,
+            'ListTasks': self._list_tasks,
+            'DescribeTasks': self._describe_tasks,
+            'ListContainerInstances': self._list_container_instances,
+            'DescribeContainerInstances': self._describe_container_instances,
+            'ListTaskDefinitions': self._list_task_definitions,
+            'ListTaskDefinitionFamilies': self._list_task_definition_families,
+            'DescribeTaskDefinition': self._describe_task_definition,
+            'DescribeInstances': self._describe_instances,
+            'DescribeInstanceInformation': self._describe_instance_information,
+        }
+
+    def _arn(self, resource: str) -> str:
+        return f'arn:aws:ecs:{self.region}:{ACCOUNT_ID}:{resource}'
+
+    def _generate(
+        self,
+        services: int,
+        tasks: int,
+        hosts: int,
+        revisions: int,
+        ssm_coverage: float
+    ) -> None:
+        """Build the cluster; ARNs are ordered like the listings return them."""
+        self.cluster_arns = [self._arn(f'cluster/{self.cluster_name}')]
+
+        self.instances: Dict[str, Dict[str, Any]] = {}
+        self.container_instances: Dict[str, Dict[str, Any]] = {}
+        for n in range(hosts):
+            instance_id = f'i-{n:017x}'
+            arn = self._arn(f'container-instance/{self.cluster_name}/{n:032x}')
+            self.instances[instance_id] = {
+                'InstanceId': instance_id,
+                'InstanceType': 'm5.xlarge',
+                'State': {'Code': 16, 'Name': 'running'},
+                'Placement': {'AvailabilityZone': f'{self.region}{"abc"[n % 3]}'},
+                'Tags': [{'Key': 'pool', 'Value': f'pool-{n % 5}'}],
+                'PrivateIpAddress': f'10.0.{n // 256}.{n % 256}',
+                'LaunchTime': _EPOCH,
+            }
+            self.container_instances[arn] = {
+                'containerInstanceArn': arn,
+                'ec2InstanceId': instance_id,
+                'status': 'ACTIVE',
+                'agentConnected': True,
+                'runningTasksCount': 0,
+                'pendingTasksCount': 0,
+                'registeredResources': [
+                    {'name': 'CPU', 'type': 'INTEGER', 'integerValue': 4096},
+                    {'name': 'MEMORY', 'type': 'INTEGER', 'integerValue': 15576},
+                ],
+                'remainingResources': [
+                    {'name': 'CPU', 'type': 'INTEGER', 'integerValue': 4096},
+                    {'name': 'MEMORY', 'type': 'INTEGER', 'integerValue': 15576},
+                ],
+            }
+        host_arns = list(self.container_instances)
+
+        self.task_definitions: Dict[str, Dict[str, Any]] = {}
+        self.services: Dict[str, Dict[str, Any]] = {}
+        for n in range(services):
+            family = f'svc-{n:05d}'
+            for revision in range(1, revisions + 1):
+                arn = self._arn(f'task-definition/{family}:{revision}')
+                self.task_definitions[arn] = {
+                    'taskDefinitionArn': arn,
+                    'family': family,
+                    'revision': revision,
+                    'status': 'ACTIVE',
+                    'cpu': '256',
+                    'memory': '512',
+                    'containerDefinitions': [{'name': 'app', 'image': f'{family}:{revision}'}],
+                    'registeredAt': _EPOCH + timedelta(days=revision),
+                }
+            arn = self._arn(f'service/{self.cluster_name}/{family}')
+            self.services[arn] = {
+                'serviceArn': arn,
+                'serviceName': family,
+                'clusterArn': self.cluster_arns[0],
+                'status': 'ACTIVE',
+                'taskDefinition': self._arn(f'task-definition/{family}:{revisions}'),
+                'desiredCount': 0,
+                'runningCount': 0,
+                'pendingCount': 0,
+                'launchType': 'EC2',
+                'schedulingStrategy': 'DAEMON' if n % 50 == 49 else 'REPLICA',
+                'deployments': [{'id': f'ecs-svc/{n}', 'status': 'PRIMARY'}],
+                'tags': [{'key': 'team', 'value': f'team-{n % 7}'}],
+            }
+        service_arns = list(self.services)
+
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        for n in range(tasks):
+            arn = self._arn(f'task/{self.cluster_name}/{n:032x}')
+            service = self.services[service_arns[n % len(service_arns)]] if service_arns else None
+            host = self.container_instances[host_arns[n % len(host_arns)]] if host_arns else None
+            self.tasks[arn] = {
+                'taskArn': arn,
+                'clusterArn': self.cluster_arns[0],
+                'taskDefinitionArn': service['taskDefinition'] if service else '',
+                'group': f"service:{service['serviceName']}" if service else 'family:adhoc',
+                'containerInstanceArn': host['containerInstanceArn'] if host else None,
+                'lastStatus': 'RUNNING',
+                'desiredStatus': 'RUNNING',
+                'launchType': 'EC2',
+                'tags': service['tags'] if service else [],
+                'cpu': '256',
+                'memory': '512',
+                'createdAt': _EPOCH + timedelta(seconds=n),
+                'containers': [
+                    {'name': f'container-{c}', 'lastStatus': 'RUNNING', 'cpu': '128', 'memory': '256'}
+                    for c in range(1 + n % 2)
+                ],
+            }
+            if service:
+                service['desiredCount'] += 1
+                service['runningCount'] += 1
+            if host:
+                host['runningTasksCount'] += 1
+                for resource, used in (('CPU', 256), ('MEMORY', 512)):
+                    remaining = next(r for r in host['remainingResources'] if r['name'] == resource)
+                    remaining['integerValue'] = max(0, remaining['integerValue'] - used)
+
+        self.ssm_instances = {
+            instance_id: 'ConnectionLost' if n % 10 == 9 else 'Online'
+            for n, instance_id in enumerate(self.instances)
+            if n < int(hosts * ssm_coverage)
+        }
+
+    def session(self, region: Optional[str] = None) -> boto3.Session:
+        """Return a boto3 session whose clients are answered by the fake."""
+        botocore_session = BotocoreSession()
+        botocore_session.set_credentials('fake-access-key', 'fake-secret-key')
+        botocore_session.register('before-parameter-build.*.*', self._capture_params)
+        botocore_session.register('before-call.*.*', self._respond)
+        return boto3.Session(botocore_session=botocore_session, region_name=region or self.region)
+
+    @property
+    def total_calls(self) -> int:
+        """Number of calls answered so far."""
+        with self._lock:
+            return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        """Forget the calls answered so far."""
+        with self._lock:
+            self.calls.clear()
+
+    def _capture_params(self, params: Dict[str, Any], context: Dict[str, Any], **kwargs: Any) -> None:
+        # before-call only sees the serialized request; keep the API parameters
+        context[_PARAMS_KEY] = dict(params)
+
+    def _respond(self, model: Any, context: Dict[str, Any], **kwargs: Any) -> Tuple[AWSResponse, Dict[str, Any]]:
+        """Answer a call in place of the HTTP round trip."""
+        operation = model.name
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        params = context.get(_PARAMS_KEY, {})
+        try:
+            handler = self._handlers.get(operation)
+            if handler is None:
+                raise FakeAWSError('UnsupportedOperation', f'{operation} is not faked')
+            self._check_batch(operation, params)
+            # Like a parsed HTTP body, every response is a fresh object, so
+            # callers holding on to it are charged for its memory
+            parsed = copy.deepcopy(handler(params))
+            status = 200
+        except FakeAWSError as e:
+            parsed = {'Error': {'Code': e.code, 'Message': str(e)}}
+            status = e.status
+        parsed['ResponseMetadata'] = {'HTTPStatusCode': status, 'RetryAttempts': 0}
+        return AWSResponse('https://fake.amazonaws.com/', status, {}, None), parsed
+
+    def _check_batch(self, operation: str, params: Dict[str, Any]) -> None:
+        if operation in BATCH_LIMITS:
+            key, limit = BATCH_LIMITS[operation]
+            if len(params.get(key, [])) > limit:
+                raise FakeAWSError(
+                    'InvalidParameterException', f'{key} cannot contain more than {limit} items'
+                )
+
+    def _page(
+        self,
+        operation: str,
+        items: List[Any],
+        params: Dict[str, Any],
+        result_key: str,
+        token_key: str = 'nextToken',
+        size_key: str = 'maxResults'
+    ) -> Dict[str, Any]:
+        """Return one page of a listing with the service's page size limits."""
+        default, maximum = PAGE_SIZES[operation]
+        size = params.get(size_key, default)
+        if not 1 <= size <= maximum:
+            raise FakeAWSError(
+                'InvalidParameterException', f'{size_key} must be between 1 and {maximum}'
+            )
+        try:
+            start = int(params.get(token_key) or 0)
+        except ValueError:
+            raise FakeAWSError('InvalidParameterException', 'Invalid token')
+        response = {result_key: items[start:start + size]}
+        if start + size < len(items):
+            response[token_key] = str(start + size)
+        return response
+
+    def _check_cluster(self, params: Dict[str, Any]) -> None:
+        cluster = params.get('cluster', 'default')
+        if cluster not in (self.cluster_name, self.cluster_arns[0]):
+            raise FakeAWSError('ClusterNotFoundException', 'Cluster not found.')
+
+    def _list_clusters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._page('ListClusters', self.cluster_arns, params, 'clusterArns')
+
+    def _list_services(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        arns = [
+            arn for arn, service in self.services.items()
+            if all(params.get(key) in (None, service[key]) for key in ('launchType', 'schedulingStrategy'))
+        ]
+        return self._page('ListServices', arns, params, 'serviceArns')
+
+    def _describe_services(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        by_name = {service['serviceName']: service for service in self.services.values()}
+        found, failures = [], []
+        for service in params['services']:
+            match = self.services.get(service) or by_name.get(service)
+            if match:
+                described = dict(match)
+                if 'TAGS' not in params.get('include', []):
+                    described.pop('tags', None)
+                found.append(described)
+            else:
+                failures.append({'arn': service, 'reason': 'MISSING'})
+        return {'services': found, 'failures': failures}
+
+    def _list_tasks(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        desired_status = params.get('desiredStatus', 'RUNNING')
+        service = params.get('serviceName')
+        container_instance = params.get('containerInstance')
+        launch_type = params.get('launchType')
+        family = params.get('family')
+        arns = [
+            arn for arn, task in self.tasks.items()
+            if task['desiredStatus'] == desired_status
+            and (service is None or task['group'] == f'service:{service}')
+            and (container_instance is None or task['containerInstanceArn'] == container_instance
+                 or task['containerInstanceArn'].endswith(f'/{container_instance}'))
+            and (launch_type is None or task['launchType'] == launch_type)
+            and (family is None or task['taskDefinitionArn'].split('/')[-1].split(':')[0] == family)
+        ]
+        return self._page('ListTasks', arns, params, 'taskArns')
+
+    def _describe_tasks(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        include_tags = 'TAGS' in params.get('include', [])
+        return {
+            'tasks': [
+                self.tasks[arn] if include_tags
+                else {key: value for key, value in self.tasks[arn].items() if key != 'tags'}
+                for arn in params['tasks'] if arn in self.tasks
+            ],
+            'failures': [{'arn': arn, 'reason': 'MISSING'} for arn in params['tasks'] if arn not in self.tasks],
+        }
+
+    def _list_container_instances(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        instances = list(self.container_instances.values())
+        expression = params.get('filter')
+        if expression:
+            # Only (in)equalities on a few attributes, joined with 'and'
+            for condition in expression.split(' and '):
+                field, operator, value = condition.split()
+                attribute = _QUERY_ATTRIBUTES.get(field)
+                if attribute is None or operator not in ('==', '!='):
+                    raise FakeAWSError('InvalidParameterException', f'Unsupported filter: {expression}')
+                instances = [
+                    instance for instance in instances
+                    if (attribute(self.instances[instance['ec2InstanceId']]) == value) == (operator == '==')
+                ]
+        status = params.get('status')
+        if status:
+            instances = [instance for instance in instances if instance['status'] == status]
+        arns = [instance['containerInstanceArn'] for instance in instances]
+        return self._page('ListContainerInstances', arns, params, 'containerInstanceArns')
+
+    def _describe_container_instances(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cluster(params)
+        arns = params['containerInstances']
+        return {
+            'containerInstances': [
+                self.container_instances[arn] for arn in arns if arn in self.container_instances
+            ],
+            'failures': [
+                {'arn': arn, 'reason': 'MISSING'} for arn in arns if arn not in self.container_instances
+            ],
+        }
+
+    def _list_task_definitions(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        prefix = params.get('familyPrefix', '')
+        arns = [
+            arn for arn, td in self.task_definitions.items()
+            if td['family'].startswith(prefix) and td['status'] == params.get('status', 'ACTIVE')
+        ]
+        if params.get('sort') == 'DESC':
+            arns.reverse()
+        return self._page('ListTaskDefinitions', arns, params, 'taskDefinitionArns')
+
+    def _list_task_definition_families(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        prefix = params.get('familyPrefix', '')
+        families = list(dict.fromkeys(
+            td['family'] for td in self.task_definitions.values() if td['family'].startswith(prefix)
+        ))
+        return self._page('ListTaskDefinitionFamilies', families, params, 'families')
+
+    def _describe_task_definition(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params['taskDefinition']
+        if name in self.task_definitions:
+            return {'taskDefinition': self.task_definitions[name]}
+        family, _, revision = name.rpartition('/')[-1].partition(':')
+        revisions = [
+            td for td in self.task_definitions.values()
+            if td['family'] == family and (not revision or str(td['revision']) == revision)
+        ]
+        if not revisions:
+            raise FakeAWSError('ClientException', 'Unable to describe task definition.')
+        return {'taskDefinition': max(revisions, key=lambda td: td['revision'])}
+
+    def _describe_instances(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        instance_ids = params.get('InstanceIds', [])
+        if 'MaxResults' in params and instance_ids:
+            raise FakeAWSError(
+                'InvalidParameterCombination', 'MaxResults cannot be used with InstanceIds'
+            )
+        missing = [instance_id for instance_id in instance_ids if instance_id not in self.instances]
+        if missing:
+            raise FakeAWSError('InvalidInstanceID.NotFound', f"The instance IDs '{', '.join(missing)}' do not exist")
+        instances = [self.instances[instance_id] for instance_id in instance_ids]
+        # Instances launched together share a reservation
+        return {'Reservations': [
+            {'ReservationId': f'r-{n:017x}', 'Instances': instances[n:n + 10]}
+            for n in range(0, len(instances), 10)
+        ]}
+
+    def _describe_instance_information(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        instance_ids = None
+        for instance_filter in params.get('Filters', []):
+            if instance_filter['Key'] == 'InstanceIds':
+                if len(instance_filter['Values']) > 100:
+                    raise FakeAWSError('ValidationException', 'InstanceIds filter accepts up to 100 values')
+                instance_ids = set(instance_filter['Values'])
+        information = [
+            {'InstanceId': instance_id, 'PingStatus': status}
+            for instance_id, status in self.ssm_instances.items()
+            if instance_ids is None or instance_id in instance_ids
+        ]
+        return self._page(
+            'DescribeInstanceInformation', information, params, 'InstanceInformationList',
+            token_key='NextToken', size_key='MaxResults'
+        )
@@ -0,0 +1,322 @@
+"""
+Scale benchmark of the ECSController methods against an in-process fake.
+
+Every benchmark runs a controller method on a fresh controller against a
+generated cluster (by default 1,000 services, 10,000 tasks and 500 hosts)
+served by ``benchmarks.fake_aws`` with a fixed latency per call, and reports:
+
+* wall time, measured in a plain run;
+* API calls, counted by the fake;
+* peak memory allocated during the call, measured with ``tracemalloc`` in a
+  second run (tracing slows Python down, so it is kept out of the timing).
+
+Each benchmark has a call budget derived from the cluster size, which is
+always enforced: exceeding it means a method started making calls per
+resource instead of per page or batch. Wall time and memory thresholds are
+calibrated for the default cluster, latency and concurrency and are only
+enforced with those settings. Any breach makes the run exit non-zero.
+
+Example:
+    $ python -m benchmarks.scale
+    $ python -m benchmarks.scale --only get_services --latency-ms 50
+    $ python -m benchmarks.scale --services 5000 --tasks 50000 --hosts 2000
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.fake_aws import FakeAWS
+from ecsctl.cache import RevisionStore
+from ecsctl.ecs_controller import ECSController
+from ecsctl.selectors import INSTANCE_FIELDS, SERVICE_FIELDS, TASK_FIELDS, Selector
+
+DEFAULT_SCALE = {'services': 1000, 'tasks': 10000, 'hosts': 500, 'revisions': 3}
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_CONCURRENCY = 16
+
+
+class Benchmark:
+    """A controller call with its budgets.
+
+    Attributes:
+        name (str): Benchmark name
+        call (Callable): Runs the call against a controller and the fake
+        max_calls (Callable): Call budget for the fake's cluster size
+        max_wall_ms (float): Wall time threshold at the default settings
+        max_peak_mb (float): Peak memory threshold at the default settings
+        setup (Optional[Callable]): Prepares the controller, not measured
+    """
+
+    __slots__ = ('name', 'call', 'max_calls', 'max_wall_ms', 'max_peak_mb', 'setup')
+
+    def __init__(
+        self,
+        name: str,
+        call: Callable[[ECSController, FakeAWS], Any],
+        max_calls: Callable[[Dict[str, int]], int],
+        max_wall_ms: float,
+        max_peak_mb: float,
+        setup: Optional[Callable[[ECSController, FakeAWS], Any]] = None
+    ) -> None:
+        self.name = name
+        self.call = call
+        self.max_calls = max_calls
+        self.max_wall_ms = max_wall_ms
+        self.max_peak_mb = max_peak_mb
+        self.setup = setup
+
+
+def pages(count: int, size: int = 100) -> int:
+    """Number of pages or batches needed for ``count`` items."""
+    return max(1, math.ceil(count / size))
+
+
+def _first_instance_id(fake: FakeAWS) -> str:
+    return next(iter(fake.instances))
+
+
+BENCHMARKS = [
+    Benchmark(
+        'get_clusters',
+        lambda ecs, fake: ecs.get_clusters(),
+        lambda scale: 1,
+        max_wall_ms=100, max_peak_mb=1
+    ),
+    Benchmark(
+        'get_ec2_instances',
+        lambda ecs, fake: ecs.get_ec2_instances(fake.cluster_name),
+        lambda scale: 3 * pages(scale['hosts']),
+        max_wall_ms=300, max_peak_mb=2
+    ),
+    Benchmark(
+        'get_ec2_instances_ssm',
+        lambda ecs, fake: ecs.get_ec2_instances(fake.cluster_name, ssm=True),
+        lambda scale: 3 * pages(scale['hosts']) + pages(scale['hosts'], 50),
+        max_wall_ms=350, max_peak_mb=2
+    ),
+    Benchmark(
+        'get_services',
+        lambda ecs, fake: ecs.get_services(fake.cluster_name),
+        lambda scale: (pages(scale['services']) + pages(scale['services'], 10)
+                       + 2 * pages(scale['tasks']) + 2 * pages(scale['hosts'])),
+        max_wall_ms=4000, max_peak_mb=6
+    ),
+    Benchmark(
+        'get_services_by_name',
+        lambda ecs, fake: ecs.get_services(
+            fake.cluster_name, fields=Selector.parse('name=svc-00000', SERVICE_FIELDS)
+        ),
+        lambda scale: 2 + 2 * pages(scale['tasks'] / max(1, scale['services'])),
+        max_wall_ms=150, max_peak_mb=1
+    ),
+    Benchmark(
+        'get_services_by_label',
+        lambda ecs, fake: ecs.get_services(fake.cluster_name, labels=Selector.parse('team=team-0')),
+        lambda scale: (pages(scale['services']) + pages(scale['services'], 10)
+                       + 2 * pages(scale['tasks']) + 2 * pages(scale['hosts'])),
+        max_wall_ms=4000, max_peak_mb=6
+    ),
+    Benchmark(
+        'get_services_by_label_warm',
+        lambda ecs, fake: ecs.get_services(fake.cluster_name, labels=Selector.parse('team=team-0')),
+        # Services of one team of 7, with a task listing per service or one snapshot
+        lambda scale: (pages(scale['services']) + pages(scale['services'] / 7, 10)
+                       + max(2 * pages(scale['tasks']),
+                             math.ceil(scale['services'] / 7) + pages(scale['tasks'] / 7))),
+        max_wall_ms=3500, max_peak_mb=6,
+        setup=lambda ecs, fake: ecs.get_services(fake.cluster_name, labels=Selector.parse('team=team-0'))
+    ),
+    Benchmark(
+        'get_ec2_instances_by_zone',
+        lambda ecs, fake: ecs.get_ec2_instances(
+            fake.cluster_name,
+            fields=Selector.parse(f'availabilityZone={fake.region}a', INSTANCE_FIELDS)
+        ),
+        lambda scale: 3 * pages(scale['hosts'] / 3),
+        max_wall_ms=200, max_peak_mb=2
+    ),
+    Benchmark(
+        'get_containers',
+        lambda ecs, fake: ecs.get_containers(fake.cluster_name),
+        lambda scale: 2 * pages(scale['tasks']) + 2 * pages(scale['hosts']),
+        max_wall_ms=3500, max_peak_mb=6
+    ),
+    Benchmark(
+        'get_containers_service',
+        lambda ecs, fake: ecs.get_containers(fake.cluster_name, service='svc-00000'),
+        lambda scale: 2 * pages(scale['tasks'] / max(1, scale['services'])) + 1,
+        max_wall_ms=150, max_peak_mb=1
+    ),
+    Benchmark(
+        'get_containers_instance',
+        lambda ecs, fake: ecs.get_containers(fake.cluster_name, instance_id=_first_instance_id(fake)),
+        # Filtered lookup and one describe of the host, then its tasks
+        lambda scale: 2 + 2 * pages(scale['tasks'] / max(1, scale['hosts'])),
+        max_wall_ms=150, max_peak_mb=1
+    ),
+    Benchmark(
+        'get_containers_by_field',
+        lambda ecs, fake: ecs.get_containers(
+            fake.cluster_name, fields=Selector.parse('family=svc-00000,launchType=EC2', TASK_FIELDS)
+        ),
+        lambda scale: 2 * pages(scale['tasks'] / max(1, scale['services'])) + 1,
+        max_wall_ms=150, max_peak_mb=1
+    ),
+    Benchmark(
+        'top_nodes',
+        lambda ecs, fake: ecs.get_capacity(fake.cluster_name, tasks=False).nodes(),
+        lambda scale: 2 * pages(scale['hosts']),
+        max_wall_ms=200, max_peak_mb=2
+    ),
+    Benchmark(
+        'top_services',
+        lambda ecs, fake: ecs.get_capacity(fake.cluster_name).services(),
+        lambda scale: 2 * pages(scale['hosts']) + 2 * pages(scale['tasks']),
+        max_wall_ms=3000, max_peak_mb=6
+    ),
+    Benchmark(
+        'get_task_definitions_latest',
+        lambda ecs, fake: ecs.get_task_definitions(latest=True),
+        lambda scale: pages(scale['services']) + scale['services'],
+        max_wall_ms=2500, max_peak_mb=4
+    ),
+    Benchmark(
+        'get_task_definitions_cold',
+        lambda ecs, fake: ecs.get_task_definitions(),
+        lambda scale: (pages(scale['services'] * scale['revisions'])
+                       + scale['services'] * scale['revisions']),
+        max_wall_ms=6500, max_peak_mb=8
+    ),
+    Benchmark(
+        'get_task_definitions_warm',
+        lambda ecs, fake: ecs.get_task_definitions(),
+        lambda scale: pages(scale['services'] * scale['revisions']),
+        max_wall_ms=1000, max_peak_mb=1,
+        setup=lambda ecs, fake: ecs.get_task_definitions()
+    ),
+    Benchmark(
+        'get_instance_details',
+        lambda ecs, fake: ecs.get_instance_details(fake.cluster_name, _first_instance_id(fake)),
+        lambda scale: 3,
+        max_wall_ms=150, max_peak_mb=1
+    ),
+    Benchmark(
+        'check_exec_target',
+        lambda ecs, fake: ecs.check_exec_target(fake.cluster_name, _first_instance_id(fake)),
+        lambda scale: 2,
+        max_wall_ms=100, max_peak_mb=1
+    ),
+    Benchmark(
+        'get_ssm_statuses',
+        lambda ecs, fake: ecs.get_ssm_statuses(list(fake.instances)),
+        lambda scale: pages(scale['hosts'], 50),
+        max_wall_ms=100, max_peak_mb=1
+    ),
+]
+
+
+def make_controller(fake: FakeAWS, concurrency: int, store_dir: str) -> ECSController:
+    """Create a controller whose clients are answered by the fake.
+
+    The clients are created up front: loading the service models costs more
+    than most of the calls measured and would otherwise be charged to the
+    first benchmark run on each controller.
+    """
+    ecs = ECSController(concurrency=concurrency, use_credential_cache=False)
+    ecs._session = fake.session(ecs.region)
+    ecs.revisions = RevisionStore(ecs.revisions.account, ecs.region, store_dir=Path(store_dir))
+    for service_name in ('ecs', 'ec2', 'ssm'):
+        ecs._client(service_name)
+    return ecs
+
+
+def measure(benchmark: Benchmark, fake: FakeAWS, concurrency: int) -> Dict[str, float]:
+    """Run a benchmark twice on fresh controllers: timed, then memory traced."""
+    results = {}
+    for traced in (False, True):
+        with tempfile.TemporaryDirectory() as store_dir:
+            ecs = make_controller(fake, concurrency, store_dir)
+            if benchmark.setup:
+                benchmark.setup(ecs, fake)
+            fake.reset_calls()
+            if traced:
+                tracemalloc.start()
+            start = time.perf_counter()
+            benchmark.call(ecs, fake)
+            elapsed = time.perf_counter() - start
+            if traced:
+                results['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            else:
+                results['wall_ms'] = elapsed * 1000
+                results['calls'] = fake.total_calls
+                results['errors'] = len(ecs.errors)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point; returns a non-zero status when a budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(f'--{name}', type=int, default=default,
+                            help=f'Size of the generated cluster (default: {default})')
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_LATENCY_MS,
+                        help='Latency of every fake API call')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Controller concurrency')
+    parser.add_argument('--only', action='append', metavar='NAME',
+                        help='Only run this benchmark; may be repeated')
+    parser.add_argument('--no-thresholds', action='store_true',
+                        help='Report wall time and memory without enforcing thresholds')
+    args = parser.parse_args(argv)
+
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+    calibrated = (
+        scale == DEFAULT_SCALE
+        and args.latency_ms == DEFAULT_LATENCY_MS
+        and args.concurrency == DEFAULT_CONCURRENCY
+        and not args.no_thresholds
+    )
+    benchmarks = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    unknown = set(args.only or []) - {b.name for b in BENCHMARKS}
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    fake = FakeAWS(latency=args.latency_ms / 1000, **scale)
+    print(f"{scale['services']} services, {scale['tasks']} tasks, {scale['hosts']} hosts, "
+          f"{scale['revisions']} revisions per family; {args.latency_ms:g} ms per call, "
+          f"concurrency {args.concurrency}"
+          f"{'' if calibrated else '; only call budgets enforced'}")
+    print(f"{'benchmark':<30} {'wall ms':>9} {'calls':>7} {'budget':>7} {'peak MB':>8}")
+
+    failed: List[str] = []
+    for benchmark in benchmarks:
+        result = measure(benchmark, fake, args.concurrency)
+        budget = benchmark.max_calls(scale)
+        breaches = []
+        if result['calls'] > budget:
+            breaches.append(f"{result['calls']} calls > {budget}")
+        if result['errors']:
+            breaches.append(f"{result['errors']} failed items")
+        if calibrated and result['wall_ms'] > benchmark.max_wall_ms:
+            breaches.append(f"{result['wall_ms']:.0f} ms > {benchmark.max_wall_ms:g} ms")
+        if calibrated and result['peak_mb'] > benchmark.max_peak_mb:
+            breaches.append(f"{result['peak_mb']:.1f} MB > {benchmark.max_peak_mb:g} MB")
+        print(f"{benchmark.name:<30} {result['wall_ms']:>9.1f} {result['calls']:>7} {budget:>7} "
+              f"{result['peak_mb']:>8.1f}{'  FAILED' if breaches else ''}")
+        failed.extend(f"{benchmark.name}: {breach}" for breach in breaches)
+
+    if failed:
+        print("\nScale budget exceeded:\n  " + "\n  ".join(failed), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Cold-start benchmark for the ecsctl command line.
+
+Runs ``--help``, ``--version`` and ``<command> --help`` for every subcommand
+in fresh processes and reports the median and best wall time. Help output is
+produced before any AWS call is made, so the numbers measure interpreter
+start-up, imports and command parsing only.
+
+Both the source tree (``python -m ecsctl.cli``) and the Nuitka onefile binary
+produced by ``build.sh`` can be measured. A budget makes the run fail when
+the median of any invocation regresses past it.
+
+Example:
+    $ python -m benchmarks.startup --runs 10 --budget-ms 250
+    $ bash build.sh && python -m benchmarks.startup --binary ./ecsctl-linux-amd64
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Median cold-start budget of a source invocation, in milliseconds
+DEFAULT_BUDGET_MS = 400.0
+
+
+def discover_invocations() -> List[List[str]]:
+    """List the argument vectors to benchmark, one per (sub)command."""
+    import click
+    from ecsctl.cli import cli
+
+    invocations = [['--help'], ['--version']]
+
+    def walk(group: click.Group, prefix: List[str]) -> None:
+        for name, command in sorted(group.commands.items()):
+            invocations.append(prefix + [name, '--help'])
+            if isinstance(command, click.Group):
+                walk(command, prefix + [name])
+
+    walk(cli, [])
+    return invocations
+
+
+def time_invocation(command: Sequence[str], args: Sequence[str], runs: int) -> List[float]:
+    """Run a command ``runs`` times and return the wall times in milliseconds.
+
+    Raises:
+        RuntimeError: If the command exits with a non-zero status
+    """
+    timings = []
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [*command, *args], capture_output=True, env=env, stdin=subprocess.DEVNULL
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"{' '.join([*command, *args])} exited with {result.returncode}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+    return timings
+
+
+def run(
+    command: Sequence[str],
+    label: str,
+    runs: int,
+    budget_ms: Optional[float]
+) -> Dict[str, float]:
+    """Benchmark every invocation of one target and print a report.
+
+    Returns:
+        Median wall time in milliseconds per invocation
+    """
+    print(f"\n{label}: {' '.join(command)} ({runs} runs)")
+    print(f"{'invocation':<40} {'median ms':>10} {'best ms':>10}")
+    medians = {}
+    for args in discover_invocations():
+        timings = time_invocation(command, args, runs)
+        name = ' '.join(args)
+        medians[name] = statistics.median(timings)
+        over = budget_ms is not None and medians[name] > budget_ms
+        print(f"{name:<40} {medians[name]:>10.1f} {min(timings):>10.1f}{'  OVER BUDGET' if over else ''}")
+    return medians
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point; returns a non-zero status when a budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Runs per invocation')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Maximum median wall time of a source invocation')
+    parser.add_argument('--binary', help='Also benchmark a binary built by build.sh')
+    parser.add_argument('--binary-budget-ms', type=float,
+                        help='Maximum median wall time of a binary invocation')
+    args = parser.parse_args(argv)
+
+    results = {'source': run([sys.executable, '-m', 'ecsctl.cli'], 'source', args.runs, args.budget_ms)}
+    budgets = {'source': args.budget_ms}
+    if args.binary:
+        results['binary'] = run([os.path.abspath(args.binary)], 'binary', args.runs,
+                                args.binary_budget_ms)
+        budgets['binary'] = args.binary_budget_ms
+
+    failed = [
+        f"{target}: {name} ({median:.1f} ms > {budgets[target]:.1f} ms)"
+        for target, medians in results.items()
+        if budgets[target] is not None
+        for name, median in medians.items()
+        if median > budgets[target]
+    ]
+    if failed:
+        print("\nStart-up budget exceeded:\n  " + "\n  ".join(failed), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,29 +2,16 @@
 ecsctl - A kubectl-like CLI tool for Amazon ECS
 """
 
-import os
-import tomli
-from pathlib import Path
-from typing import Optional
+# Keep in sync with [tool.poetry] version in pyproject.toml; a test enforces it.
+# Defined as a literal so importing ecsctl (and compiled binaries) never need
+# to locate and parse pyproject.toml.
+__version__ = "0.0.2"
 
 def get_version() -> str:
     """
-    Get the current version from pyproject.toml.
+    Get the current version of ecsctl.
     
     Returns:
-        str: Version string in the format "x.y.z" or "x.y.z-dev-hash"
-    
-    Raises:
-        FileNotFoundError: If pyproject.toml cannot be found
-        KeyError: If version information is missing from pyproject.toml
+        str: Version string in the format "x.y.z"
     """
-    try:
-        pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
-        with open(pyproject_path, "rb") as f:
-            pyproject_data = tomli.load(f)
-        return pyproject_data["tool"]["poetry"]["version"]
-    except (FileNotFoundError, KeyError) as e:
-        # Fallback version for when running from compiled binary
-        return "0.1.0"
-
-__version__ = get_version()
+    return __version__
@@ -0,0 +1,372 @@
+"""Asyncio front-end for ECS operations.
+
+boto3 has no native asyncio support, so ``AsyncECSController`` runs the
+blocking client calls on a small, bounded thread pool and awaits them. Every
+call also holds a semaphore slot, so pagination and batched describes can be
+fanned out with ``asyncio.gather`` without ever exceeding ``concurrency``
+requests in flight, regardless of how many clusters are inspected at once.
+
+Example:
+    >>> async with await AsyncECSController.create(concurrency=16) as ecs:
+    ...     prod, staging = await asyncio.gather(
+    ...         ecs.get_services('prod'), ecs.get_services('staging')
+    ...     )
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from ecsctl.concurrency import DEFAULT_CONCURRENCY, ItemError
+from ecsctl.ecs_controller import (
+    DEFAULT_TASK_DEFINITION_STATUS,
+    DESCRIBE_INSTANCES_BATCH_SIZE,
+    DESCRIBE_SERVICES_BATCH_SIZE,
+    DESCRIBE_TASKS_BATCH_SIZE,
+    ECSController,
+)
+from ecsctl.exceptions import ECSCommandError
+from ecsctl.index import (
+    DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE,
+    ContainerInstanceIndex,
+    TaskSnapshot,
+)
+from ecsctl.models import Instance, Service, Task, TaskDefinition
+from ecsctl.utils import chunked
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncECSController:
+    """Async equivalent of ``ECSController``.
+
+    Shares the clients, configuration and container instance indexes of a
+    wrapped ``ECSController``; boto3 clients are thread-safe, so they can be
+    used from the worker threads directly.
+
+    Attributes:
+        controller (ECSController): Synchronous controller providing clients
+        concurrency (int): Maximum number of AWS calls in flight
+        errors (List[ItemError]): Per-item failures collected so far
+    """
+
+    def __init__(
+        self,
+        controller: Optional[ECSController] = None,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ) -> None:
+        """Initialize the controller.
+
+        Creating an ``ECSController`` authenticates against AWS and blocks;
+        use ``create`` from inside a running event loop instead.
+
+        Args:
+            controller: Controller whose clients are used; created if None
+            concurrency: Maximum number of AWS calls in flight
+
+        Raises:
+            ECSCommandError: If AWS client initialization fails
+        """
+        self.controller = controller or ECSController(concurrency=concurrency)
+        self.concurrency = concurrency
+        self.errors: List[ItemError] = []
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pool = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='ecsctl-async'
+        )
+
+    @classmethod
+    async def create(cls, concurrency: int = DEFAULT_CONCURRENCY) -> 'AsyncECSController':
+        """Create a controller without blocking the event loop."""
+        controller = await asyncio.to_thread(ECSController, concurrency=concurrency)
+        # Authenticate off the event loop; clients are then cheap to create
+        await asyncio.to_thread(lambda: controller.session)
+        return cls(controller, concurrency=concurrency)
+
+    async def __aenter__(self) -> 'AsyncECSController':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the worker threads."""
+        self._pool.shutdown(wait=False)
+
+    async def _call(self, operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        """Run one blocking client call under the concurrency limit."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, functools.partial(operation, **kwargs)
+            )
+
+    async def _offload(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking local work, such as disk IO, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args))
+
+    async def _client(self, service_name: str) -> Any:
+        """Return a client of the wrapped controller, creating it off the event loop.
+
+        Creating a boto3 client loads its service model and resolves
+        credentials, which blocks.
+        """
+        return await self._offload(getattr, self.controller, f'{service_name}_client')
+
+    async def _paginate(
+        self,
+        operation: Callable[..., Dict[str, Any]],
+        result_key: str,
+        token_key: str = 'nextToken',
+        **kwargs: Any
+    ) -> List[Any]:
+        """Collect every item of a paginated operation."""
+        items = []
+        while True:
+            response = await self._call(operation, **kwargs)
+            items.extend(response.get(result_key, []))
+            token = response.get(token_key)
+            if not token:
+                return items
+            kwargs[token_key] = token
+
+    async def _gather(
+        self,
+        describe: Callable[[Any], Awaitable[List[Dict[str, Any]]]],
+        items: Sequence[Any],
+        label: str
+    ) -> List[Dict[str, Any]]:
+        """Run describe coroutines concurrently and flatten their results.
+
+        Follows ``FanOutExecutor`` semantics: results keep input order,
+        per-item failures are collected and only a total failure is raised.
+        """
+        if not items:
+            return []
+        outcomes = await asyncio.gather(
+            *(describe(item) for item in items), return_exceptions=True
+        )
+        results = []
+        errors = []
+        for item, outcome in zip(items, outcomes):
+            if isinstance(outcome, BaseException):
+                errors.append(ItemError(item, outcome, label))
+            else:
+                results.extend(outcome)
+        if errors and not results:
+            raise errors[0].error
+        for error in errors:
+            logger.warning(str(error))
+        self.errors.extend(errors)
+        return results
+
+    async def _describe_container_instance_arns(
+        self,
+        cluster_name: str,
+        arns: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Describe container instances in concurrent batches and index them."""
+        client = await self._client('ecs')
+
+        async def describe(batch: List[str]) -> List[Dict[str, Any]]:
+            response = await self._call(
+                client.describe_container_instances,
+                cluster=cluster_name,
+                containerInstances=batch
+            )
+            return response['containerInstances']
+
+        container_instances = await self._gather(
+            describe,
+            list(chunked(arns, DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE)),
+            label='describe_container_instances'
+        )
+        self.controller.instance_index(cluster_name).add(container_instances)
+        return container_instances
+
+    async def _describe_container_instances(self, cluster_name: str) -> List[Dict[str, Any]]:
+        """List every container instance in the cluster and describe them in batches."""
+        client = await self._client('ecs')
+        arns = await self._paginate(
+            client.list_container_instances,
+            'containerInstanceArns',
+            cluster=cluster_name
+        )
+        return await self._describe_container_instance_arns(cluster_name, arns)
+
+    async def _describe_ec2_instances(self, instance_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve EC2 metadata for many instances with bulk describe calls."""
+        client = await self._client('ec2')
+
+        async def describe(batch: List[str]) -> List[Dict[str, Any]]:
+            return await self._paginate(
+                client.describe_instances, 'Reservations',
+                token_key='NextToken', InstanceIds=batch
+            )
+
+        reservations = await self._gather(
+            describe,
+            list(chunked(list(dict.fromkeys(instance_ids)), DESCRIBE_INSTANCES_BATCH_SIZE)),
+            label='describe_instances'
+        )
+        return {
+            instance['InstanceId']: instance
+            for reservation in reservations
+            for instance in reservation['Instances']
+        }
+
+    async def _task_snapshot(self, cluster_name: str) -> TaskSnapshot:
+        """List every task in the cluster once and describe them in batches."""
+        client = await self._client('ecs')
+        task_arns = await self._paginate(client.list_tasks, 'taskArns', cluster=cluster_name)
+
+        async def describe(batch: List[str]) -> List[Task]:
+            response = await self._call(client.describe_tasks, cluster=cluster_name, tasks=batch)
+            return [Task.from_response(task) for task in response['tasks']]
+
+        tasks = await self._gather(
+            describe,
+            list(chunked(task_arns, DESCRIBE_TASKS_BATCH_SIZE)),
+            label='describe_tasks'
+        )
+        return TaskSnapshot(cluster_name, tasks)
+
+    async def _resolve_hosts(
+        self,
+        cluster_name: str,
+        container_instance_arns: List[str]
+    ) -> ContainerInstanceIndex:
+        """Resolve unknown container instance ARNs into the shared index."""
+        index = self.controller.instance_index(cluster_name)
+        missing = [arn for arn in container_instance_arns if arn not in index]
+        await self._describe_container_instance_arns(cluster_name, missing)
+        return index
+
+    async def get_clusters(self) -> List[str]:
+        """Get list of all ECS clusters."""
+        try:
+            client = await self._client('ecs')
+            clusters = await self._paginate(client.list_clusters, 'clusterArns')
+            return [cluster.split('/')[-1] for cluster in clusters]
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get clusters: {str(e)}")
+
+    async def get_ec2_instances(self, cluster_name: str) -> List[Dict[Any, Any]]:
+        """Get EC2 instances for specified cluster."""
+        try:
+            container_instances = await self._describe_container_instances(cluster_name)
+            ec2_instances = await self._describe_ec2_instances(
+                [instance['ec2InstanceId'] for instance in container_instances]
+            )
+            return [
+                Instance.from_response(instance, ec2_instances.get(instance['ec2InstanceId'], {}))
+                for instance in container_instances
+            ]
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get EC2 instances: {str(e)}")
+
+    async def get_containers(self, cluster_name: str) -> List[Dict[Any, Any]]:
+        """Get containers for specified cluster with EC2 instance mapping."""
+        try:
+            snapshot = await self._task_snapshot(cluster_name)
+            index = await self._resolve_hosts(cluster_name, snapshot.container_instance_arns())
+            containers = []
+            for task in snapshot.tasks:
+                containers.extend(task.container_rows(index.get(task.container_instance_arn)))
+            return containers
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get containers: {str(e)}")
+
+    async def get_services(self, cluster_name: str) -> List[Dict[str, Any]]:
+        """Get services for specified cluster, including EC2 instance IDs."""
+        try:
+            client = await self._client('ecs')
+            service_arns = await self._paginate(
+                client.list_services, 'serviceArns', cluster=cluster_name
+            )
+            if not service_arns:
+                return []
+
+            async def describe(batch: List[str]) -> List[Dict[str, Any]]:
+                response = await self._call(
+                    client.describe_services, cluster=cluster_name, services=batch
+                )
+                return response['services']
+
+            # Services and the cluster-wide task snapshot are independent
+            described, snapshot = await asyncio.gather(
+                self._gather(
+                    describe,
+                    list(chunked(service_arns, DESCRIBE_SERVICES_BATCH_SIZE)),
+                    label='describe_services'
+                ),
+                self._task_snapshot(cluster_name)
+            )
+            index = await self._resolve_hosts(cluster_name, snapshot.container_instance_arns())
+            return [
+                Service.from_response(service, index.ec2_instance_ids(
+                    task.container_instance_arn
+                    for task in snapshot.service_tasks(service['serviceName'])
+                ))
+                for service in described
+            ]
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get services: {str(e)}")
+
+    async def get_task_definitions(
+        self,
+        family: Optional[str] = None,
+        latest: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Get task definitions with optional family filter.
+
+        Shares the revision store of the wrapped controller, so revisions
+        described by either are not described again.
+        """
+        try:
+            client = await self._client('ecs')
+            store = self.controller.revisions
+            kwargs = {'familyPrefix': family} if family else {}
+            if latest:
+                names = await self._paginate(
+                    client.list_task_definition_families, 'families', status='ACTIVE', **kwargs
+                )
+            else:
+                names = await self._paginate(
+                    client.list_task_definitions, 'taskDefinitionArns', **kwargs
+                )
+
+            async def describe(name: str) -> List[Dict[str, Any]]:
+                row = None if latest else await self._offload(
+                    self.controller.stored_task_definition, name, DEFAULT_TASK_DEFINITION_STATUS
+                )
+                if row is None:
+                    response = await self._call(client.describe_task_definition, taskDefinition=name)
+                    td = response['taskDefinition']
+                    row = TaskDefinition.from_response(td)
+                    await self._offload(self.controller.store_task_definition, td['taskDefinitionArn'], row)
+                return [row]
+
+            try:
+                return await self._gather(describe, names, label='describe_task_definition')
+            finally:
+                await self._offload(store.flush)
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get task definitions: {str(e)}")
+
+    async def check_ssm_status(self, instance_id: str) -> bool:
+        """Check if SSM is available on the specified EC2 instance."""
+        try:
+            client = await self._client('ssm')
+            response = await self._call(
+                client.describe_instance_information,
+                Filters=[{'Key': 'InstanceIds', 'Values': [instance_id]}]
+            )
+            information = response['InstanceInformationList']
+            return len(information) > 0 and information[0]['PingStatus'] == 'Online'
+        except Exception as e:
+            logger.warning(f"Failed to check SSM status for instance {instance_id}: {str(e)}")
+            return False
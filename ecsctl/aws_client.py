@@ -1,37 +1,129 @@
 """AWS authentication and session management."""
 
+import hashlib
+import json
+import logging
 import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from dotenv import load_dotenv
 import boto3
-from typing import Optional
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session
+from typing import Any, Dict, Optional
+from .config import CONFIG_DIR
 from .exceptions import AuthenticationError
 
+CREDENTIALS_DIR = CONFIG_DIR / 'credentials'
+
+# Cached credentials are discarded this long before they expire. It matches
+# botocore's advisory refresh window so a refresh never gets the same
+# about-to-expire credentials back from the cache.
+CREDENTIAL_EXPIRY_MARGIN = timedelta(minutes=15)
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialCache:
+    """On-disk cache of assumed-role credentials.
+
+    Entries are keyed by role ARN, source profile, region and session name
+    and are stored with file mode 0600 in a 0700 directory. An entry is only
+    returned while it is valid for longer than ``CREDENTIAL_EXPIRY_MARGIN``.
+
+    Example:
+        >>> cache = CredentialCache()
+        >>> key = cache.key(role_arn, 'dev', 'ap-southeast-1', 'AssumeRoleSession')
+        >>> credentials = cache.get(key)
+    """
+
+    def __init__(self, cache_dir: Optional[os.PathLike] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the entries, ``~/.ecsctl/credentials``
+                       if None
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else CREDENTIALS_DIR
+
+    @staticmethod
+    def key(role_arn: str, profile_name: Optional[str], region: str, session_name: str) -> str:
+        """Build the cache key of an assumed-role session."""
+        raw = '|'.join([role_arn, profile_name or '', region or '', session_name or ''])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Return cached credentials, or None if missing or about to expire."""
+        try:
+            with open(self._path(key), 'r') as f:
+                credentials = json.load(f)
+            expiry = datetime.fromisoformat(credentials['expiry_time'])
+        except (OSError, ValueError, KeyError):
+            return None
+        if expiry - CREDENTIAL_EXPIRY_MARGIN <= datetime.now(timezone.utc):
+            return None
+        return credentials
+
+    def set(self, key: str, credentials: Dict[str, str]) -> None:
+        """Store credentials readable by the current user only.
+
+        The entry is written to a uniquely named temporary file, created
+        with mode 0600, and moved into place, so concurrent invocations
+        never see or clobber a partial entry.
+
+        Raises:
+            OSError: If the entry cannot be written
+        """
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f'.{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(credentials, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
 class AWSClient:
     """Interface for authenticating with Amazon Web Services (AWS).
-    
+
     Handles AWS authentication and session management with support for role assumption.
-    
+    Assumed-role credentials are cached on disk until shortly before they
+    expire, so repeated invocations skip the STS round trip.
+
     Attributes:
         profile_name (Optional[str]): AWS profile name for authentication
         region (str): AWS region for API calls
-    
+        use_credential_cache (bool): Whether assumed-role credentials are cached
+
     Example:
         >>> client = AWSClient(profile_name="dev")
         >>> session = client.authenticate("arn:aws:iam::123456789012:role/MyRole")
     """
 
-    def __init__(self, profile_name: Optional[str] = None) -> None:
+    def __init__(self, profile_name: Optional[str] = None, use_credential_cache: bool = True) -> None:
         """Initialize AWS client.
-        
+
         Args:
             profile_name: AWS profile name to use for authentication. If None,
                          uses AWS_PROFILE environment variable.
+            use_credential_cache: Cache assumed-role credentials on disk
         """
         # Load environment variables from .env file
         load_dotenv()
-        
+
         self.profile_name = profile_name or os.getenv('AWS_PROFILE')
         self.region = os.getenv('AWS_REGION', 'ap-southeast-1')
+        self.use_credential_cache = use_credential_cache
+        self.credential_cache = CredentialCache()
 
     def authenticate(self, role_arn: str, session_name: Optional[str] = "AssumeRoleSession"):
         """
@@ -41,31 +133,70 @@ class AWSClient:
             session_name (str): Name for the assumed role session
         Returns:
             boto3.Session: Authenticated AWS session with assumed role credentials
+                that refresh themselves before they expire
         """
         try:
-            # Create base session using either profile or environment credentials
-            if self.profile_name:
-                session = boto3.Session(profile_name=self.profile_name)
-            else:
-                session = boto3.Session(region_name=self.region)
-
-            # Assume role using STS
-            sts_client = session.client('sts')
-            assumed_role = sts_client.assume_role(
-                RoleArn=role_arn,
-                RoleSessionName=session_name
-            )
+            key = CredentialCache.key(role_arn, self.profile_name, self.region, session_name)
+            credentials = self._cached_credentials(key) or self._assume_role(role_arn, session_name, key)
+
+            if 'expiry_time' not in credentials:
+                return boto3.Session(
+                    aws_access_key_id=credentials['access_key'],
+                    aws_secret_access_key=credentials['secret_key'],
+                    aws_session_token=credentials['token'],
+                    region_name=self.region
+                )
+
+            def refresh() -> Dict[str, str]:
+                return self._cached_credentials(key) or self._assume_role(role_arn, session_name, key)
 
-            # Return new session with temporary credentials
-            return boto3.Session(
-                aws_access_key_id=assumed_role['Credentials']['AccessKeyId'],
-                aws_secret_access_key=assumed_role['Credentials']['SecretAccessKey'],
-                aws_session_token=assumed_role['Credentials']['SessionToken'],
-                region_name=self.region
+            botocore_session = get_session()
+            botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+                metadata=credentials,
+                refresh_using=refresh,
+                method='assume-role'
             )
+            return boto3.Session(botocore_session=botocore_session, region_name=self.region)
         except Exception as e:
             raise AuthenticationError(f"Failed to authenticate with AWS: {str(e)}", e)
 
+    def _cached_credentials(self, key: str) -> Optional[Dict[str, str]]:
+        """Return cached credentials if caching is enabled."""
+        if not self.use_credential_cache:
+            return None
+        return self.credential_cache.get(key)
+
+    def _assume_role(self, role_arn: str, session_name: str, key: str) -> Dict[str, Any]:
+        """Assume the role with STS and cache the resulting credentials."""
+        # Create base session using either profile or environment credentials
+        if self.profile_name:
+            session = boto3.Session(profile_name=self.profile_name)
+        else:
+            session = boto3.Session(region_name=self.region)
+
+        # Assume role using STS
+        sts_client = session.client('sts')
+        assumed_role = sts_client.assume_role(
+            RoleArn=role_arn,
+            RoleSessionName=session_name
+        )['Credentials']
+
+        credentials = {
+            'access_key': assumed_role['AccessKeyId'],
+            'secret_key': assumed_role['SecretAccessKey'],
+            'token': assumed_role['SessionToken'],
+        }
+        # Credentials without an expiration can be neither cached nor refreshed
+        if 'Expiration' in assumed_role:
+            credentials['expiry_time'] = assumed_role['Expiration'].isoformat()
+            if self.use_credential_cache:
+                try:
+                    self.credential_cache.set(key, credentials)
+                except OSError as e:
+                    # The role was assumed; only the next invocation pays for this
+                    logger.warning(f"Failed to cache credentials: {str(e)}")
+        return credentials
+
     def get_client(self, service_name: str):
         """Get a boto3 client for the specified service."""
-        return boto3.client(service_name)
\ No newline at end of file
+        return boto3.client(service_name)
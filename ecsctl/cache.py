@@ -0,0 +1,396 @@
+"""On-disk cache of fetched ECS resources.
+
+Results of ``get`` commands are stored under ``~/.ecsctl/cache`` keyed by
+account, region, scope (usually the cluster) and resource kind. Entries
+younger than the TTL of their kind are served as-is. Older entries are still
+served while within ``max_stale`` seconds, but a background refresh is started
+at the same time (stale-while-revalidate), so the next invocation sees fresh
+data without anyone having to wait for it.
+
+Task definition revisions are immutable, so described revisions are kept
+permanently in a separate ``RevisionStore`` and never fetched twice.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ecsctl.config import CONFIG_DIR
+from ecsctl.models import json_default
+
+CACHE_DIR = CONFIG_DIR / 'cache'
+REVISIONS_DIR = CONFIG_DIR / 'revisions'
+
+# Seconds an entry of each resource kind is considered fresh
+DEFAULT_TTLS: Dict[str, float] = {
+    'clusters': 300,
+    'ec2': 30,
+    'services': 15,
+    'containers': 15,
+    'task-definitions': 300,
+}
+DEFAULT_TTL = 30
+DEFAULT_MAX_STALE = 3600
+# Seconds ecsctl shell reuses the result of a command
+DEFAULT_MEMORY_TTL = 10
+
+logger = logging.getLogger(__name__)
+
+
+def account_key(
+    role_arn: Optional[str],
+    profile_name: Optional[str],
+    access_key_id: Optional[str] = None
+) -> Optional[str]:
+    """Derive the account part of cache keys without an extra API call.
+
+    The account ID is taken from the role ARN when a role is assumed;
+    otherwise the profile name, or a digest of the access key ID of
+    environment credentials, stands in for the account.
+
+    Returns:
+        The account key, or None if the caller's identity is unknown, e.g.
+        with instance credentials; listings are then not cached on disk
+    """
+    if role_arn and role_arn.count(':') >= 5:
+        return role_arn.split(':')[4]
+    if profile_name:
+        return profile_name
+    if access_key_id:
+        return 'key-' + hashlib.sha256(access_key_id.encode()).hexdigest()[:16]
+    return None
+
+
+def _safe_name(value: str) -> str:
+    """Turn an arbitrary key component into a safe file name."""
+    return re.sub(r'[^A-Za-z0-9._-]', '_', str(value)) or '_'
+
+
+def _unique_name(value: str) -> str:
+    """Turn a key component into a safe file name that no other value maps to.
+
+    Selector-qualified kinds differ in characters ``_safe_name`` replaces,
+    so a digest of the exact value follows the readable part.
+    """
+    digest = hashlib.sha256(str(value).encode()).hexdigest()[:16]
+    return f'{_safe_name(value)[:64]}-{digest}'
+
+
+class CacheEntry:
+    """A cached value and the time it was fetched.
+
+    Attributes:
+        value (Any): Cached, JSON-serializable value
+        fetched_at (float): UNIX timestamp of the fetch
+    """
+
+    __slots__ = ('value', 'fetched_at')
+
+    def __init__(self, value: Any, fetched_at: float) -> None:
+        self.value = value
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        """Seconds since the value was fetched."""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class ResourceCache:
+    """TTL cache of resource listings with stale-while-revalidate.
+
+    Attributes:
+        account (str): Account key, e.g. the account ID of the assumed role
+        region (str): AWS region of the cached resources
+        ttls (Dict[str, float]): Fresh lifetime per resource kind in seconds
+        max_stale (float): Maximum age of an entry that may still be served
+
+    Example:
+        >>> cache = ResourceCache('123456789012', 'ap-southeast-1')
+        >>> services = cache.fetch('services', 'prod', lambda: ecs.get_services('prod'))
+        >>> cache.wait()
+    """
+
+    def __init__(
+        self,
+        account: Optional[str],
+        region: str,
+        cache_dir: Path = CACHE_DIR,
+        ttls: Optional[Dict[str, float]] = None,
+        max_stale: float = DEFAULT_MAX_STALE
+    ) -> None:
+        """Initialize the cache; nothing is written until the first store.
+
+        Args:
+            account: Account key, e.g. the account ID of the assumed role;
+                     None stores nothing, so one identity's listings are
+                     never served to another
+            region: AWS region of the cached resources
+            cache_dir: Root directory of the cache
+            ttls: Fresh lifetime per resource kind, overriding the defaults
+            max_stale: Maximum age of an entry that may still be served
+        """
+        self.account = account
+        self.region = region
+        self.cache_dir = cache_dir
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_stale = max_stale
+        self._revalidations: List[threading.Thread] = []
+
+    def for_region(self, region: str) -> 'ResourceCache':
+        """Return the cache of another region of the same account.
+
+        Background refreshes are tracked together, so ``wait`` on either
+        cache waits for both.
+        """
+        cache = ResourceCache(self.account, region, self.cache_dir, self.ttls, self.max_stale)
+        cache._revalidations = self._revalidations
+        return cache
+
+    def _path(self, kind: str, scope: str) -> Path:
+        return (
+            self.cache_dir / _safe_name(self.account) / _safe_name(self.region)
+            / _safe_name(scope) / f'{_unique_name(kind)}.json'
+        )
+
+    def ttl(self, kind: str) -> float:
+        """Return the fresh lifetime of a resource kind.
+
+        A kind may be qualified by the filters of its listing, e.g.
+        ``containers:service=web``, and shares the TTL of the base kind.
+        """
+        return self.ttls.get(kind.split(':', 1)[0], DEFAULT_TTL)
+
+    def get(self, kind: str, scope: str) -> Optional[CacheEntry]:
+        """Return the stored entry, or None if missing or unreadable."""
+        if self.account is None:
+            return None
+        try:
+            with open(self._path(kind, scope), 'r') as f:
+                data = json.load(f)
+            return CacheEntry(data['value'], data['fetched_at'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, kind: str, scope: str, value: Any) -> None:
+        """Store a value, replacing the previous entry atomically."""
+        if self.account is None:
+            return
+        path = self._path(kind, scope)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'fetched_at': time.time(), 'value': value}, f, default=json_default)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def fresh(self, kind: str, scope: str) -> Optional[Any]:
+        """Return the stored value while it is fresh, otherwise None."""
+        entry = self.get(kind, scope)
+        if entry is not None and entry.age <= self.ttl(kind):
+            return entry.value
+        return None
+
+    def fetch(
+        self,
+        kind: str,
+        scope: str,
+        loader: Callable[[], Any],
+        use_cached: bool = True
+    ) -> Any:
+        """Return a resource listing, from the cache when allowed.
+
+        Args:
+            kind: Resource kind, e.g. ``services``
+            scope: Cluster name or other qualifier of the listing
+            loader: Fetches the listing from AWS
+            use_cached: If False, always load and refresh the entry
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        if use_cached:
+            entry = self.get(kind, scope)
+            if entry is not None and entry.age <= self.ttl(kind):
+                return entry.value
+            if entry is not None and entry.age <= self.max_stale:
+                self._revalidate(kind, scope, loader)
+                return entry.value
+
+        value = loader()
+        self._store(kind, scope, value)
+        return value
+
+    def _store(self, kind: str, scope: str, value: Any) -> None:
+        try:
+            self.set(kind, scope, value)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to cache {kind} for {scope}: {str(e)}")
+
+    def _revalidate(self, kind: str, scope: str, loader: Callable[[], Any]) -> None:
+        """Refresh an entry in the background."""
+        def refresh():
+            try:
+                self._store(kind, scope, loader())
+            except Exception as e:
+                logger.warning(f"Failed to refresh cached {kind} for {scope}: {str(e)}")
+
+        thread = threading.Thread(target=refresh, name=f'ecsctl-revalidate-{kind}', daemon=True)
+        thread.start()
+        self._revalidations.append(thread)
+
+    @property
+    def revalidating(self) -> bool:
+        """Whether background refreshes are still running."""
+        return any(thread.is_alive() for thread in self._revalidations)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for background refreshes to finish writing their entries."""
+        for thread in list(self._revalidations):
+            thread.join(timeout)
+        # Pruned in place, the list is shared with the caches of other regions
+        self._revalidations[:] = [t for t in self._revalidations if t.is_alive()]
+
+
+class MemoryCache(ResourceCache):
+    """Short-lived in-memory cache of resource listings.
+
+    Used by ``ecsctl shell`` to reuse the results of one command in the
+    next ones. Every kind is fresh for the same few seconds and expired
+    entries are never served, but they stay available to ``listings`` for
+    name completion until they are replaced. Rows are kept as loaded, so
+    nothing is serialized. Regional caches share the entries.
+
+    Example:
+        >>> cache = MemoryCache('123456789012', 'ap-southeast-1', ttl=10)
+        >>> services = cache.fetch('services', 'prod', lambda: ecs.get_services('prod'))
+    """
+
+    def __init__(self, account: str, region: str, ttl: float = DEFAULT_MEMORY_TTL) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            account: Account key, e.g. the account ID of the assumed role
+            region: AWS region of the cached resources
+            ttl: Seconds an entry of any kind is fresh
+        """
+        super().__init__(account, region, max_stale=0)
+        self._ttl = ttl
+        self._entries: Dict[tuple, CacheEntry] = {}
+
+    def for_region(self, region: str) -> 'MemoryCache':
+        cache = MemoryCache(self.account, region, self._ttl)
+        cache._entries = self._entries
+        cache._revalidations = self._revalidations
+        return cache
+
+    def ttl(self, kind: str) -> float:
+        return self._ttl
+
+    def get(self, kind: str, scope: str) -> Optional[CacheEntry]:
+        return self._entries.get((self.region, scope, kind))
+
+    def set(self, kind: str, scope: str, value: Any) -> None:
+        self._entries[(self.region, scope, kind)] = CacheEntry(value, time.time())
+
+    def clear(self) -> None:
+        """Forget every entry."""
+        self._entries.clear()
+
+    def listings(self, kind: str) -> List[Any]:
+        """Return every cached listing of a kind, filtered or not, of any age and scope."""
+        return [
+            entry.value for (region, scope, cached_kind), entry in list(self._entries.items())
+            if cached_kind.split(':', 1)[0] == kind
+        ]
+
+
+class RevisionStore:
+    """Permanent store of described task definition revisions.
+
+    A registered revision never changes apart from its status, so its row
+    without the status is stored under ``~/.ecsctl/revisions`` keyed by
+    account, region and family and is served from there on every later
+    listing; the status comes from the listing. Families are loaded on first
+    access; new revisions are written by ``flush``. Safe to use from the
+    worker threads of a fan-out.
+
+    Example:
+        >>> store = RevisionStore('123456789012', 'ap-southeast-1')
+        >>> row = store.get(arn) or describe(arn)
+        >>> store.put(arn, row)
+        >>> store.flush()
+    """
+
+    def __init__(self, account: str, region: str, store_dir: Optional[Path] = None) -> None:
+        """Initialize the store; nothing is read until the first lookup.
+
+        Args:
+            account: Account key, e.g. the account ID of the assumed role
+            region: AWS region of the task definitions
+            store_dir: Root directory of the store, ``~/.ecsctl/revisions`` if None
+        """
+        self.account = account
+        self.region = region
+        self.store_dir = store_dir or REVISIONS_DIR
+        self._families: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def family(arn: str) -> str:
+        """Return the family of a task definition ARN or ``family:revision``."""
+        return arn.rsplit('/', 1)[-1].rsplit(':', 1)[0]
+
+    def _path(self, family: str) -> Path:
+        return (
+            self.store_dir / _safe_name(self.account) / _safe_name(self.region)
+            / f'{_safe_name(family)}.json'
+        )
+
+    def _revisions(self, family: str) -> Dict[str, Any]:
+        """Return the stored revisions of a family, loading them on first use."""
+        if family not in self._families:
+            try:
+                with open(self._path(family), 'r') as f:
+                    self._families[family] = json.load(f)
+            except (OSError, ValueError):
+                self._families[family] = {}
+        return self._families[family]
+
+    def get(self, arn: str) -> Optional[Any]:
+        """Return the stored row of a revision, or None if never described."""
+        with self._lock:
+            return self._revisions(self.family(arn)).get(arn)
+
+    def put(self, arn: str, row: Any) -> None:
+        """Remember the row of a revision until the next ``flush``."""
+        family = self.family(arn)
+        with self._lock:
+            self._revisions(family)[arn] = row
+            self._dirty.add(family)
+
+    def flush(self) -> None:
+        """Write the families that gained revisions, atomically per family."""
+        with self._lock:
+            for family in sorted(self._dirty):
+                path = self._path(family)
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(self._families[family], f, default=json_default)
+                    os.replace(tmp_path, path)
+                except (OSError, TypeError) as e:
+                    logger.warning(f"Failed to store revisions of {family}: {str(e)}")
+            self._dirty.clear()
@@ -0,0 +1,248 @@
+"""Cluster capacity aggregated from one batched snapshot.
+
+``describe_container_instances`` returns the CPU and memory every host
+registered with ECS and what remains unreserved, and ``describe_tasks`` the
+CPU and memory every task reserves. ``ClusterCapacity`` keeps them as
+columns, one typed array per value, so the per-host utilisation, the
+per-service reservations and the cluster totals are computed with
+column-wide ``sum``, ``max`` and ``map`` calls instead of per-row
+dictionaries, even across thousands of hosts and tasks.
+
+Fragmentation measures how scattered the free capacity of the active hosts
+is: ``1 - largest free block / total free``. 0% means all free capacity is
+on one host; close to 100% means it is spread in small pieces that a large
+task may not fit in, even though the cluster has room in total.
+
+Example:
+    >>> capacity = ClusterCapacity('prod', container_instances, tasks)
+    >>> capacity.nodes(sort_by='cpu')[0]['CpuUtilization']
+    93.8
+    >>> capacity.fragmentation('MEMORY')
+    0.71
+"""
+
+import operator
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ecsctl.models import NodeCapacity, ServiceCapacity, Task
+
+CPU = 'CPU'
+MEMORY = 'MEMORY'
+
+# Units of the task-level values given as vCPU or GB, e.g. '0.5 vCPU'
+CPU_UNITS_PER_VCPU = 1024
+MIB_PER_GB = 1024
+
+# Keys of the --sort-by option of the top commands
+SORT_KEYS = ('cpu', 'memory', 'name')
+
+# Container instances whose free capacity can take new tasks
+SCHEDULABLE_STATUS = 'ACTIVE'
+
+
+def parse_units(value: Any, per_unit: int) -> int:
+    """Parse a CPU or memory value: a number, or a number of vCPU or GB.
+
+    Returns:
+        CPU units or MiB; 0 for unset or unparsable values
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    parts = text.split()
+    try:
+        if len(parts) == 2 and parts[1].lower() in ('vcpu', 'gb'):
+            return int(float(parts[0]) * per_unit)
+        return int(float(text))
+    except ValueError:
+        return 0
+
+
+def _resource(resources: List[Dict[str, Any]], name: str) -> int:
+    """Return the integer value of a resource of a container instance."""
+    for resource in resources or []:
+        if resource['name'] == name:
+            return int(resource.get('integerValue', 0))
+    return 0
+
+
+def task_reservation(task: Task) -> Tuple[int, int]:
+    """Return the CPU units and MiB a task reserves.
+
+    The task-level size is used when set; otherwise the container-level
+    reservations are added up.
+    """
+    cpu = parse_units(task.cpu, CPU_UNITS_PER_VCPU)
+    memory = parse_units(task.memory, MIB_PER_GB)
+    if not cpu:
+        cpu = sum(parse_units(container_cpu, 1) for _, _, container_cpu, _ in task.containers)
+    if not memory:
+        memory = sum(parse_units(container_memory, 1) for _, _, _, container_memory in task.containers)
+    return cpu, memory
+
+
+def _percent(part: int, whole: int) -> float:
+    return round(100.0 * part / whole, 1) if whole else 0.0
+
+
+class ClusterCapacity:
+    """Column-oriented capacity of a cluster's hosts and tasks.
+
+    Attributes:
+        cluster_name (str): Name of the ECS cluster
+        instance_ids (List[str]): EC2 instance ID of every host
+        statuses (List[str]): Container instance status of every host
+        registered (Dict[str, array]): Registered CPU and memory, per host
+        remaining (Dict[str, array]): Unreserved CPU and memory, per host
+        running_tasks (array): Running task count, per host
+        task_services (List[Optional[str]]): Service of every task
+        task_hosts (List[Optional[str]]): Container instance ARN of every task
+        reserved (Dict[str, array]): Reserved CPU and memory, per task
+    """
+
+    def __init__(
+        self,
+        cluster_name: str,
+        container_instances: Iterable[Dict[str, Any]],
+        tasks: Iterable[Task] = ()
+    ) -> None:
+        """Build the columns.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            container_instances: ``describe_container_instances`` entries
+            tasks: Tasks of the cluster; only needed for service aggregates
+        """
+        self.cluster_name = cluster_name
+        self.instance_ids: List[str] = []
+        self.statuses: List[str] = []
+        self.running_tasks = array('q')
+        self.registered = {CPU: array('q'), MEMORY: array('q')}
+        self.remaining = {CPU: array('q'), MEMORY: array('q')}
+        for instance in container_instances:
+            self.instance_ids.append(instance['ec2InstanceId'])
+            self.statuses.append(instance['status'])
+            self.running_tasks.append(instance.get('runningTasksCount', 0))
+            for name in (CPU, MEMORY):
+                self.registered[name].append(_resource(instance.get('registeredResources'), name))
+                self.remaining[name].append(_resource(instance.get('remainingResources'), name))
+
+        self.task_services: List[Optional[str]] = []
+        self.task_hosts: List[Optional[str]] = []
+        self.reserved = {CPU: array('q'), MEMORY: array('q')}
+        for task in tasks:
+            cpu, memory = task_reservation(task)
+            self.task_services.append(task.service_name)
+            self.task_hosts.append(task.container_instance_arn)
+            self.reserved[CPU].append(cpu)
+            self.reserved[MEMORY].append(memory)
+
+    def __len__(self) -> int:
+        return len(self.instance_ids)
+
+    def used(self, name: str) -> List[int]:
+        """Return the reserved amount of a resource, per host."""
+        return list(map(operator.sub, self.registered[name], self.remaining[name]))
+
+    def total_registered(self, name: str) -> int:
+        """Return the registered amount of a resource in the cluster."""
+        return sum(self.registered[name])
+
+    def total_used(self, name: str) -> int:
+        """Return the reserved amount of a resource in the cluster."""
+        return self.total_registered(name) - sum(self.remaining[name])
+
+    def _free(self, name: str) -> List[int]:
+        """Return the free amount of a resource on the hosts accepting new tasks."""
+        return [
+            free for free, status in zip(self.remaining[name], self.statuses)
+            if status == SCHEDULABLE_STATUS
+        ]
+
+    def largest_free(self, name: str) -> int:
+        """Return the largest free amount of a resource on a single active host."""
+        return max(self._free(name), default=0)
+
+    def fragmentation(self, name: str) -> float:
+        """Return the fragmentation of a resource's free capacity, from 0 to 1."""
+        free = self._free(name)
+        total = sum(free)
+        return round(1 - max(free) / total, 2) if total else 0.0
+
+    def nodes(self, sort_by: str = 'cpu') -> List[NodeCapacity]:
+        """Return the capacity of every host, most utilised first.
+
+        Args:
+            sort_by: ``cpu`` or ``memory`` utilisation, or ``name``
+        """
+        cpu_used = self.used(CPU)
+        memory_used = self.used(MEMORY)
+        cpu_utilization = list(map(_percent, cpu_used, self.registered[CPU]))
+        memory_utilization = list(map(_percent, memory_used, self.registered[MEMORY]))
+        rows = [
+            NodeCapacity(
+                instance_id=self.instance_ids[n], status=self.statuses[n],
+                running_tasks=self.running_tasks[n],
+                cpu_registered=self.registered[CPU][n], cpu_used=cpu_used[n],
+                cpu_utilization=cpu_utilization[n],
+                memory_registered=self.registered[MEMORY][n], memory_used=memory_used[n],
+                memory_utilization=memory_utilization[n]
+            )
+            for n in range(len(self))
+        ]
+        return _sorted(rows, sort_by, 'instance_id', 'cpu_utilization', 'memory_utilization')
+
+    def services(self, sort_by: str = 'cpu') -> List[ServiceCapacity]:
+        """Return the reservations of every service, largest share first.
+
+        Tasks not started by a service are left out.
+
+        Args:
+            sort_by: ``cpu`` or ``memory`` share, or ``name``
+        """
+        # Group task positions by service, then sum each group's columns
+        positions: Dict[str, List[int]] = {}
+        for n, service in enumerate(self.task_services):
+            if service is not None:
+                positions.setdefault(service, []).append(n)
+        cpu_total = self.total_registered(CPU)
+        memory_total = self.total_registered(MEMORY)
+        cpu_column, memory_column = self.reserved[CPU], self.reserved[MEMORY]
+        rows = []
+        for service, group in positions.items():
+            cpu = sum(map(cpu_column.__getitem__, group))
+            memory = sum(map(memory_column.__getitem__, group))
+            hosts = {self.task_hosts[n] for n in group} - {None}
+            rows.append(ServiceCapacity(
+                name=service, tasks=len(group), hosts=len(hosts),
+                cpu=cpu, cpu_share=_percent(cpu, cpu_total),
+                memory=memory, memory_share=_percent(memory, memory_total)
+            ))
+        return _sorted(rows, sort_by, 'name', 'cpu', 'memory')
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return the cluster-wide totals and fragmentation of CPU and memory."""
+        return [
+            {
+                'Resource': name,
+                'Registered': self.total_registered(name),
+                'Used': self.total_used(name),
+                'Utilization': _percent(self.total_used(name), self.total_registered(name)),
+                'LargestFree': self.largest_free(name),
+                'Fragmentation': self.fragmentation(name),
+            }
+            for name in (CPU, MEMORY)
+        ]
+
+
+def _sorted(rows: List[Any], sort_by: str, name: str, cpu: str, memory: str) -> List[Any]:
+    """Sort rows by name, or by a CPU or memory value in descending order."""
+    if sort_by == 'name':
+        return sorted(rows, key=operator.attrgetter(name))
+    if sort_by not in ('cpu', 'memory'):
+        raise ValueError(f"Unknown sort key '{sort_by}', expected one of: {', '.join(SORT_KEYS)}")
+    first, second = (cpu, memory) if sort_by == 'cpu' else (memory, cpu)
+    return sorted(rows, key=operator.attrgetter(first, second), reverse=True)
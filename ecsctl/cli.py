@@ -1,26 +1,337 @@
 import click
-from ecsctl.ecs_controller import ECSController
+from ecsctl.capacity import SORT_KEYS
+from ecsctl.concurrency import DEFAULT_CONCURRENCY
 from ecsctl.exceptions import ECSCommandError
-from rich.table import Table
+import os
 import subprocess
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from ecsctl.output import OUTPUT_FORMATS, STREAMING_FORMATS, context_fields
+from ecsctl.selectors import INSTANCE_FIELDS, SERVICE_FIELDS, TASK_DEFINITION_FIELDS, TASK_FIELDS, Selector
+from ecsctl.throttling import DEFAULT_MAX_ATTEMPTS, DEFAULT_RETRY_MODE, RETRY_MODES, parse_rate_limits
 from ecsctl.utils import ignore_user_entered_signals
 from ecsctl import __version__
 
+# boto3 and rich take most of the start-up time, so they are only imported
+# by the commands that need them; --help and --version stay fast.
+if TYPE_CHECKING:
+    from rich.table import Table
+    from ecsctl.ecs_controller import ECSController
+    from ecsctl.instrumentation import ApiProfiler
+    from ecsctl.recording import ApiRecording
+
+def _parse_rate_limits(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse --rate-limit."""
+    if not value:
+        return None
+    try:
+        return parse_rate_limits(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
 @click.group()
 @click.version_option(version=__version__, prog_name="ecsctl")
-def cli():
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_CONCURRENCY,
+              show_default=True, envvar='ECSCTL_CONCURRENCY',
+              help='Maximum number of parallel AWS describe calls.')
+@click.option('--cached/--refresh', default=False, envvar='ECSCTL_CACHED',
+              help='Serve results from the local cache when recent enough '
+                   '(stale results are shown and refreshed in the background), '
+                   'or always fetch from AWS (default).')
+@click.option('--no-credential-cache', is_flag=True, envvar='ECSCTL_NO_CREDENTIAL_CACHE',
+              help='Assume AWS_ROLE_ARN on every run instead of reusing cached credentials.')
+@click.option('--profile-api', is_flag=True, envvar='ECSCTL_PROFILE_API',
+              help='Print a per-operation summary of the AWS API calls at exit. '
+                   'Set ECSCTL_API_TRACE=<file> (and ECSCTL_API_TRACE_FORMAT=json|chrome) '
+                   'to write every call to a file.')
+@click.option('--max-attempts', type=click.IntRange(min=1), default=DEFAULT_MAX_ATTEMPTS,
+              show_default=True, envvar='ECSCTL_MAX_ATTEMPTS',
+              help='Attempts per AWS API call, including the first one.')
+@click.option('--retry-mode', type=click.Choice(RETRY_MODES), default=DEFAULT_RETRY_MODE,
+              show_default=True, envvar='ECSCTL_RETRY_MODE',
+              help='botocore retry mode of the AWS clients.')
+@click.option('--rate-limit', callback=_parse_rate_limits, envvar='ECSCTL_RATE_LIMIT',
+              metavar='SERVICE=RATE[:BURST],...',
+              help='Client-side limit of AWS requests per second, shared by all parallel calls, '
+                   'e.g. ecs=10:40,ssm=5. 0 disables the limit of a service. '
+                   'Defaults: ecs=20:100, ec2=20:100, ssm=10:20.')
+@click.option('--record', 'record_dir', type=click.Path(file_okay=False), envvar='ECSCTL_RECORD',
+              metavar='DIR', help='Write every AWS API response to DIR for --replay.')
+@click.option('--replay', 'replay_dir', type=click.Path(exists=True, file_okay=False),
+              envvar='ECSCTL_REPLAY', metavar='DIR',
+              help='Answer AWS API calls from responses written by --record, '
+                   'without credentials or network access.')
+@click.pass_context
+def cli(ctx: click.Context, concurrency: int, cached: bool, no_credential_cache: bool,
+        profile_api: bool, max_attempts: int, retry_mode: str,
+        rate_limit: Optional[Dict[str, Any]], record_dir: Optional[str], replay_dir: Optional[str]):
     """ECS command line tool that mimics kubectl."""
-    pass
+    if record_dir and replay_dir:
+        raise click.UsageError('--record and --replay cannot be used together.')
+    ctx.ensure_object(dict)
+    ctx.obj['concurrency'] = concurrency
+    ctx.obj['cached'] = cached
+    ctx.obj['credential_cache'] = not no_credential_cache
+    ctx.obj['profile_api'] = profile_api
+    ctx.obj['max_attempts'] = max_attempts
+    ctx.obj['retry_mode'] = retry_mode
+    ctx.obj['rate_limit'] = rate_limit
+    ctx.obj['record_dir'] = record_dir
+    ctx.obj['replay_dir'] = replay_dir
+
+def _profiler(ctx: click.Context) -> Optional['ApiProfiler']:
+    """Create the API profiler if requested and report it when the command ends."""
+    trace_path = os.getenv('ECSCTL_API_TRACE')
+    if not ctx.obj.get('profile_api') and not trace_path:
+        return None
+    if 'profiler' in ctx.obj:
+        return ctx.obj['profiler']
+
+    from ecsctl.instrumentation import ApiProfiler
+
+    profiler = ctx.obj['profiler'] = ApiProfiler()
+
+    def report():
+        if ctx.obj.get('profile_api'):
+            from rich.console import Console
+
+            profiler.print_summary(Console(stderr=True))
+        if trace_path:
+            try:
+                profiler.write(trace_path, os.getenv('ECSCTL_API_TRACE_FORMAT', 'json'))
+            except (OSError, ValueError) as e:
+                click.echo(f"Warning: Failed to write API trace: {str(e)}", err=True)
+
+    ctx.call_on_close(report)
+    return profiler
+
+def _recording(ctx: click.Context) -> Optional['ApiRecording']:
+    """Create the API recording if requested and report replay misses when the command ends."""
+    directory = ctx.obj.get('replay_dir') or ctx.obj.get('record_dir')
+    if not directory:
+        return None
+    if 'recording' in ctx.obj:
+        return ctx.obj['recording']
+
+    from ecsctl.recording import ApiRecording
+
+    recording = ctx.obj['recording'] = ApiRecording(directory, replay=bool(ctx.obj.get('replay_dir')))
+
+    def report():
+        if recording.misses:
+            click.echo(f"Warning: {len(recording.misses)} AWS API calls had no recorded "
+                       f"response in {directory}", err=True)
+
+    ctx.call_on_close(report)
+    return recording
+
+def _controller() -> 'ECSController':
+    """Create an ECSController configured from the global CLI options.
+
+    A controller passed in by ``ecsctl shell`` is reused as is. Inside the
+    daemon, the warm controller of the same options is reused unless the
+    command profiles or records its API calls.
+    """
+    from ecsctl.daemon import controller_pool
+    from ecsctl.ecs_controller import ECSController
+    from ecsctl.throttling import RateLimiter
+
+    root = click.get_current_context().find_root()
+    root.ensure_object(dict)
+    options = root.obj
+    if options.get('controller') is not None:
+        return options['controller']
+    settings = dict(
+        concurrency=options.get('concurrency', DEFAULT_CONCURRENCY),
+        use_credential_cache=options.get('credential_cache', True),
+        max_attempts=options.get('max_attempts', DEFAULT_MAX_ATTEMPTS),
+        retry_mode=options.get('retry_mode', DEFAULT_RETRY_MODE)
+    )
+    profiler = _profiler(root)
+    recording = _recording(root)
+
+    def create() -> 'ECSController':
+        return ECSController(
+            profiler=profiler,
+            recording=recording,
+            rate_limiter=RateLimiter(options.get('rate_limit')),
+            **settings
+        )
+
+    pool = controller_pool()
+    if pool is None or profiler is not None or recording is not None:
+        return create()
+    return pool.get({**settings, 'rate_limit': options.get('rate_limit')}, create)
+
+def _new_table() -> 'Table':
+    """Create an empty result table."""
+    from rich.table import Table
+
+    return Table(show_header=True, header_style="bold magenta")
+
+def _report_errors(ecs: 'ECSController'):
+    """Print the per-item failures collected while fetching resources."""
+    for error in ecs.errors:
+        click.echo(f"Warning: {error}", err=True)
+    if ecs.cache.revalidating:
+        click.echo("Showing cached results, refreshing cache...", err=True)
+        ecs.cache.wait()
+
+def _fetch(ecs: 'ECSController', kind: str, scope: str, loader: Callable[[], Any]) -> Any:
+    """Load a resource listing through the resource cache."""
+    options = click.get_current_context().find_root().obj or {}
+    return ecs.cache.fetch(kind, scope, loader, use_cached=options.get('cached', False))
+
+def _guarded(rows: Iterable[Dict[str, Any]], message: str) -> Iterator[Dict[str, Any]]:
+    """Re-raise failures of a streamed listing as ECSCommandError."""
+    try:
+        yield from rows
+    except ECSCommandError:
+        raise
+    except Exception as e:
+        raise ECSCommandError(f"{message}: {str(e)}")
+
+def _rows(
+    ecs: 'ECSController',
+    kind: str,
+    scope: str,
+    loader: Callable[[], List[Dict[str, Any]]],
+    stream: Callable[[], Iterable[Dict[str, Any]]],
+    output: str,
+    message: str
+) -> Iterable[Dict[str, Any]]:
+    """Return the rows to print, streaming them when the output format allows.
+
+    Streaming formats bypass the resource cache unless --cached is given,
+    so rows are printed as soon as their batch resolves.
+    """
+    options = click.get_current_context().find_root().obj or {}
+    if output in STREAMING_FORMATS and not options.get('cached', False):
+        return _guarded(stream(), message)
+    return _fetch(ecs, kind, scope, loader)
+
+def _print(
+    ecs: 'ECSController',
+    rows: Iterable[Dict[str, Any]],
+    output: str,
+    render: Callable[[List[Dict[str, Any]]], 'Table']
+):
+    """Print rows as the command's table or in another output format."""
+    from ecsctl.output import write_rows
+
+    if output == 'table':
+        ecs.console.print(render(list(rows)))
+    else:
+        write_rows(rows, output, ecs.console)
+
+def _fleet_rows(
+    ecs: 'ECSController',
+    kind: str,
+    regions: Optional[List[str]],
+    cluster: Optional[str],
+    load: Callable[['ECSController', Optional[str]], List[Dict[str, Any]]],
+    output: str,
+    message: str,
+    scope: Optional[str] = None
+) -> Iterable[Dict[str, Any]]:
+    """Query clusters or regions in parallel and merge their rows.
+
+    Args:
+        ecs: Base controller
+        kind: Resource kind used as cache key
+        regions: Regions to query, the configured region if None
+        cluster: Cluster to query in every region; every cluster if None
+        load: Fetches the rows of one regional controller and cluster
+        output: Output format; streaming formats print each target's rows
+                as soon as it and the targets before it are done
+        message: Prefix of the error raised when every target fails
+        scope: Cache scope of regional resources; the cluster if None
+    """
+    from ecsctl.fleet import Target, fleet_rows, regional_controllers, resolve_targets
+
+    # The click context is thread-local, so read the options before fanning out
+    options = click.get_current_context().find_root().obj or {}
+    use_cached = options.get('cached', False)
+
+    if scope is not None:
+        targets = [Target(controller) for controller in regional_controllers(ecs, regions)]
+    else:
+        targets = resolve_targets(ecs, regions, cluster)
+
+    def fetch(target: 'Target') -> List[Dict[str, Any]]:
+        return target.controller.cache.fetch(
+            kind, scope or target.cluster,
+            lambda: load(target.controller, target.cluster),
+            use_cached=use_cached
+        )
+
+    rows = _guarded(fleet_rows(ecs, targets, fetch, label=f'get {kind}'), message)
+    return rows if output in STREAMING_FORMATS else list(rows)
+
+def _split_regions(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated region list."""
+    if not value:
+        return None
+    return [region.strip() for region in value.split(',') if region.strip()]
+
+def regions_option(command: Callable) -> Callable:
+    """Add --regions to a get command."""
+    return click.option('--regions', callback=_split_regions, metavar='REGION[,REGION...]',
+                        help='Query these regions in parallel, e.g. us-east-1,eu-west-1.')(command)
+
+def fleet_options(command: Callable) -> Callable:
+    """Add --all-clusters and --regions to a cluster-scoped get command."""
+    command = regions_option(command)
+    return click.option('-A', '--all-clusters', is_flag=True,
+                        help='Query every cluster in parallel instead of the current one.')(command)
+
+def _selector_callback(fields: Optional[Tuple[str, ...]]) -> Callable:
+    """Return the callback parsing a field selector of these fields, or a label selector."""
+    def parse(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Selector:
+        try:
+            return Selector.parse(value, fields)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return parse
+
+def selector_options(fields: Tuple[str, ...], labels: bool = True) -> Callable:
+    """Add --field-selector, and -l/--selector unless ``labels`` is False, to a get command."""
+    def decorate(command: Callable) -> Callable:
+        if labels:
+            command = click.option(
+                '-l', '--selector', 'labels', callback=_selector_callback(None),
+                metavar='KEY[=VALUE],...',
+                help='Only resources whose tags match, e.g. team=payments,env!=dev or !deprecated.'
+            )(command)
+        return click.option(
+            '--field-selector', 'fields', callback=_selector_callback(fields),
+            metavar='FIELD=VALUE,...',
+            help=f"Only resources whose fields match FIELD=VALUE or FIELD!=VALUE; "
+                 f"fields: {', '.join(fields)}. Equalities are filtered by AWS where supported."
+        )(command)
+    return decorate
+
+def _selectors(fields: Selector, labels: Optional[Selector] = None) -> Dict[str, Selector]:
+    """Return the non-empty selectors as controller keyword arguments."""
+    return {name: selector for name, selector in (('fields', fields), ('labels', labels)) if selector}
+
+def _selector_kind(kind: str, selectors: Dict[str, Selector]) -> str:
+    """Qualify a cache kind by selectors, so selected listings are cached separately."""
+    return kind + ''.join(f':{name}={selector}' for name, selector in selectors.items())
+
+def output_option(command: Callable) -> Callable:
+    """Add -o/--output to a get command."""
+    return click.option('-o', '--output', type=click.Choice(OUTPUT_FORMATS), default='table',
+                        show_default=True,
+                        help='Output format; ndjson and tsv print rows as they are fetched.')(command)
 
 @cli.command('use-cluster')
 @click.argument('cluster_name')
 def use_cluster(cluster_name: str):
     """Select ECS cluster to use."""
     try:
-        ecs = ECSController()
-        clusters = ecs.get_clusters()
+        ecs = _controller()
+        clusters = _fetch(ecs, 'clusters', '-', ecs.get_clusters)
         
         if cluster_name not in clusters:
             click.echo(f"Error: Cluster '{cluster_name}' not found. Available clusters:", err=True)
@@ -34,25 +345,31 @@ def use_cluster(cluster_name: str):
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
+def _clusters_table(clusters: List[Dict[str, Any]]) -> 'Table':
+    """Build the clusters table."""
+    table = _new_table()
+    table.add_column("Cluster Name")
+    table.add_column("Current")
+    
+    for cluster in clusters:
+        table.add_row(
+            cluster['ClusterName'],
+            "*" if cluster['Current'] else ""
+        )
+    return table
+
 @cli.command('get-clusters')
-def get_clusters():
+@output_option
+def get_clusters(output: str):
     """List available ECS clusters."""
     try:
-        ecs = ECSController()
-        clusters = ecs.get_clusters()
+        ecs = _controller()
+        clusters = _fetch(ecs, 'clusters', '-', ecs.get_clusters)
         current = ecs.config.get_current_cluster()
         
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Cluster Name")
-        table.add_column("Current")
-        
-        for cluster in clusters:
-            table.add_row(
-                cluster,
-                "*" if cluster == current else ""
-            )
-        
-        ecs.console.print(table)
+        rows = [{'ClusterName': cluster, 'Current': cluster == current} for cluster in clusters]
+        _print(ecs, rows, output, _clusters_table)
+        _report_errors(ecs)
     except ECSCommandError as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
@@ -62,135 +379,492 @@ def get():
     """Get ECS resources."""
     pass
 
+CHANGED_ROW_STYLE = "bold yellow"
+
+def _ec2_table(instances: List[Dict[str, Any]], changed: Set[str] = frozenset()) -> 'Table':
+    """Build the EC2 instances table, highlighting changed instances."""
+    context = context_fields(instances)
+    table = _new_table()
+    for field in context:
+        table.add_column(field)
+    table.add_column("Instance ID")
+    table.add_column("Type")
+    table.add_column("State")
+    table.add_column("Status")
+    table.add_column("Running Tasks")
+    ssm = bool(instances) and 'SSM' in instances[0]
+    if ssm:
+        table.add_column("SSM")
+    
+    for instance in instances:
+        table.add_row(
+            *(instance[field] for field in context),
+            instance['InstanceId'],
+            instance['InstanceType'],
+            instance['State'],
+            instance['Status'],
+            str(instance['RunningTasks']),
+            *([instance['SSM']] if ssm else []),
+            style=CHANGED_ROW_STYLE if instance['InstanceId'] in changed else None
+        )
+    return table
+
+def _services_table(services: List[Dict[str, Any]], changed: Set[str] = frozenset()) -> 'Table':
+    """Build the services table, highlighting changed services."""
+    context = context_fields(services)
+    table = _new_table()
+    for field in context:
+        table.add_column(field)
+    table.add_column("Name")
+    table.add_column("Status")
+    table.add_column("Task Definition")
+    table.add_column("Desired")
+    table.add_column("Running")
+    table.add_column("Pending")
+    table.add_column("EC2 Instances", no_wrap=False)
+    
+    for service in services:
+        ec2_instances = (
+            '\n'.join(instance.strip() for instance in service['EC2Instances'].split(','))
+            if service['EC2Instances']
+            else '-'
+        )
+        
+        table.add_row(
+            *(service[field] for field in context),
+            service['ServiceName'],
+            service['Status'],
+            service['TaskDefinition'].split('/')[-1],
+            str(service['DesiredCount']),
+            str(service['RunningCount']),
+            str(service['PendingCount']),
+            ec2_instances,
+            style=CHANGED_ROW_STYLE if service['ServiceName'] in changed else None
+        )
+    return table
+
+def _watch(ecs: 'ECSController', watcher: Any, render: Callable, interval: float):
+    """Re-poll a watcher and redraw its table in place until interrupted."""
+    from ecsctl.watch import watch
+
+    def titled(rows: List[Dict[str, Any]], changed: Set[str]) -> 'Table':
+        table = render(rows, changed)
+        table.title = f"Every {interval:g}s: {len(rows)} items, {len(changed)} changed"
+        return table
+
+    watch(watcher.poll, titled, watcher.key, ecs.console, interval=interval)
+
+def watch_options(command: Callable) -> Callable:
+    """Add --watch and --interval to a get command."""
+    command = click.option('--interval', type=click.FloatRange(min=0.5), default=2.0,
+                           show_default=True, help='Seconds between refreshes in watch mode.')(command)
+    return click.option('-w', '--watch', 'watch_mode', is_flag=True,
+                        help='Keep polling and update the table in place.')(command)
+
+def _check_watch_output(watch_mode: bool, output: str, fleet: bool = False, selected: bool = False):
+    """Reject options that cannot be redrawn in place."""
+    if watch_mode and output != 'table':
+        raise click.UsageError("--watch only supports the table output format.")
+    if watch_mode and fleet:
+        raise click.UsageError("--watch cannot be combined with --all-clusters or --regions.")
+    if watch_mode and selected:
+        raise click.UsageError("--watch cannot be combined with --field-selector or --selector.")
+
 @get.command('ec2')
-def get_ec2():
-    """Get EC2 instances in current cluster."""
+@click.option('--ssm/--no-ssm', default=False, help='Show whether each instance is reachable through SSM.')
+@selector_options(INSTANCE_FIELDS)
+@watch_options
+@fleet_options
+@output_option
+def get_ec2(ssm: bool, fields: Selector, labels: Selector, watch_mode: bool, interval: float,
+            all_clusters: bool, regions: Optional[List[str]], output: str):
+    """Get EC2 instances in current cluster.
+
+    Labels are matched against the EC2 tags of the instances.
+    """
+    selectors = _selectors(fields, labels)
+    _check_watch_output(watch_mode, output, fleet=all_clusters or bool(regions), selected=bool(selectors))
     try:
-        ecs = ECSController()
+        ecs = _controller()
         current_cluster = ecs.config.get_current_cluster()
         
-        if not current_cluster:
+        if not current_cluster and not all_clusters:
             click.echo("Error: No cluster selected. Use 'ecsctl use-cluster' first.", err=True)
             sys.exit(1)
-            
-        instances = ecs.get_ec2_instances(current_cluster)
-        
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Instance ID")
-        table.add_column("Type")
-        table.add_column("State")
-        table.add_column("Status")
-        table.add_column("Running Tasks")
-        
-        for instance in instances:
-            table.add_row(
-                instance['InstanceId'],
-                instance['InstanceType'],
-                instance['State'],
-                instance['Status'],
-                str(instance['RunningTasks'])
+
+        kind = _selector_kind('ec2:ssm' if ssm else 'ec2', selectors)
+        if all_clusters or regions:
+            rows = _fleet_rows(
+                ecs, kind, regions, None if all_clusters else current_cluster,
+                lambda controller, cluster: controller.get_ec2_instances(cluster, ssm, **selectors),
+                output, "Failed to get EC2 instances"
             )
+            _print(ecs, rows, output, _ec2_table)
+            _report_errors(ecs)
+            return
+
+        if watch_mode:
+            from ecsctl.watch import InstanceWatcher
+
+            _watch(ecs, InstanceWatcher(ecs, current_cluster, ssm), _ec2_table, interval)
+            _report_errors(ecs)
+            return
+            
+        instances = _rows(
+            ecs, kind, current_cluster,
+            lambda: ecs.get_ec2_instances(current_cluster, ssm, **selectors),
+            lambda: ecs.iter_container_instances(current_cluster, ssm, **selectors),
+            output, "Failed to get EC2 instances"
+        )
         
-        ecs.console.print(table)
+        _print(ecs, instances, output, _ec2_table)
+        _report_errors(ecs)
     except ECSCommandError as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
 @get.command('services')
-def get_services():
+@selector_options(SERVICE_FIELDS)
+@watch_options
+@fleet_options
+@output_option
+def get_services(fields: Selector, labels: Selector, watch_mode: bool, interval: float,
+                 all_clusters: bool, regions: Optional[List[str]], output: str):
     """Get services in current cluster, including EC2 instance IDs."""
+    selectors = _selectors(fields, labels)
+    _check_watch_output(watch_mode, output, fleet=all_clusters or bool(regions), selected=bool(selectors))
     try:
-        ecs = ECSController()
+        ecs = _controller()
         current_cluster = ecs.config.get_current_cluster()
         
-        if not current_cluster:
+        if not current_cluster and not all_clusters:
             click.echo("Error: No cluster selected. Use 'ecsctl use-cluster' first.", err=True)
             sys.exit(1)
+
+        kind = _selector_kind('services', selectors)
+        if all_clusters or regions:
+            rows = _fleet_rows(
+                ecs, kind, regions, None if all_clusters else current_cluster,
+                lambda controller, cluster: controller.get_services(cluster, **selectors),
+                output, "Failed to get services"
+            )
+            _print(ecs, rows, output, _services_table)
+            _report_errors(ecs)
+            return
+
+        if watch_mode:
+            from ecsctl.watch import ServiceWatcher
+
+            _watch(ecs, ServiceWatcher(ecs, current_cluster), _services_table, interval)
+            _report_errors(ecs)
+            return
             
-        services = ecs.get_services(current_cluster)
+        services = _rows(
+            ecs, kind, current_cluster,
+            lambda: ecs.get_services(current_cluster, **selectors),
+            lambda: ecs.iter_services(current_cluster, **selectors),
+            output, "Failed to get services"
+        )
         
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Name")
-        table.add_column("Status")
-        table.add_column("Task Definition")
-        table.add_column("Desired")
-        table.add_column("Running")
-        table.add_column("Pending")
-        table.add_column("EC2 Instances", no_wrap=False)
+        _print(ecs, services, output, _services_table)
+        _report_errors(ecs)
+    except ECSCommandError as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+def _containers_table(containers: List[Dict[str, Any]]) -> 'Table':
+    """Build the containers table."""
+    context = context_fields(containers)
+    table = _new_table()
+    for field in context:
+        table.add_column(field)
+    table.add_column("Name")
+    table.add_column("Status")
+    table.add_column("Task ID")
+    table.add_column("CPU")
+    table.add_column("Memory")
+    table.add_column("EC2 Instance")
+    table.add_column("Created")
+    
+    for container in containers:
+        table.add_row(
+            *(container[field] for field in context),
+            container['Name'],
+            container['Status'],
+            container['TaskId'],
+            str(container['CPU']),
+            str(container['Memory']),
+            container['EC2Instance'],
+            container['Created']
+        )
+    return table
+
+@get.command('containers')
+@click.option('--service', help='Only containers of this service.')
+@click.option('--desired-status', type=click.Choice(['RUNNING', 'PENDING', 'STOPPED'], case_sensitive=False),
+              help='Only containers of tasks with this desired status (ECS default: RUNNING).')
+@click.option('--instance', 'instance_id', help='Only containers on this EC2 instance.')
+@selector_options(TASK_FIELDS)
+@fleet_options
+@output_option
+def get_containers(service: Optional[str], desired_status: Optional[str], instance_id: Optional[str],
+                   fields: Selector, labels: Selector, all_clusters: bool, regions: Optional[List[str]],
+                   output: str):
+    """Get containers in current cluster, including their EC2 instance."""
+    try:
+        ecs = _controller()
+        current_cluster = ecs.config.get_current_cluster()
         
-        for service in services:
-            ec2_instances = (
-                '\n'.join(instance.strip() for instance in service['EC2Instances'].split(','))
-                if service['EC2Instances']
-                else '-'
-            )
-            
-            table.add_row(
-                service['ServiceName'],
-                service['Status'],
-                service['TaskDefinition'].split('/')[-1],
-                str(service['DesiredCount']),
-                str(service['RunningCount']),
-                str(service['PendingCount']),
-                ec2_instances
+        if not current_cluster and not all_clusters:
+            click.echo("Error: No cluster selected. Use 'ecsctl use-cluster' first.", err=True)
+            sys.exit(1)
+
+        desired_status = desired_status.upper() if desired_status else None
+        filters = dict(service=service, desired_status=desired_status, instance_id=instance_id)
+        # Filtered listings are cached separately from the full one
+        kind = 'containers'
+        if any(filters.values()):
+            kind += ':' + ','.join(f'{key}={value}' for key, value in filters.items() if value)
+        selectors = _selectors(fields, labels)
+        kind = _selector_kind(kind, selectors)
+        filters.update(selectors)
+
+        if all_clusters or regions:
+            rows = _fleet_rows(
+                ecs, kind, regions, None if all_clusters else current_cluster,
+                lambda controller, cluster: controller.get_containers(cluster, **filters),
+                output, "Failed to get containers"
             )
+            _print(ecs, rows, output, _containers_table)
+            _report_errors(ecs)
+            return
+
+        containers = _rows(
+            ecs, kind, current_cluster,
+            lambda: ecs.get_containers(current_cluster, **filters),
+            lambda: ecs.iter_containers(current_cluster, **filters),
+            output, "Failed to get containers"
+        )
         
-        ecs.console.print(table)
+        _print(ecs, containers, output, _containers_table)
+        _report_errors(ecs)
     except ECSCommandError as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
+def _task_definitions_table(task_definitions: List[Dict[str, Any]]) -> 'Table':
+    """Build the task definitions table."""
+    context = context_fields(task_definitions)
+    table = _new_table()
+    for field in context:
+        table.add_column(field)
+    table.add_column("Family")
+    table.add_column("Revision")
+    table.add_column("Status")
+    table.add_column("CPU")
+    table.add_column("Memory")
+    table.add_column("Last Updated")
+    
+    for td in task_definitions:
+        table.add_row(
+            *(td[field] for field in context),
+            td['Family'],
+            str(td['Revision']),
+            td['Status'],
+            td['Cpu'],
+            td['Memory'],
+            td['LastUpdated']
+        )
+    return table
+
 @get.command('task-definitions')
 @click.option('--family', help='Filter by task definition family')
-def get_task_definitions(family: Optional[str]):
+@click.option('--latest', is_flag=True, help='Only show the newest revision of each active family.')
+@selector_options(TASK_DEFINITION_FIELDS, labels=False)
+@regions_option
+@output_option
+def get_task_definitions(family: Optional[str], latest: bool, fields: Selector,
+                         regions: Optional[List[str]], output: str):
     """Get task definitions."""
     try:
-        ecs = ECSController()
-        task_definitions = ecs.get_task_definitions(family)
-        
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Family")
-        table.add_column("Revision")
-        table.add_column("Status")
-        table.add_column("CPU")
-        table.add_column("Memory")
-        table.add_column("Last Updated")
-        
-        for td in task_definitions:
-            table.add_row(
-                td['Family'],
-                str(td['Revision']),
-                td['Status'],
-                td['Cpu'],
-                td['Memory'],
-                td['LastUpdated']
+        ecs = _controller()
+        selectors = _selectors(fields)
+        kind = _selector_kind('task-definitions:latest' if latest else 'task-definitions', selectors)
+        if regions:
+            rows = _fleet_rows(
+                ecs, kind, regions, None,
+                lambda controller, cluster: controller.get_task_definitions(family, latest, **selectors),
+                output, "Failed to get task definitions", scope=family or '-'
             )
+            _print(ecs, rows, output, _task_definitions_table)
+            _report_errors(ecs)
+            return
+
+        task_definitions = _rows(
+            ecs, kind, family or '-',
+            lambda: ecs.get_task_definitions(family, latest, **selectors),
+            lambda: ecs.iter_task_definitions(family, latest, **selectors),
+            output, "Failed to get task definitions"
+        )
         
-        ecs.console.print(table)
+        _print(ecs, task_definitions, output, _task_definitions_table)
+        _report_errors(ecs)
     except ECSCommandError as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
+@cli.group()
+def top():
+    """Show CPU and memory reserved on hosts and by services."""
+    pass
+
+def sort_option(command: Callable) -> Callable:
+    """Add --sort-by to a top command."""
+    return click.option('--sort-by', type=click.Choice(SORT_KEYS), default='cpu', show_default=True,
+                        help='Sort by CPU or memory utilisation, highest first, or by name.')(command)
+
+def _usage(used: int, total: int) -> str:
+    """Format a reservation as used/total."""
+    return f"{used}/{total}"
+
+def _nodes_table(nodes: List[Dict[str, Any]]) -> 'Table':
+    """Build the host capacity table."""
+    table = _new_table()
+    table.add_column("Instance ID")
+    table.add_column("Status")
+    table.add_column("Tasks", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("CPU %", justify="right")
+    table.add_column("Memory (MiB)", justify="right")
+    table.add_column("Memory %", justify="right")
+
+    for node in nodes:
+        table.add_row(
+            node['InstanceId'],
+            node['Status'],
+            str(node['RunningTasks']),
+            _usage(node['CpuUsed'], node['CpuRegistered']),
+            f"{node['CpuUtilization']:.1f}",
+            _usage(node['MemoryUsed'], node['MemoryRegistered']),
+            f"{node['MemoryUtilization']:.1f}"
+        )
+    return table
+
+def _service_capacity_table(services: List[Dict[str, Any]]) -> 'Table':
+    """Build the service reservation table."""
+    table = _new_table()
+    table.add_column("Name")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Hosts", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("CPU % of Cluster", justify="right")
+    table.add_column("Memory (MiB)", justify="right")
+    table.add_column("Memory % of Cluster", justify="right")
+
+    for service in services:
+        table.add_row(
+            service['ServiceName'],
+            str(service['Tasks']),
+            str(service['Hosts']),
+            str(service['Cpu']),
+            f"{service['CpuShare']:.1f}",
+            str(service['Memory']),
+            f"{service['MemoryShare']:.1f}"
+        )
+    return table
+
+def _capacity_summary_table(summary: List[Dict[str, Any]]) -> 'Table':
+    """Build the cluster-wide totals table."""
+    table = _new_table()
+    table.title = "Cluster"
+    table.add_column("Resource")
+    table.add_column("Used", justify="right")
+    table.add_column("Utilization %", justify="right")
+    table.add_column("Largest Free", justify="right")
+    table.add_column("Fragmentation %", justify="right")
+
+    for resource in summary:
+        table.add_row(
+            resource['Resource'],
+            _usage(resource['Used'], resource['Registered']),
+            f"{resource['Utilization']:.1f}",
+            str(resource['LargestFree']),
+            f"{100 * resource['Fragmentation']:.0f}"
+        )
+    return table
+
+def _top(rows: Callable[[Any], List[Dict[str, Any]]], render: Callable, tasks: bool, output: str):
+    """Print the rows of a top command, followed by the cluster totals as a table."""
+    try:
+        ecs = _controller()
+        current_cluster = ecs.config.get_current_cluster()
+
+        if not current_cluster:
+            click.echo("Error: No cluster selected. Use 'ecsctl use-cluster' first.", err=True)
+            sys.exit(1)
+
+        capacity = ecs.get_capacity(current_cluster, tasks=tasks)
+        _print(ecs, rows(capacity), output, render)
+        if output == 'table':
+            ecs.console.print(_capacity_summary_table(capacity.summary()))
+        _report_errors(ecs)
+    except ECSCommandError as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+@top.command('nodes')
+@sort_option
+@output_option
+def top_nodes(sort_by: str, output: str):
+    """Show registered and reserved CPU and memory of every host.
+
+    Fragmentation is how scattered the free capacity of the active hosts
+    is: 0% when it is all on one host, close to 100% when it is spread in
+    pieces too small for a large task.
+    """
+    _top(lambda capacity: capacity.nodes(sort_by), _nodes_table, False, output)
+
+@top.command('services')
+@sort_option
+@output_option
+def top_services(sort_by: str, output: str):
+    """Show CPU and memory reserved by the tasks of every service."""
+    _top(lambda capacity: capacity.services(sort_by), _service_capacity_table, True, output)
+
+def _exec_target(ecs: 'ECSController', cluster: str, instance_id: str) -> Tuple[bool, bool]:
+    """Check an exec target, from a fresh cached ``get ec2 --ssm`` listing if allowed.
+
+    Only an instance listed as online is taken from the cache; anything
+    else is checked live, as it may have changed since the listing.
+    """
+    options = click.get_current_context().find_root().obj or {}
+    if options.get('cached', False):
+        rows = ecs.cache.fresh('ec2:ssm', cluster) or []
+        if any(row['InstanceId'] == instance_id and row['SSM'] == 'Online' for row in rows):
+            return True, True
+    return ecs.check_exec_target(cluster, instance_id)
+
 @cli.command('exec')
 @click.argument('instance_id')
 def exec_instance(instance_id: str):
     """Execute interactive shell on EC2 instance using SSM."""
+    if (click.get_current_context().find_root().obj or {}).get('replay_dir'):
+        raise click.UsageError('exec starts a live SSM session and cannot be replayed.')
     try:
-        ecs = ECSController()
+        ecs = _controller()
         current_cluster = ecs.config.get_current_cluster()
         
         if not current_cluster:
             click.echo("Error: No cluster selected. Use 'ecsctl use-cluster' first.", err=True)
             sys.exit(1)
 
-        # Verify instance exists in cluster
-        instance = ecs.get_instance_details(current_cluster, instance_id)
-        if not instance:
+        # Verify the instance is in the cluster and reachable through SSM
+        in_cluster, ssm_online = _exec_target(ecs, current_cluster, instance_id)
+        if not in_cluster:
             click.echo(f"Error: Instance '{instance_id}' not found in cluster '{current_cluster}'", err=True)
             sys.exit(1)
 
-        # Check SSM availability
-        if not ecs.check_ssm_status(instance_id):
+        if not ssm_online:
             click.echo(f"Error: SSM is not available on instance '{instance_id}'", err=True)
             sys.exit(1)
 
@@ -205,9 +879,8 @@ def exec_instance(instance_id: str):
         # Add region
         cmd.extend(['--region', ecs.aws_client.region])
         
-        # Check if bash is available and use it if possible
-        if subprocess.run(['which', 'bash'], capture_output=True).returncode == 0:
-            cmd.extend(['--document-name', 'AWS-StartInteractiveCommand', '--parameters', 'command=bash'])
+        # Start bash instead of the default sh
+        cmd.extend(['--document-name', 'AWS-StartInteractiveCommand', '--parameters', 'command=bash'])
         
         # Use the context manager for signal handling during subprocess execution
         with ignore_user_entered_signals():
@@ -220,20 +893,86 @@ def exec_instance(instance_id: str):
 @cli.command('get-context')
 def get_context():
     """Get current context (cluster)."""
+    from ecsctl.config import ClusterConfig
+    from rich.console import Console
+
+    current_cluster = ClusterConfig().get_current_cluster()
+    
+    table = _new_table()
+    table.add_column("Context")
+    table.add_column("Value")
+    
+    table.add_row("Current Cluster", current_cluster or "Not set")
+    
+    Console().print(table)
+
+@cli.command('shell')
+@click.option('--ttl', type=click.FloatRange(min=0), default=10.0, show_default=True,
+              help='Seconds a result is reused by later commands.')
+def shell(ttl: float):
+    """Run ecsctl commands interactively with one session and recent results.
+
+    Commands reuse the authenticated session, clients and lookup indexes of
+    the shell, and results fetched in the last --ttl seconds. After get ec2
+    --ssm, exec on an instance listed as online needs no lookup.
+    Names of clusters, services and instances already fetched are completed
+    with Tab.
+    """
+    from ecsctl.cache import MemoryCache
+    from ecsctl.shell import EcsShell
+
     try:
-        ecs = ECSController()
-        current_cluster = ecs.config.get_current_cluster()
-        
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Context")
-        table.add_column("Value")
-        
-        table.add_row("Current Cluster", current_cluster or "Not set")
-        
-        ecs.console.print(table)
+        ecs = _controller()
     except ECSCommandError as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
+    ecs.cache = MemoryCache(ecs.cache.account, ecs.region, ttl)
+    options = click.get_current_context().find_root().obj
+    defaults = {'cached': True, 'replay_dir': options.get('replay_dir')}
+    EcsShell(ecs, cli, defaults).cmdloop()
+
+@cli.command('daemon')
+@click.option('--socket', 'socket_file', type=click.Path(dir_okay=False), envvar='ECSCTL_DAEMON_SOCKET',
+              help='Socket to serve on.  [default: ~/.ecsctl/daemon.sock]')
+@click.option('--idle-timeout', type=click.FloatRange(min=0), default=3600.0, show_default=True,
+              help='Exit after this many seconds without a command; 0 never exits.')
+@click.option('--stop', 'stop_daemon', is_flag=True, help='Stop the running daemon and exit.')
+def daemon(socket_file: Optional[str], idle_timeout: float, stop_daemon: bool):
+    """Serve commands from a long-lived process with warm AWS sessions.
+
+    While the daemon runs, ecsctl commands are executed by it instead of a
+    new process, reusing its authenticated sessions, connections and caches.
+    exec, shell and --watch always run locally. Set ECSCTL_NO_DAEMON=1 to bypass it.
+    """
+    from pathlib import Path
+    from ecsctl.daemon import DaemonServer, socket_path, stop
+
+    path = Path(socket_file) if socket_file else socket_path()
+    if stop_daemon:
+        if not stop(path):
+            click.echo(f"Error: No daemon is running on {path}", err=True)
+            sys.exit(1)
+        click.echo("Daemon stopped")
+        return
+    try:
+        server = DaemonServer(path, idle_timeout)
+    except (ECSCommandError, OSError) as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    click.echo(f"Serving ecsctl commands on {path}", err=True)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+def main():
+    """Run ecsctl, in the daemon if one is running."""
+    from ecsctl.daemon import forward
+
+    code = forward(sys.argv[1:])
+    if code is None:
+        cli()
+    sys.exit(code)
 
 if __name__ == '__main__':
-    cli()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Bounded concurrent fan-out for independent AWS API calls."""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
+
+# Marks threads running a fan-out call, whose own fan-outs then run inline
+_worker = threading.local()
+
+
+def _on_worker() -> bool:
+    """Return whether the current thread is running a fan-out call."""
+    return getattr(_worker, 'active', False)
+
+
+class ItemError:
+    """Failure of a single item in a fan-out.
+
+    Attributes:
+        item (Any): Input item whose call failed
+        error (Exception): Exception raised for the item
+        label (str): Short description of the operation, used in messages
+    """
+
+    __slots__ = ('item', 'error', 'label')
+
+    def __init__(self, item: Any, error: Exception, label: str = '') -> None:
+        self.item = item
+        self.error = error
+        self.label = label
+
+    def __str__(self) -> str:
+        item = self.item
+        if isinstance(item, (list, tuple)) and len(item) > 1:
+            item = f"{len(item)} items from {item[0]}"
+        return f"{self.label or 'call'} failed for {item}: {self.error}"
+
+
+class FanOutExecutor:
+    """Runs independent calls on a bounded thread pool.
+
+    Round-trip time to the AWS region dominates ecsctl's latency, so batches
+    of describe calls are issued concurrently. Results are returned in input
+    order regardless of completion order. A failing item does not abort the
+    others; its error is recorded in ``errors`` instead. Only when every item
+    fails is the first error re-raised, so systemic failures such as missing
+    permissions still surface as errors.
+
+    ``max_workers`` bounds the calls in flight across every ``map`` and
+    ``imap`` of the executor, including fan-outs started from inside a call:
+    those run inline on the worker thread instead of starting another pool,
+    and concurrent fan-outs share the same slots.
+
+    boto3 clients are thread-safe, so one client can be shared by all workers.
+
+    Attributes:
+        max_workers (int): Maximum number of concurrent calls
+        errors (List[ItemError]): Per-item failures collected so far
+
+    Example:
+        >>> executor = FanOutExecutor(max_workers=16)
+        >>> pages = executor.map(describe_batch, batches, label='describe_tasks')
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_CONCURRENCY) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_workers: Maximum number of concurrent calls; 1 runs inline
+
+        Raises:
+            ValueError: If max_workers is lower than 1
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.errors: List[ItemError] = []
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def map(
+        self,
+        func: Callable[[T], R],
+        items: Sequence[T],
+        label: str = ''
+    ) -> List[R]:
+        """Call ``func`` for every item and return the successful results.
+
+        Args:
+            func: Function to call with each item
+            items: Items to process
+            label: Operation name recorded with per-item errors
+
+        Returns:
+            Results of the successful calls, in the order of ``items``
+
+        Raises:
+            Exception: The first error, if every item failed
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        outcomes = self._run(func, items)
+        results = []
+        errors = []
+        for item, (ok, value) in zip(items, outcomes):
+            if ok:
+                results.append(value)
+            else:
+                errors.append(ItemError(item, value, label))
+
+        if errors and not results:
+            raise errors[0].error
+        for error in errors:
+            logger.warning(str(error))
+        self.errors.extend(errors)
+        return results
+
+    def imap(
+        self,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        label: str = ''
+    ) -> Iterator[R]:
+        """Lazily call ``func`` for every item and yield successful results.
+
+        Unlike ``map``, items are pulled from ``items`` as workers free up and
+        each result is yielded as soon as it and all earlier results are
+        done, so a lazily paginated listing can be processed while its next
+        page is still being fetched. At most ``2 * max_workers`` items are in
+        flight. Closing the generator early cancels the calls not yet started.
+
+        Args:
+            func: Function to call with each item
+            items: Items to process, consumed lazily
+            label: Operation name recorded with per-item errors
+
+        Yields:
+            Results of the successful calls, in the order of ``items``
+
+        Raises:
+            Exception: The first error, if every item failed
+        """
+        failed: List[ItemError] = []
+        succeeded = False
+
+        def outcome(item: T, ok: bool, value: Any):
+            nonlocal succeeded
+            if ok:
+                succeeded = True
+                return True
+            error = ItemError(item, value, label)
+            logger.warning(str(error))
+            failed.append(error)
+            return False
+
+        if self.max_workers == 1 or _on_worker():
+            for item in items:
+                ok, value = self._call(func, item)
+                if outcome(item, ok, value):
+                    yield value
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ecsctl')
+            pending = deque()
+            try:
+                for item in items:
+                    pending.append((item, pool.submit(self._call, func, item)))
+                    while pending and (len(pending) >= 2 * self.max_workers or pending[0][1].done()):
+                        head, future = pending.popleft()
+                        ok, value = future.result()
+                        if outcome(head, ok, value):
+                            yield value
+                while pending:
+                    head, future = pending.popleft()
+                    ok, value = future.result()
+                    if outcome(head, ok, value):
+                        yield value
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        if failed and not succeeded:
+            raise failed[0].error
+        self.errors.extend(failed)
+
+    def _run(self, func: Callable[[T], R], items: List[T]) -> List[tuple]:
+        """Run the calls and return ``(ok, result_or_error)`` per item."""
+        workers = min(self.max_workers, len(items))
+        if workers == 1 or _on_worker():
+            return [self._call(func, item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ecsctl') as pool:
+            return list(pool.map(lambda item: self._call(func, item), items))
+
+    def _call(self, func: Callable[[T], R], item: T) -> tuple:
+        """Call ``func`` in a slot of the executor and return ``(ok, result_or_error)``.
+
+        A call made from inside another call already holds a slot and runs
+        without taking a second one.
+        """
+        if _on_worker():
+            try:
+                return True, func(item)
+            except Exception as e:
+                return False, e
+        with self._slots:
+            _worker.active = True
+            try:
+                return True, func(item)
+            except Exception as e:
+                return False, e
+            finally:
+                _worker.active = False
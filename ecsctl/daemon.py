@@ -0,0 +1,390 @@
+"""Long-lived ecsctl process serving commands over a Unix socket.
+
+Every ecsctl invocation normally starts a new interpreter, imports boto3,
+resolves credentials (possibly assuming a role), opens fresh HTTPS
+connections and forgets its container instance indexes on exit. ``ecsctl
+daemon`` keeps all of that warm: it runs commands sent by the CLI in its own
+process and reuses one ``ECSController`` per combination of AWS settings and
+global options, so a forwarded command pays for its AWS calls only.
+
+The CLI forwards a command when a daemon answers on the socket and falls
+back to running it in-process otherwise. Commands that need the terminal
+(``exec``, ``shell`` and ``--watch``) always run locally.
+
+Protocol: the client sends one JSON line holding the arguments, environment
+and working directory of the command. The daemon answers with frames of a
+one-byte channel, a 4-byte big-endian length and the payload: output for the
+stdout and stderr channels, then the exit code on the exit channel.
+
+Commands run one at a time, because they share the daemon's standard
+streams, environment and working directory.
+
+Example:
+    >>> code = forward(['get', 'services', '-o', 'json'])
+    >>> if code is None:
+    ...     cli()  # no daemon running
+"""
+
+import io
+import json
+import os
+import shutil
+import socket
+import socketserver
+import struct
+import sys
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from ecsctl.config import CONFIG_DIR
+from ecsctl.exceptions import ECSCommandError
+
+DAEMON_SOCKET = CONFIG_DIR / 'daemon.sock'
+SOCKET_ENV = 'ECSCTL_DAEMON_SOCKET'
+# Set to run every command in-process even when a daemon is running
+DISABLE_ENV = 'ECSCTL_NO_DAEMON'
+
+DEFAULT_IDLE_TIMEOUT = 3600.0
+# Warm controllers kept for distinct profiles, regions and option sets
+DEFAULT_POOL_SIZE = 8
+
+# Commands attached to the caller's terminal are never forwarded
+LOCAL_COMMANDS = frozenset(['daemon', 'exec', 'shell'])
+LOCAL_FLAGS = frozenset(['-w', '--watch'])
+# Root options taking a value, skipped while looking for the command name
+VALUE_OPTIONS = frozenset([
+    '--concurrency', '--max-attempts', '--retry-mode', '--rate-limit', '--record', '--replay'
+])
+
+STDOUT = b'o'
+STDERR = b'e'
+EXIT = b'x'
+_FRAME_HEADER = struct.Struct('>cI')
+
+# Pool of the daemon serving in this process, None in the CLI
+_pool: Optional['ControllerPool'] = None
+
+
+def socket_path() -> Path:
+    """Return the daemon socket, ``~/.ecsctl/daemon.sock`` unless overridden."""
+    return Path(os.getenv(SOCKET_ENV) or DAEMON_SOCKET)
+
+
+def command_name(argv: List[str]) -> Optional[str]:
+    """Return the subcommand of an ecsctl command line, None if there is none."""
+    args = iter(argv)
+    for arg in args:
+        if arg == '--':
+            return next(args, None)
+        if arg in VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+    return None
+
+
+def forwardable(argv: List[str]) -> bool:
+    """Return whether a command line can run in the daemon."""
+    command = command_name(argv)
+    if command is None or command in LOCAL_COMMANDS:
+        return False
+    return not any(arg in LOCAL_FLAGS for arg in argv)
+
+
+def controller_pool() -> Optional['ControllerPool']:
+    """Return the controller pool when running inside the daemon."""
+    return _pool
+
+
+class ControllerPool:
+    """Least recently used warm controllers, keyed by their settings.
+
+    A controller keeps its session, clients, container instance indexes and
+    caches between commands; ``begin_command`` resets the rest when it is
+    handed out again.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.max_size = max_size
+        self._controllers: 'OrderedDict[Tuple, Any]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._controllers)
+
+    def get(self, options: Dict[str, Any], factory: Callable[[], Any]) -> Any:
+        """Return the controller of the options and the AWS environment.
+
+        Args:
+            options: Global CLI options the controller is built from
+            factory: Creates the controller if none is pooled
+        """
+        key = (
+            tuple(sorted((name, repr(value)) for name, value in options.items())),
+            tuple(sorted((name, value) for name, value in os.environ.items()
+                         if name.startswith('AWS_'))),
+        )
+        controller = self._controllers.pop(key, None)
+        if controller is None:
+            controller = factory()
+        else:
+            controller.begin_command()
+        self._controllers[key] = controller
+        while len(self._controllers) > self.max_size:
+            self._controllers.popitem(last=False)
+        return controller
+
+
+class _FrameWriter(io.RawIOBase):
+    """Binary stream sending each write as a frame of one channel."""
+
+    def __init__(self, send: Callable[[bytes, bytes], None], channel: bytes) -> None:
+        super().__init__()
+        self._send = send
+        self._channel = channel
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._send(self._channel, bytes(data))
+        return len(data)
+
+
+def _frame_stream(send: Callable[[bytes, bytes], None], channel: bytes) -> IO[str]:
+    return io.TextIOWrapper(_FrameWriter(send, channel), encoding='utf-8',
+                            errors='replace', write_through=True)
+
+
+def run_command(request: Dict[str, Any], send: Callable[[bytes, bytes], None]) -> int:
+    """Run a forwarded command with the caller's environment and streams.
+
+    Args:
+        request: Arguments, environment and working directory of the command
+        send: Sends a frame of output to the caller
+
+    Returns:
+        Exit code of the command
+    """
+    from dotenv import load_dotenv
+    from ecsctl.cli import cli
+
+    saved_environ = dict(os.environ)
+    saved_cwd = os.getcwd()
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    stdout = _frame_stream(send, STDOUT)
+    stderr = _frame_stream(send, STDERR)
+    try:
+        os.environ.clear()
+        os.environ.update(request.get('env', {}))
+        os.chdir(request.get('cwd') or saved_cwd)
+        # Same lookup as AWSClient, so the pool key sees settings from .env
+        load_dotenv()
+        sys.stdin = io.StringIO()
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            cli.main(args=request.get('argv', []), prog_name='ecsctl')
+            code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+    return code
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Runs one forwarded command per connection."""
+
+    def setup(self) -> None:
+        super().setup()
+        self.connected = True
+
+    def send(self, channel: bytes, payload: bytes) -> None:
+        # A caller that went away must not fail the command half-way
+        if not self.connected:
+            return
+        try:
+            self.wfile.write(_FRAME_HEADER.pack(channel, len(payload)) + payload)
+        except OSError:
+            self.connected = False
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get('stop'):
+            self.server.stopping = True
+            code = 0
+        else:
+            code = run_command(request, self.send)
+        self.send(EXIT, str(code).encode())
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Unix socket server running forwarded commands one at a time.
+
+    Attributes:
+        pool (ControllerPool): Warm controllers reused across commands
+        stopping (bool): Set by a stop request or once idle for too long
+    """
+
+    def __init__(self, path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        """Bind the socket, readable and writable by the current user only.
+
+        Args:
+            path: Socket path
+            idle_timeout: Seconds without a command before the daemon exits;
+                          0 to never exit
+
+        Raises:
+            ECSCommandError: If a daemon already serves the socket
+        """
+        running = _connect(path)
+        if running is not None:
+            running.close()
+            raise ECSCommandError(f"A daemon is already running on {path}")
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # A leftover socket of a daemon that did not shut down cleanly
+        if path.exists():
+            path.unlink()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _CommandHandler)
+        finally:
+            os.umask(umask)
+        self.path = path
+        self.pool = ControllerPool()
+        self.stopping = False
+        self.timeout = idle_timeout or None
+
+    def handle_timeout(self) -> None:
+        self.stopping = True
+
+    def serve(self) -> None:
+        """Serve commands until stopped or idle, then remove the socket."""
+        global _pool
+        _pool = self.pool
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            _pool = None
+            self.server_close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    """Connect to the daemon socket, None if no daemon is listening."""
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _read_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _request(
+    sock: socket.socket,
+    request: Dict[str, Any],
+    stdout: IO[bytes],
+    stderr: IO[bytes]
+) -> Optional[int]:
+    """Send a request and copy the answer frames to the caller's streams.
+
+    Returns:
+        Exit code of the command, None if the daemon closed the connection
+        before answering
+    """
+    answered = False
+    with sock:
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        while True:
+            header = _read_exactly(sock, _FRAME_HEADER.size)
+            if header is None:
+                break
+            channel, size = _FRAME_HEADER.unpack(header)
+            payload = _read_exactly(sock, size)
+            if payload is None:
+                break
+            answered = True
+            if channel == EXIT:
+                return int(payload)
+            stream = stdout if channel == STDOUT else stderr
+            stream.write(payload)
+            stream.flush()
+    if not answered:
+        return None
+    stderr.write(b"Error: The ecsctl daemon stopped while running the command\n")
+    return 1
+
+
+def forward(
+    argv: List[str],
+    stdout: Optional[IO[bytes]] = None,
+    stderr: Optional[IO[bytes]] = None
+) -> Optional[int]:
+    """Run a command in the daemon if one is running.
+
+    Args:
+        argv: Command line arguments, without the program name
+        stdout: Binary stream of the command's output, the process's if None
+        stderr: Binary stream of the command's errors, the process's if None
+
+    Returns:
+        Exit code of the command, or None if it has to run in-process
+    """
+    if os.getenv(DISABLE_ENV) or not forwardable(argv):
+        return None
+    sock = _connect(socket_path())
+    if sock is None:
+        return None
+    stdout = stdout or sys.stdout.buffer
+    env = dict(os.environ)
+    if stdout.isatty():
+        # The daemon's streams are not terminals: pass on what rich would detect
+        env.setdefault('COLUMNS', str(shutil.get_terminal_size().columns))
+        if 'NO_COLOR' not in env:
+            env.setdefault('FORCE_COLOR', '1')
+    request = {'argv': argv, 'env': env, 'cwd': os.getcwd()}
+    return _request(sock, request, stdout, stderr or sys.stderr.buffer)
+
+
+def stop(path: Optional[Path] = None) -> bool:
+    """Ask the daemon to exit after the command it is running.
+
+    Returns:
+        Whether a daemon was running
+    """
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return False
+    _request(sock, {'stop': True}, io.BytesIO(), io.BytesIO())
+    return True
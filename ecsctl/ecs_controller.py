@@ -1,13 +1,121 @@
 import boto3
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import threading
+import copy
+import itertools
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Sequence, Tuple
 from ecsctl.aws_client import AWSClient
+from ecsctl.cache import ResourceCache, RevisionStore, account_key
+from ecsctl.capacity import ClusterCapacity
+from ecsctl.concurrency import DEFAULT_CONCURRENCY, FanOutExecutor, ItemError
 from ecsctl.config import ClusterConfig
 from ecsctl.exceptions import ECSCommandError
+from ecsctl.index import (
+    DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE,
+    ContainerInstanceIndex,
+    TagIndex,
+    TaskSnapshot,
+)
+from ecsctl.instrumentation import ApiProfiler
+from ecsctl.models import (
+    SSM_NOT_REGISTERED,
+    SSM_UNKNOWN,
+    Container,
+    Instance,
+    Service,
+    Task,
+    TaskDefinition,
+)
+from ecsctl.recording import ApiRecording
+from ecsctl.selectors import EQUALS, Selector, tag_dict
+from ecsctl.throttling import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_MODE,
+    RateLimiter,
+    retry_config,
+)
+from ecsctl.utils import chunked, paginate
 from rich.console import Console
 import logging
 
+# Largest page size accepted by the ECS list APIs
+LIST_PAGE_SIZE = 100
+
+# Maximum number of items accepted by a single AWS describe call
+DESCRIBE_INSTANCES_BATCH_SIZE = 100
+DESCRIBE_SERVICES_BATCH_SIZE = 10
+DESCRIBE_TASKS_BATCH_SIZE = 100
+
+# Largest page of describe_instance_information; filtering by as many
+# instances keeps every batch to a single page
+DESCRIBE_INSTANCE_INFORMATION_BATCH_SIZE = 50
+
+# Instance fields the cluster query language of list_container_instances
+# filters on, by field selector key
+INSTANCE_QUERY_ATTRIBUTES = {
+    'instanceId': 'ec2InstanceId',
+    'instanceType': 'attribute:ecs.instance-type',
+    'availabilityZone': 'attribute:ecs.availability-zone',
+}
+
+# Values that can be put unquoted into a cluster query language expression
+QUERY_VALUE = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+# Values the list APIs accept for the enum filters field selectors are pushed
+# down to; any other value is only matched locally
+CONTAINER_INSTANCE_STATUSES = ('ACTIVE', 'DRAINING', 'REGISTERING', 'DEREGISTERING', 'REGISTRATION_FAILED')
+DESIRED_STATUSES = ('RUNNING', 'PENDING', 'STOPPED')
+LAUNCH_TYPES = ('EC2', 'FARGATE', 'EXTERNAL')
+SCHEDULING_STRATEGIES = ('REPLICA', 'DAEMON')
+TASK_DEFINITION_STATUSES = ('ACTIVE', 'INACTIVE', 'DELETE_IN_PROGRESS')
+# Status list_task_definitions lists without a status filter
+DEFAULT_TASK_DEFINITION_STATUS = 'ACTIVE'
+
+
+def _pushdown(fields: Selector, key: str, allowed: Sequence[str]) -> Optional[str]:
+    """Return the value a field must equal if the list API accepts it as a filter."""
+    value = fields.equals(key)
+    return value if value in allowed else None
+
+
+def _cluster_query(fields: Selector) -> Optional[str]:
+    """Build the cluster query language filter of the instance field requirements.
+
+    Requirements whose value is not a plain token are left out and only
+    matched locally.
+    """
+    expressions = [
+        f"{INSTANCE_QUERY_ATTRIBUTES[requirement.key]} "
+        f"{'==' if requirement.operator == EQUALS else '!='} {requirement.value}"
+        for requirement in fields.requirements
+        if requirement.key in INSTANCE_QUERY_ATTRIBUTES and QUERY_VALUE.match(requirement.value)
+    ]
+    return ' and '.join(expressions) or None
+
+
+def _instance_fields(container_instance: Dict[str, Any], ec2_instance: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the field selector values of a container instance."""
+    return {
+        'instanceId': container_instance['ec2InstanceId'],
+        'status': container_instance['status'],
+        'state': ec2_instance.get('State', {}).get('Name'),
+        'instanceType': ec2_instance.get('InstanceType'),
+        'availabilityZone': ec2_instance.get('Placement', {}).get('AvailabilityZone'),
+    }
+
+
+def _service_fields(service: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the field selector values of a ``describe_services`` entry."""
+    return {
+        'name': service['serviceName'],
+        'status': service['status'],
+        'launchType': service.get('launchType'),
+        'schedulingStrategy': service.get('schedulingStrategy'),
+        'taskDefinition': service['taskDefinition'].split('/')[-1],
+    }
 
 
 class ECSController:
@@ -15,142 +123,742 @@ class ECSController:
     
     Manages interactions with ECS clusters, instances, and containers.
     Handles authentication and provides methods for common ECS operations.
+    Independent describe calls are issued concurrently; failures of single
+    items are collected in ``errors`` instead of aborting the whole call.
     
     Raises:
         ECSCommandError: If AWS client initialization fails
     """
     
-    def __init__(self) -> None:
-        """Initialize AWS clients and configuration.
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        use_credential_cache: bool = True,
+        profiler: Optional[ApiProfiler] = None,
+        recording: Optional[ApiRecording] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_mode: str = DEFAULT_RETRY_MODE
+    ) -> None:
+        """Initialize AWS client configuration.
         
+        Args:
+            concurrency: Maximum number of parallel describe calls
+            use_credential_cache: Cache assumed-role credentials on disk
+            profiler: Records every API call of the clients created here
+            recording: Records the API responses of the clients created
+                       here, or answers their calls from a recording
+            rate_limiter: Paces the requests of every client created here
+                          and by regional controllers; default limits if None
+            max_attempts: Attempts per API call, including the first one
+            retry_mode: botocore retry mode, ``standard``, ``adaptive`` or
+                        ``legacy``
+
         Raises:
             ECSCommandError: If AWS client initialization fails
         """
         try:
-            self._initialize_aws_clients()
+            self._initialize_aws_clients(use_credential_cache)
         except Exception as e:
             raise ECSCommandError(f"Failed to initialize AWS clients: {str(e)}")
         self.logger = logging.getLogger(__name__)
+        self.profiler = profiler
+        self.recording = recording
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        try:
+            self.client_config = retry_config(max_attempts, retry_mode)
+        except ValueError as e:
+            raise ECSCommandError(f"Failed to initialize AWS clients: {str(e)}")
+        if recording is not None:
+            # Keep the described revisions with the recording, so a replay
+            # makes the same calls on any machine
+            self.revisions = RevisionStore(self.revisions.account, self.region, recording.revisions_dir)
+        self.executor = FanOutExecutor(concurrency)
+        self._instance_indexes: Dict[str, ContainerInstanceIndex] = {}
+        # Tags of described resources, keyed by ARN or EC2 instance ID; shared
+        # with the regional controllers
+        self.tags = TagIndex()
+        # Shared with the regional controllers, which are created once per region
+        self._regional: Dict[str, 'ECSController'] = {self.region: self}
 
-    def _initialize_aws_clients(self) -> None:
+    def _initialize_aws_clients(self, use_credential_cache: bool = True) -> None:
         """Set up AWS client connections.
         
-        Creates authenticated sessions and initializes service clients.
+        Only reads the configuration; the authenticated session and the
+        service clients are created on first use, so commands that only
+        talk to ECS never pay for EC2 or SSM clients.
         Uses role assumption if AWS_ROLE_ARN is set.
         """
-        self.aws_client = AWSClient()
-        role_arn = os.getenv('AWS_ROLE_ARN')
-        
-        session = (
-            self.aws_client.authenticate(role_arn) if role_arn
-            else boto3.Session(
-                profile_name=self.aws_client.profile_name,
-                region_name=self.aws_client.region
-            )
-        )
-        
-        self.ecs_client = session.client('ecs')
-        self.ec2_client = session.client('ec2')
-        self.ssm_client = session.client('ssm')
+        self.aws_client = AWSClient(use_credential_cache=use_credential_cache)
+        self.region = self.aws_client.region
+        self.role_arn = os.getenv('AWS_ROLE_ARN')
+        self._session = None
+        self._clients: Dict[str, Any] = {}
+        # Clients are created from worker threads of concurrent fan-outs
+        self._client_lock = threading.RLock()
         self.console = Console()
         self.config = ClusterConfig()
+        account = account_key(self.role_arn, self.aws_client.profile_name, os.getenv('AWS_ACCESS_KEY_ID'))
+        self.cache = ResourceCache(account=account, region=self.region)
+        # Revisions are keyed by ARN, which includes the account
+        self.revisions = RevisionStore(account=account or 'default', region=self.region)
+
+    @property
+    def session(self) -> boto3.Session:
+        """Authenticated boto3 session, created on first use.
+
+        A replayed run never authenticates: its session has no credentials.
+        """
+        with self._client_lock:
+            if self._session is None:
+                if self.recording is not None and self.recording.replay:
+                    self._session = self.recording.session(self.aws_client.region)
+                elif self.role_arn:
+                    self._session = self.aws_client.authenticate(self.role_arn)
+                else:
+                    self._session = boto3.Session(
+                        profile_name=self.aws_client.profile_name,
+                        region_name=self.aws_client.region
+                    )
+            return self._session
+
+    def _client(self, service_name: str) -> Any:
+        """Return the client of a service, creating it on first use."""
+        client = self._clients.get(service_name)
+        if client is None:
+            with self._client_lock:
+                if service_name not in self._clients:
+                    kwargs = {} if self.region == self.aws_client.region else {'region_name': self.region}
+                    client = self.session.client(service_name, config=self.client_config, **kwargs)
+                    if self.profiler is not None:
+                        self.profiler.register(client)
+                    if self.recording is not None:
+                        self.recording.register(client)
+                    self.rate_limiter.register(client)
+                    self._clients[service_name] = client
+                client = self._clients[service_name]
+        return client
+
+    @property
+    def ecs_client(self) -> Any:
+        """ECS client, created on first use."""
+        return self._client('ecs')
+
+    @ecs_client.setter
+    def ecs_client(self, client: Any) -> None:
+        self._clients['ecs'] = client
+
+    @property
+    def ec2_client(self) -> Any:
+        """EC2 client, created on first use."""
+        return self._client('ec2')
+
+    @ec2_client.setter
+    def ec2_client(self, client: Any) -> None:
+        self._clients['ec2'] = client
+
+    @property
+    def ssm_client(self) -> Any:
+        """SSM client, created on first use."""
+        return self._client('ssm')
+
+    @ssm_client.setter
+    def ssm_client(self, client: Any) -> None:
+        self._clients['ssm'] = client
+
+    def for_region(self, region: str) -> 'ECSController':
+        """Return a controller for another region sharing this one's credentials.
+
+        The regional controller reuses the authenticated session, so one
+        credential set serves every region of the account. It shares the
+        configuration, console and executor, so per-item failures of all
+        regions are reported together, but has its own clients, container
+        instance indexes and cache entries.
+
+        Regional controllers are created once and reused, so a long-lived
+        controller keeps their clients and indexes warm too.
+
+        Args:
+            region: AWS region to query
+
+        Returns:
+            This controller if it already targets the region
+        """
+        with self._client_lock:
+            controller = self._regional.get(region)
+            if controller is None:
+                session = self.session
+                controller = copy.copy(self)
+                controller.region = region
+                controller._session = session
+                controller._clients = {}
+                controller._instance_indexes = {}
+                controller.cache = self.cache.for_region(region)
+                controller.revisions = RevisionStore(self.revisions.account, region, self.revisions.store_dir)
+                self._regional[region] = controller
+        return controller
+
+    def begin_command(self) -> None:
+        """Reset the per-command state of a controller reused across commands.
+
+        Clears the collected per-item errors and recreates the console of
+        this controller and its regional controllers, so terminal width and
+        colour support are detected for the new command. Sessions, clients,
+        indexes and caches are kept.
+        """
+        self.errors.clear()
+        console = Console()
+        for controller in self._regional.values():
+            controller.console = console
+
+    def instance_index(self, cluster_name: str) -> ContainerInstanceIndex:
+        """Return the container instance index of a cluster, created on first use.
+
+        The index lives as long as the controller and is shared by its
+        methods and by an ``AsyncECSController`` wrapping it.
+        """
+        if cluster_name not in self._instance_indexes:
+            self._instance_indexes[cluster_name] = ContainerInstanceIndex(
+                self.ecs_client, cluster_name, executor=self.executor
+            )
+        return self._instance_indexes[cluster_name]
+
+    @property
+    def errors(self) -> List[ItemError]:
+        """Per-item failures collected by concurrent describe calls."""
+        return self.executor.errors
+
+    def _describe_batches(
+        self,
+        describe: Callable[[List[Any]], List[Dict[str, Any]]],
+        batches: Sequence[List[Any]],
+        label: str
+    ) -> List[Dict[str, Any]]:
+        """Run a describe call per batch concurrently and flatten the results."""
+        results = []
+        for page in self.executor.map(describe, batches, label=label):
+            results.extend(page)
+        return results
 
     def get_clusters(self) -> List[str]:
         """Get list of all ECS clusters."""
+        return list(self.iter_clusters())
+
+    def iter_clusters(self) -> Iterator[str]:
+        """
+        Yield the names of all ECS clusters, listing a page at a time.
+
+        Raises:
+            ECSCommandError: If listing fails
+        """
         try:
-            clusters = self.ecs_client.list_clusters()['clusterArns']
-            return [cluster.split('/')[-1] for cluster in clusters]
+            for arn in paginate(self.ecs_client.list_clusters, 'clusterArns', maxResults=LIST_PAGE_SIZE):
+                yield arn.split('/')[-1]
         except Exception as e:
             raise ECSCommandError(f"Failed to get clusters: {str(e)}")
 
-    def get_ec2_instances(self, cluster_name: str) -> List[Dict[Any, Any]]:
-        """Get EC2 instances for specified cluster."""
+    def get_ec2_instances(
+        self,
+        cluster_name: str,
+        ssm: bool = False,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> List[Instance]:
+        """
+        Get EC2 instances for specified cluster.
+
+        Container instances are listed page by page, described in batches of
+        100 and their EC2 metadata is resolved with bulk ``describe_instances``
+        calls, so the number of API calls grows with the number of pages
+        rather than the number of nodes.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            ssm: Include the SSM ping status of every instance, resolved
+                 in bulk alongside the EC2 metadata
+            fields: Only instances matching this field selector
+            labels: Only instances whose EC2 tags match this label selector
+
+        Returns:
+            List of EC2 instance details
+
+        Raises:
+            ECSCommandError: If instance retrieval fails
+        """
+        return list(self.iter_container_instances(cluster_name, ssm, fields, labels))
+
+    def iter_container_instances(
+        self,
+        cluster_name: str,
+        ssm: bool = False,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> Iterator[Instance]:
+        """
+        Yield EC2 instance rows as each batch of container instances resolves.
+
+        Each batch of 100 container instances is described and its EC2
+        metadata resolved on a worker while the next page is being listed.
+        Pages are listed on demand, so a caller that stops iterating stops
+        the remaining API calls; batches already in flight still complete.
+
+        A ``status`` equality and the ``instanceId``, ``instanceType`` and
+        ``availabilityZone`` requirements of a field selector are passed to
+        ``list_container_instances``, so only matching instances are
+        described; every requirement is checked again on the described
+        instances, together with the label selector on their EC2 tags. The
+        SSM status is only looked up for the instances kept.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            ssm: Include the SSM ping status of every instance
+            fields: Only instances matching this field selector
+            labels: Only instances whose EC2 tags match this label selector
+
+        Raises:
+            ECSCommandError: If instance retrieval fails
+        """
+        fields = fields or Selector()
+        labels = labels or Selector()
+
+        def describe(arns: List[str]) -> List[Instance]:
+            container_instances = self._describe_container_instance_batch(cluster_name, arns)
+            ec2_instances = self._describe_ec2_instances(
+                [instance['ec2InstanceId'] for instance in container_instances]
+            )
+            selected = []
+            for instance in container_instances:
+                ec2_instance = ec2_instances.get(instance['ec2InstanceId'], {})
+                tags = tag_dict(ec2_instance.get('Tags'))
+                if labels:
+                    self.tags.add(instance['ec2InstanceId'], tags)
+                if fields.matches(_instance_fields(instance, ec2_instance)) and labels.matches(tags):
+                    selected.append((instance, ec2_instance))
+            instance_ids = [instance['ec2InstanceId'] for instance, _ in selected]
+            ssm_statuses = self.get_ssm_statuses(instance_ids) if ssm and instance_ids else None
+            return [
+                Instance.from_response(instance, ec2_instance, ssm_statuses)
+                for instance, ec2_instance in selected
+            ]
+
+        batches = chunked(
+            self._list_container_instance_arns(cluster_name, fields),
+            DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE
+        )
         try:
-            container_instances = self.ecs_client.list_container_instances(
-                cluster=cluster_name
-            )['containerInstanceArns']
-            
-            instances = []
-            if container_instances:
-                response = self.ecs_client.describe_container_instances(
-                    cluster=cluster_name,
-                    containerInstances=container_instances
-                )
-                
-                for instance in response['containerInstances']:
-                    ec2_response = self.ec2_client.describe_instances(
-                        InstanceIds=[instance['ec2InstanceId']]
-                    )
-                    
-                    instance_info = {
-                        'InstanceId': instance['ec2InstanceId'],
-                        'InstanceType': ec2_response['Reservations'][0]['Instances'][0]['InstanceType'],
-                        'State': ec2_response['Reservations'][0]['Instances'][0]['State']['Name'],
-                        'Status': instance['status'],
-                        'RunningTasks': instance['runningTasksCount']
-                    }
-                    instances.append(instance_info)
-            
-            return instances
+            for rows in self.executor.imap(describe, batches, label='describe_container_instances'):
+                yield from rows
         except Exception as e:
             raise ECSCommandError(f"Failed to get EC2 instances: {str(e)}")
 
-    def get_containers(self, cluster_name: str) -> List[Dict[Any, Any]]:
-        """Get containers for specified cluster with EC2 instance mapping."""
-        try:
-            tasks = self.ecs_client.list_tasks(cluster=cluster_name)['taskArns']
+    def _list_container_instance_arns(
+        self,
+        cluster_name: str,
+        fields: Optional[Selector] = None
+    ) -> Iterator[str]:
+        """Lazily list the container instance ARNs of a cluster, filtered on
+        the server by the field requirements it supports."""
+        filters: Dict[str, str] = {}
+        if fields:
+            status = _pushdown(fields, 'status', CONTAINER_INSTANCE_STATUSES)
+            if status:
+                filters['status'] = status
+            query = _cluster_query(fields)
+            if query:
+                filters['filter'] = query
+        return paginate(
+            self.ecs_client.list_container_instances,
+            'containerInstanceArns',
+            cluster=cluster_name,
+            maxResults=LIST_PAGE_SIZE,
+            **filters
+        )
+
+    def _describe_container_instance_batch(
+        self,
+        cluster_name: str,
+        arns: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Describe up to 100 container instances and add them to the index."""
+        container_instances = self.ecs_client.describe_container_instances(
+            cluster=cluster_name,
+            containerInstances=arns
+        )['containerInstances']
+        self.instance_index(cluster_name).add(container_instances)
+        return container_instances
+
+    def _describe_container_instances(self, cluster_name: str) -> List[Dict[str, Any]]:
+        """List every container instance in the cluster and describe them in batches."""
+        return self._describe_batches(
+            lambda batch: self._describe_container_instance_batch(cluster_name, batch),
+            list(chunked(
+                self._list_container_instance_arns(cluster_name),
+                DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE
+            )),
+            label='describe_container_instances'
+        )
+
+    def _describe_ec2_instances(self, instance_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve EC2 metadata for many instances with bulk describe calls.
+
+        Returns:
+            Mapping of EC2 instance ID to its ``describe_instances`` entry
+        """
+        unique_ids = list(dict.fromkeys(instance_ids))
+        reservations = self._describe_batches(
+            lambda batch: list(paginate(
+                self.ec2_client.describe_instances,
+                'Reservations',
+                token_key='NextToken',
+                InstanceIds=batch
+            )),
+            list(chunked(unique_ids, DESCRIBE_INSTANCES_BATCH_SIZE)),
+            label='describe_instances'
+        )
+        return {
+            instance['InstanceId']: instance
+            for reservation in reservations
+            for instance in reservation['Instances']
+        }
+
+    def _task_snapshot(
+        self,
+        cluster_name: str,
+        previous: Optional[TaskSnapshot] = None
+    ) -> TaskSnapshot:
+        """List every task in the cluster once and describe them in batches.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            previous: Earlier snapshot whose tasks are reused by ARN, so only
+                      tasks started since then are described
+
+        Returns:
+            Snapshot of the tasks currently listed
+        """
+        task_arns = list(paginate(
+            self.ecs_client.list_tasks,
+            'taskArns',
+            cluster=cluster_name,
+            maxResults=LIST_PAGE_SIZE
+        ))
+        known = {arn: previous.get(arn) for arn in task_arns} if previous else {}
+        new_arns = [arn for arn in task_arns if known.get(arn) is None]
+        described = self._describe_batches(
+            lambda batch: self._describe_tasks(cluster_name, batch),
+            list(chunked(new_arns, DESCRIBE_TASKS_BATCH_SIZE)),
+            label='describe_tasks'
+        )
+        if not known:
+            return TaskSnapshot(cluster_name, described)
+        by_arn = {task.arn: task for task in described}
+        tasks = [known.get(arn) or by_arn.get(arn) for arn in task_arns]
+        return TaskSnapshot(cluster_name, [task for task in tasks if task])
+
+    def _describe_tasks(self, cluster_name: str, arns: List[str], tags: bool = False) -> List[Task]:
+        """Describe up to 100 tasks, keeping only the fields ecsctl uses.
+
+        With ``tags``, the tags of the tasks are described too and added to
+        the tag index.
+        """
+        kwargs = {'include': ['TAGS']} if tags else {}
+        tasks = self.ecs_client.describe_tasks(cluster=cluster_name, tasks=arns, **kwargs)['tasks']
+        if tags:
+            for task in tasks:
+                self.tags.add(task['taskArn'], tag_dict(task.get('tags')))
+        return [Task.from_response(task) for task in tasks]
+
+    def _tag_candidates(self, arns: Iterable[str], labels: Selector) -> Iterator[str]:
+        """Drop the resources whose indexed tags do not match a label selector.
+
+        Resources never described with their tags are kept, so they are
+        described and checked.
+        """
+        return (arn for arn in arns if arn not in self.tags or self.tags.matches(arn, labels))
+
+    def get_containers(
+        self,
+        cluster_name: str,
+        service: Optional[str] = None,
+        desired_status: Optional[str] = None,
+        instance_id: Optional[str] = None,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> List[Container]:
+        """
+        Get containers for specified cluster with EC2 instance mapping.
+
+        Tasks are listed page by page, described in concurrent batches of 100
+        and their hosts resolved in bulk through the container instance
+        index. Filters are applied by ``list_tasks`` on the server, so only
+        matching tasks are ever described.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            service: Only tasks of this service
+            desired_status: Only tasks with this desired status, e.g.
+                            ``STOPPED``; ECS defaults to ``RUNNING``
+            instance_id: Only tasks placed on this EC2 instance
+            fields: Only tasks matching this field selector
+            labels: Only tasks whose tags match this label selector
+
+        Returns:
+            List of dictionaries containing container information
+
+        Raises:
+            ECSCommandError: If container retrieval fails
+        """
+        return list(self.iter_containers(
+            cluster_name, service, desired_status, instance_id, fields, labels
+        ))
+
+    def iter_containers(
+        self,
+        cluster_name: str,
+        service: Optional[str] = None,
+        desired_status: Optional[str] = None,
+        instance_id: Optional[str] = None,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> Iterator[Container]:
+        """
+        Yield container rows as each batch of tasks resolves.
+
+        Takes the filters of ``get_containers``; the hosts of each batch of
+        tasks are resolved with one lookup before its rows are yielded.
+
+        Raises:
+            ECSCommandError: If container retrieval fails
+        """
+        index = self.instance_index(cluster_name)
+
+        def rows(tasks: List[Task]) -> List[Container]:
+            # Resolve the hosts of the whole batch with one lookup
+            index.resolve(task.container_instance_arn for task in tasks)
             containers = []
-            
-            if tasks:
-                response = self.ecs_client.describe_tasks(
-                    cluster=cluster_name,
-                    tasks=tasks
-                )
-                
-                for task in response['tasks']:
-                    # Get EC2 instance ID for the task
-                    container_instance_arn = task.get('containerInstanceArn')
-                    ec2_instance_id = 'N/A'
-                    
-                    if container_instance_arn:
-                        container_instance = self.ecs_client.describe_container_instances(
-                            cluster=cluster_name,
-                            containerInstances=[container_instance_arn]
-                        )['containerInstances'][0]
-                        ec2_instance_id = container_instance['ec2InstanceId']
-                    
-                    for container in task['containers']:
-                        container_info = {
-                            'Name': container['name'],
-                            'Status': container['lastStatus'],
-                            'TaskId': task['taskArn'].split('/')[-1],
-                            'CPU': container.get('cpu', 'N/A'),
-                            'Memory': container.get('memory', 'N/A'),
-                            'EC2Instance': ec2_instance_id,
-                            'Created': datetime.fromtimestamp(
-                                task['createdAt'].timestamp()
-                            ).strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        containers.append(container_info)
-            
+            for task in tasks:
+                containers.extend(task.container_rows(index.get(task.container_instance_arn)))
             return containers
+
+        try:
+            yield from self._task_batches(
+                cluster_name, rows, service, desired_status, instance_id, fields, labels
+            )
         except Exception as e:
             raise ECSCommandError(f"Failed to get containers: {str(e)}")
 
-    def get_instance_details(self, cluster_name: str, instance_id: str) -> Optional[Dict[str, Any]]:
-        """Get details for a specific EC2 instance in the cluster."""
+    def iter_tasks(
+        self,
+        cluster_name: str,
+        service: Optional[str] = None,
+        desired_status: Optional[str] = None,
+        instance_id: Optional[str] = None,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> Iterator[Task]:
+        """
+        Yield the tasks of a cluster as each batch of 100 is described.
+
+        Filters are applied by ``list_tasks`` on the server and task ARNs are
+        listed a page at a time, so stopping early stops the remaining
+        listing and describe calls.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            service: Only tasks of this service
+            desired_status: Only tasks with this desired status, e.g.
+                            ``STOPPED``; ECS defaults to ``RUNNING``
+            instance_id: Only tasks placed on this EC2 instance
+            fields: Only tasks matching this field selector
+            labels: Only tasks whose tags match this label selector
+
+        Raises:
+            ECSCommandError: If task retrieval fails
+
+        Example:
+            >>> next(task for task in ecs.iter_tasks('prod') if task.service_name == 'web')
+        """
+        try:
+            yield from self._task_batches(
+                cluster_name, lambda tasks: tasks, service, desired_status, instance_id, fields, labels
+            )
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get tasks: {str(e)}")
+
+    def _task_batches(
+        self,
+        cluster_name: str,
+        rows: Callable[[List[Task]], List[Any]],
+        service: Optional[str] = None,
+        desired_status: Optional[str] = None,
+        instance_id: Optional[str] = None,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> Iterator[Any]:
+        """List task ARNs lazily with server-side filters and yield the rows
+        ``rows`` builds from each described batch of 100 matching tasks.
+
+        Equality requirements on ``service``, ``desiredStatus``,
+        ``launchType``, ``family`` and ``instance`` are passed to
+        ``list_tasks`` when no explicit filter takes their place; every
+        requirement is checked again on the described tasks. Tasks whose
+        indexed tags do not match the label selector are not described.
+        """
+        fields = fields or Selector()
+        labels = labels or Selector()
+        service = service or fields.equals('service')
+        desired_status = desired_status or _pushdown(fields, 'desiredStatus', DESIRED_STATUSES)
+        instance_id = instance_id or fields.equals('instance')
+        filters: Dict[str, str] = {}
+        launch_type = _pushdown(fields, 'launchType', LAUNCH_TYPES)
+        if launch_type:
+            filters['launchType'] = launch_type
+        # list_tasks does not take a family together with a service
+        if fields.equals('family') and not service:
+            filters['family'] = fields.equals('family')
+        if service:
+            filters['serviceName'] = service
+        if desired_status:
+            filters['desiredStatus'] = desired_status
+        if instance_id:
+            container_instance_arn = self._container_instance_arn(cluster_name, instance_id)
+            if container_instance_arn is None:
+                return
+            filters['containerInstance'] = container_instance_arn
+
+        index = self.instance_index(cluster_name)
+        hosts = 'instance' in fields.keys()
+
+        def describe(arns: List[str]) -> List[Any]:
+            if labels:
+                arns = list(self._tag_candidates(arns, labels))
+            tasks = self._describe_tasks(cluster_name, arns, tags=bool(labels)) if arns else []
+            if hosts:
+                index.resolve(task.container_instance_arn for task in tasks)
+            return rows([
+                task for task in tasks
+                if fields.matches(task.selector_fields(index.get(task.container_instance_arn, None)))
+                and labels.matches(self.tags.tags(task.arn))
+            ])
+
+        task_arns = paginate(
+            self.ecs_client.list_tasks,
+            'taskArns',
+            cluster=cluster_name,
+            maxResults=LIST_PAGE_SIZE,
+            **filters
+        )
+        batches = chunked(task_arns, DESCRIBE_TASKS_BATCH_SIZE)
+        for batch_rows in self.executor.imap(describe, batches, label='describe_tasks'):
+            yield from batch_rows
+
+    def _container_instance_arn(self, cluster_name: str, instance_id: str) -> Optional[str]:
+        """Find the container instance of an EC2 instance with a server-side filter.
+
+        An ID that is not a plain token is never put into the cluster query
+        language filter; it is only looked up among the container instances
+        already resolved. The match is not added to the container instance
+        index: only describe data is, when the host of a task is resolved.
+        """
+        if not QUERY_VALUE.match(instance_id):
+            return self.instance_index(cluster_name).container_instance_arn(instance_id)
+        arns = self.ecs_client.list_container_instances(
+            cluster=cluster_name,
+            filter=f'ec2InstanceId == {instance_id}'
+        )['containerInstanceArns']
+        return arns[0] if arns else None
+
+    def get_capacity(self, cluster_name: str, tasks: bool = True) -> ClusterCapacity:
+        """
+        Get the registered and reserved CPU and memory of a cluster.
+
+        Container instances are listed and described in batches of 100,
+        which report the registered and remaining resources of every host;
+        no EC2 call is needed. With ``tasks``, one cluster-wide task
+        snapshot adds the reservation of every task for service aggregates.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            tasks: Include the tasks, needed for per-service reservations
+
+        Returns:
+            Column-oriented capacity snapshot of the cluster
+
+        Raises:
+            ECSCommandError: If the snapshot fails
+        """
+        try:
+            container_instances = self._describe_container_instances(cluster_name)
+            snapshot = self._task_snapshot(cluster_name) if tasks else TaskSnapshot(cluster_name, [])
+            return ClusterCapacity(cluster_name, container_instances, snapshot.tasks)
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get capacity: {str(e)}")
+
+    def get_instance_details(self, cluster_name: str, instance_id: str) -> Optional[Instance]:
+        """
+        Get details for a specific EC2 instance in the cluster.
+
+        The instance is found with a server-side ``ec2InstanceId`` filter,
+        so only its own container instance and EC2 metadata are described.
+
+        Returns:
+            Instance details, or None if the instance is not in the cluster
+
+        Raises:
+            ECSCommandError: If the lookup fails
+        """
         try:
-            instances = self.get_ec2_instances(cluster_name)
-            return next((instance for instance in instances if instance['InstanceId'] == instance_id), None)
+            arn = self._container_instance_arn(cluster_name, instance_id)
+            if arn is None:
+                return None
+            container_instance = self._describe_container_instance_batch(cluster_name, [arn])[0]
+            ec2_instances = self._describe_ec2_instances([instance_id])
+            return Instance.from_response(container_instance, ec2_instances.get(instance_id, {}))
         except Exception as e:
             raise ECSCommandError(f"Failed to get instance details: {str(e)}")
 
-    def get_services(self, cluster_name: str) -> List[Dict[str, Any]]:
+    def check_exec_target(self, cluster_name: str, instance_id: str) -> Tuple[bool, bool]:
+        """
+        Check that an instance can be used by ``exec``.
+
+        Cluster membership and SSM availability are independent, so both
+        lookups run concurrently and cost one round trip in total.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            instance_id: EC2 instance ID
+
+        Returns:
+            Whether the instance is in the cluster and whether SSM is online
+
+        Raises:
+            ECSCommandError: If the membership lookup fails
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='ecsctl') as pool:
+            member = pool.submit(self._container_instance_arn, cluster_name, instance_id)
+            online = pool.submit(self.check_ssm_status, instance_id)
+            try:
+                in_cluster = member.result() is not None
+            except Exception as e:
+                raise ECSCommandError(f"Failed to get instance details: {str(e)}")
+            return in_cluster, online.result()
+
+    def get_services(
+        self,
+        cluster_name: str,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> List[Service]:
         """
         Get services for specified cluster, including EC2 instance IDs.
 
+        Tasks are taken from a single cluster-wide snapshot and grouped by
+        service, so the call count does not grow with the number of services.
+
         Args:
             cluster_name: Name of the ECS cluster
+            fields: Only services matching this field selector
+            labels: Only services whose tags match this label selector
 
         Returns:
             List of service details with EC2 instance IDs
@@ -158,63 +866,245 @@ class ECSController:
         Raises:
             ECSCommandError: If service retrieval fails
         """
+        return list(self.iter_services(cluster_name, fields=fields, labels=labels))
+
+    def iter_services(
+        self,
+        cluster_name: str,
+        ec2_instances: bool = True,
+        fields: Optional[Selector] = None,
+        labels: Optional[Selector] = None
+    ) -> Iterator[Service]:
+        """
+        Yield service rows as each batch of 10 services is described.
+
+        Services are listed a page at a time, so stopping early stops the
+        remaining calls. Resolving the EC2 instances of services takes one
+        cluster-wide task listing before the first row; without them, only
+        the services read up to the point of exit are listed and described.
+
+        With a selector, the matching services are collected first; see
+        ``_select_services``.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            ec2_instances: Resolve the EC2 instances running each service's
+                           tasks; rows have no instances if False
+            fields: Only services matching this field selector
+            labels: Only services whose tags match this label selector
+
+        Raises:
+            ECSCommandError: If service retrieval fails
+
+        Example:
+            >>> next(s for s in ecs.iter_services('prod', ec2_instances=False) if s.pending_count)
+        """
         try:
-            services_list = self.ecs_client.list_services(cluster=cluster_name)['serviceArns']
-            services = []
-            
-            if services_list:
-                # AWS API has a limit of 10 services per describe_services call
-                for i in range(0, len(services_list), 10):
-                    batch = services_list[i:i + 10]
-                    response = self.ecs_client.describe_services(
-                        cluster=cluster_name,
-                        services=batch
-                    )
-                    
-                    for service in response['services']:
-                        # Get tasks for the service
-                        task_arns = self.ecs_client.list_tasks(
-                            cluster=cluster_name,
-                            serviceName=service['serviceName']
-                        )['taskArns']
-                        
-                        ec2_instance_ids = set()
-                        if task_arns:
-                            tasks = self.ecs_client.describe_tasks(
-                                cluster=cluster_name,
-                                tasks=task_arns
-                            )['tasks']
-                            
-                            for task in tasks:
-                                container_instance_arn = task.get('containerInstanceArn')
-                                if container_instance_arn:
-                                    container_instance = self.ecs_client.describe_container_instances(
-                                        cluster=cluster_name,
-                                        containerInstances=[container_instance_arn]
-                                    )['containerInstances'][0]
-                                    ec2_instance_ids.add(container_instance['ec2InstanceId'])
-                        
-                        service_info = {
-                            'ServiceName': service['serviceName'],
-                            'Status': service['status'],
-                            'TaskDefinition': service['taskDefinition'],
-                            'DesiredCount': service['desiredCount'],
-                            'RunningCount': service['runningCount'],
-                            'PendingCount': service['pendingCount'],
-                            'EC2Instances': ', '.join(ec2_instance_ids)
-                        }
-                        services.append(service_info)
-            
-            return services
+            if fields or labels:
+                yield from self._select_services(
+                    cluster_name, ec2_instances, fields or Selector(), labels or Selector()
+                )
+            else:
+                yield from self._iter_services(cluster_name, ec2_instances)
         except Exception as e:
             raise ECSCommandError(f"Failed to get services: {str(e)}")
 
-    def get_task_definitions(self, family: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _iter_services(self, cluster_name: str, ec2_instances: bool) -> Iterator[Service]:
+        """Yield service rows; ``iter_services`` without the error handling."""
+        service_arns = paginate(
+            self.ecs_client.list_services,
+            'serviceArns',
+            cluster=cluster_name,
+            maxResults=LIST_PAGE_SIZE
+        )
+        batches = chunked(service_arns, DESCRIBE_SERVICES_BATCH_SIZE)
+        first = next(batches, None)
+        if first is None:
+            return
+
+        # One cluster-wide task listing instead of one per service
+        snapshot = self._task_snapshot(cluster_name) if ec2_instances else TaskSnapshot(cluster_name, [])
+        self.instance_index(cluster_name).resolve(snapshot.container_instance_arns())
+
+        def describe(batch: List[str]) -> List[Service]:
+            services = self.ecs_client.describe_services(
+                cluster=cluster_name,
+                services=batch
+            )['services']
+            return self._service_infos(cluster_name, services, snapshot)
+
+        batches = itertools.chain([first], batches)
+        for rows in self.executor.imap(describe, batches, label='describe_services'):
+            yield from rows
+
+    def _select_services(
+        self,
+        cluster_name: str,
+        ec2_instances: bool,
+        fields: Selector,
+        labels: Selector
+    ) -> List[Service]:
+        """Return the rows of the services matching field and label selectors.
+
+        A ``name`` equality is described directly without listing the
+        cluster, and ``launchType`` and ``schedulingStrategy`` equalities
+        are passed to ``list_services``. Tags are described with the
+        services when a label selector is given, and services whose indexed
+        tags do not match are not described again. The hosts of the matches
+        are then resolved with per-service task listings or one cluster-wide
+        snapshot, whichever takes fewer calls.
+        """
+        name = fields.equals('name')
+        if name is not None:
+            batches: Iterable[List[str]] = [[name]]
+            listed_all = False
+        else:
+            filters = {
+                key: value
+                for key, value in (
+                    ('launchType', _pushdown(fields, 'launchType', LAUNCH_TYPES)),
+                    ('schedulingStrategy', _pushdown(fields, 'schedulingStrategy', SCHEDULING_STRATEGIES)),
+                )
+                if value
+            }
+            service_arns = paginate(
+                self.ecs_client.list_services,
+                'serviceArns',
+                cluster=cluster_name,
+                maxResults=LIST_PAGE_SIZE,
+                **filters
+            )
+            if labels:
+                service_arns = self._tag_candidates(service_arns, labels)
+            batches = chunked(service_arns, DESCRIBE_SERVICES_BATCH_SIZE)
+            listed_all = not filters and not labels
+        kwargs = {'include': ['TAGS']} if labels else {}
+
+        def describe(batch: List[str]) -> List[Dict[str, Any]]:
+            return self.ecs_client.describe_services(
+                cluster=cluster_name,
+                services=batch,
+                **kwargs
+            )['services']
+
+        described = self._describe_batches(describe, list(batches), label='describe_services')
+        services = []
+        for service in described:
+            tags = tag_dict(service.get('tags'))
+            if labels:
+                self.tags.add(service['serviceArn'], tags)
+            if fields.matches(_service_fields(service)) and labels.matches(tags):
+                services.append(service)
+
+        if not ec2_instances or not services:
+            snapshot = TaskSnapshot(cluster_name, [])
+        else:
+            # Every service task is in the snapshot: its size is known if
+            # every service was described
+            cluster_tasks = sum(s['runningCount'] + s['pendingCount'] for s in described) \
+                if listed_all else None
+            snapshot = self._service_task_snapshot(cluster_name, services, cluster_tasks)
+        return self._service_infos(cluster_name, services, snapshot)
+
+    def _service_task_snapshot(
+        self,
+        cluster_name: str,
+        services: List[Dict[str, Any]],
+        cluster_tasks: Optional[int] = None
+    ) -> TaskSnapshot:
+        """Snapshot the tasks of some services with the fewest calls.
+
+        Listing the tasks of each service costs a call per page of each
+        service; a cluster-wide snapshot costs a listing and a describe call
+        per 100 tasks of the cluster. Both describe the listed tasks in
+        batches of 100.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            services: ``describe_services`` entries of the services
+            cluster_tasks: Number of tasks in the cluster if known; without
+                           it, services are listed one by one when there are
+                           at most ``DESCRIBE_SERVICES_BATCH_SIZE`` of them
+        """
+        counts = [service['runningCount'] + service['pendingCount'] for service in services]
+        per_service = sum(max(1, math.ceil(count / LIST_PAGE_SIZE)) for count in counts) \
+            + math.ceil(sum(counts) / DESCRIBE_TASKS_BATCH_SIZE)
+        if cluster_tasks is None:
+            cheaper = len(services) <= DESCRIBE_SERVICES_BATCH_SIZE
+        else:
+            cheaper = per_service <= max(1, math.ceil(cluster_tasks / LIST_PAGE_SIZE)) \
+                + math.ceil(cluster_tasks / DESCRIBE_TASKS_BATCH_SIZE)
+        if not cheaper:
+            return self._task_snapshot(cluster_name)
+
+        listings = self.executor.map(
+            lambda service: list(paginate(
+                self.ecs_client.list_tasks,
+                'taskArns',
+                cluster=cluster_name,
+                serviceName=service['serviceName'],
+                maxResults=LIST_PAGE_SIZE
+            )),
+            services,
+            label='list_tasks'
+        )
+        task_arns = list(dict.fromkeys(arn for arns in listings for arn in arns))
+        return TaskSnapshot(cluster_name, self._describe_batches(
+            lambda batch: self._describe_tasks(cluster_name, batch),
+            list(chunked(task_arns, DESCRIBE_TASKS_BATCH_SIZE)),
+            label='describe_tasks'
+        ))
+
+    def _describe_services(self, cluster_name: str) -> List[Dict[str, Any]]:
+        """List every service in the cluster and describe them in batches."""
+        service_arns = list(paginate(
+            self.ecs_client.list_services,
+            'serviceArns',
+            cluster=cluster_name,
+            maxResults=LIST_PAGE_SIZE
+        ))
+        return self._describe_batches(
+            lambda batch: self.ecs_client.describe_services(
+                cluster=cluster_name,
+                services=batch
+            )['services'],
+            list(chunked(service_arns, DESCRIBE_SERVICES_BATCH_SIZE)),
+            label='describe_services'
+        )
+
+    def _service_infos(
+        self,
+        cluster_name: str,
+        services: List[Dict[str, Any]],
+        snapshot: TaskSnapshot
+    ) -> List[Service]:
+        """Build service rows, resolving the hosts of all tasks in one pass."""
+        index = self.instance_index(cluster_name)
+        index.resolve(snapshot.container_instance_arns())
+        return [
+            Service.from_response(service, index.ec2_instance_ids(
+                task.container_instance_arn
+                for task in snapshot.service_tasks(service['serviceName'])
+            ))
+            for service in services
+        ]
+
+    def get_task_definitions(
+        self,
+        family: Optional[str] = None,
+        latest: bool = False,
+        fields: Optional[Selector] = None
+    ) -> List[TaskDefinition]:
         """
         Get task definitions with optional family filter.
 
+        Every page of revisions is listed. Revisions are immutable, so each
+        one is described once and then served from the local revision store.
+
         Args:
             family: Optional task definition family filter
+            latest: Only the newest revision of each active family
+            fields: Only revisions matching this field selector
 
         Returns:
             List of task definition details
@@ -222,34 +1112,157 @@ class ECSController:
         Raises:
             ECSCommandError: If task definition retrieval fails
         """
+        return list(self.iter_task_definitions(family, latest, fields))
+
+    def iter_task_definitions(
+        self,
+        family: Optional[str] = None,
+        latest: bool = False,
+        fields: Optional[Selector] = None
+    ) -> Iterator[TaskDefinition]:
+        """
+        Yield task definition rows as revisions are described.
+
+        Revisions are listed a page at a time and described concurrently,
+        so stopping early stops the remaining calls. Revisions described so
+        far are still stored.
+
+        A ``family`` equality of the field selector is listed as a family
+        prefix and a ``status`` equality is passed to
+        ``list_task_definitions``; every requirement is checked again on the
+        described revisions.
+
+        Args:
+            family: Optional task definition family filter
+            latest: Only the newest revision of each active family
+            fields: Only revisions matching this field selector
+
+        Raises:
+            ECSCommandError: If task definition retrieval fails
+        """
+        fields = fields or Selector()
+        prefix = family or fields.equals('family')
+        kwargs = {'familyPrefix': prefix} if prefix else {}
+        status = _pushdown(fields, 'status', TASK_DEFINITION_STATUSES)
         try:
-            kwargs = {'familyPrefix': family} if family else {}
-            task_def_arns = self.ecs_client.list_task_definitions(**kwargs)['taskDefinitionArns']
-            task_definitions = []
-            
-            for arn in task_def_arns:
-                response = self.ecs_client.describe_task_definition(taskDefinition=arn)
-                td = response['taskDefinition']
-                
-                # Calculate total CPU and memory
-                cpu = td.get('cpu', 'N/A')
-                memory = td.get('memory', 'N/A')
-                
-                task_def_info = {
-                    'Family': td['family'],
-                    'Revision': td['revision'],
-                    'Status': td['status'],
-                    'Cpu': cpu,
-                    'Memory': memory,
-                    'LastUpdated': datetime.fromtimestamp(
-                        td['registeredAt'].timestamp()
-                    ).strftime('%Y-%m-%d %H:%M:%S')
-                }
-                task_definitions.append(task_def_info)
-            
-            return task_definitions
+            if latest:
+                # Describing a family name returns its newest active revision
+                families = paginate(
+                    self.ecs_client.list_task_definition_families,
+                    'families',
+                    status='ACTIVE',
+                    maxResults=LIST_PAGE_SIZE,
+                    **kwargs
+                )
+                rows = self.executor.imap(
+                    self._describe_task_definition, families, label='describe_task_definition'
+                )
+            else:
+                task_def_arns = paginate(
+                    self.ecs_client.list_task_definitions,
+                    'taskDefinitionArns',
+                    maxResults=LIST_PAGE_SIZE,
+                    **({'status': status} if status else {}),
+                    **kwargs
+                )
+                # Every listed revision has the status it was listed under
+                listed_status = status or DEFAULT_TASK_DEFINITION_STATUS
+                rows = self.executor.imap(
+                    lambda arn: (
+                        self.stored_task_definition(arn, listed_status)
+                        or self._describe_task_definition(arn)
+                    ),
+                    task_def_arns,
+                    label='describe_task_definition'
+                )
+            for row in rows:
+                if fields.matches({'family': row.family, 'status': row.status, 'revision': row.revision}):
+                    yield row
         except Exception as e:
             raise ECSCommandError(f"Failed to get task definitions: {str(e)}")
+        finally:
+            self.revisions.flush()
+
+    def stored_task_definition(self, arn: str, status: str) -> Optional[TaskDefinition]:
+        """Return a revision from the revision store, or None if never described.
+
+        Reads the family's file on first access, so it may block on disk IO.
+
+        Args:
+            arn: Task definition ARN
+            status: Current status of the revision, e.g. the status filter
+                    of the listing it was returned by
+        """
+        row = self.revisions.get(arn)
+        if row is None:
+            return None
+        return TaskDefinition.from_revision_row(row, status)
+
+    def store_task_definition(self, arn: str, row: TaskDefinition) -> None:
+        """Add a described revision to the revision store, without its status."""
+        self.revisions.put(arn, row.revision_row())
+
+    def _describe_task_definition(self, task_definition: str) -> TaskDefinition:
+        """Describe a revision or the newest revision of a family and store it."""
+        td = self.ecs_client.describe_task_definition(
+            taskDefinition=task_definition
+        )['taskDefinition']
+        row = TaskDefinition.from_response(td)
+        self.store_task_definition(td['taskDefinitionArn'], row)
+        return row
+
+    def get_ssm_statuses(self, instance_ids: Sequence[str]) -> Dict[str, str]:
+        """
+        Get the SSM ping status of many instances with bulk calls.
+
+        Instances are looked up with ``describe_instance_information``
+        filtered by up to 50 instance IDs per call, and the batches are
+        fetched concurrently, so 300 nodes take 6 calls instead of 300.
+
+        Args:
+            instance_ids: EC2 instance IDs, duplicates allowed
+
+        Returns:
+            Mapping of every requested instance ID to its ping status, e.g.
+            ``Online`` or ``ConnectionLost``; ``NotRegistered`` for instances
+            unknown to SSM and ``Unknown`` for instances of a failed batch
+
+        Failed batches, even all of them, are recorded in ``errors`` instead
+        of raised, so a listing that shows the SSM column never fails
+        because of it, e.g. without ``ssm:DescribeInstanceInformation``.
+        """
+        requested = list(dict.fromkeys(instance_ids))
+
+        def describe(batch: List[str]) -> Tuple[List[str], Optional[List[Dict[str, Any]]]]:
+            try:
+                return batch, list(paginate(
+                    self.ssm_client.describe_instance_information,
+                    'InstanceInformationList',
+                    token_key='NextToken',
+                    Filters=[{'Key': 'InstanceIds', 'Values': batch}],
+                    MaxResults=DESCRIBE_INSTANCE_INFORMATION_BATCH_SIZE
+                ))
+            except Exception as e:
+                error = ItemError(batch, e, 'describe_instance_information')
+                self.logger.warning(str(error))
+                self.errors.append(error)
+                return batch, None
+
+        pages = self.executor.map(
+            describe,
+            list(chunked(requested, DESCRIBE_INSTANCE_INFORMATION_BATCH_SIZE)),
+            label='describe_instance_information'
+        )
+
+        # Only the batches that were described tell which instances SSM lacks
+        statuses = dict.fromkeys(requested, SSM_UNKNOWN)
+        for batch, page in pages:
+            if page is None:
+                continue
+            statuses.update(dict.fromkeys(batch, SSM_NOT_REGISTERED))
+            for information in page:
+                statuses[information['InstanceId']] = information['PingStatus']
+        return statuses
 
     def check_ssm_status(self, instance_id: str) -> bool:
         """
@@ -0,0 +1,109 @@
+"""Fan-out of ``get`` commands across clusters and regions.
+
+A fleet-wide query resolves its targets first: the selected cluster in every
+requested region, or every cluster of every region with ``--all-clusters``.
+The targets are then queried concurrently and their rows merged, each
+prefixed with its ``Region`` and ``Cluster``. All regions share the session
+of the base controller, so the account's credentials are resolved once.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ecsctl.ecs_controller import ECSController
+
+
+class Target:
+    """A cluster in a region, or a whole region for regional resources.
+
+    Attributes:
+        controller (ECSController): Controller for the target's region
+        cluster (Optional[str]): Name of the ECS cluster, None for a region
+    """
+
+    __slots__ = ('controller', 'cluster')
+
+    def __init__(self, controller: ECSController, cluster: Optional[str] = None) -> None:
+        self.controller = controller
+        self.cluster = cluster
+
+    @property
+    def region(self) -> str:
+        """AWS region of the cluster."""
+        return self.controller.region
+
+    def __str__(self) -> str:
+        return f"{self.cluster} ({self.region})" if self.cluster else self.region
+
+
+def regional_controllers(
+    ecs: ECSController,
+    regions: Optional[Sequence[str]] = None
+) -> List[ECSController]:
+    """Return one controller per requested region, the base region if None."""
+    return [ecs.for_region(region) for region in dict.fromkeys(regions or [ecs.region])]
+
+
+def resolve_targets(
+    ecs: ECSController,
+    regions: Optional[Sequence[str]] = None,
+    cluster: Optional[str] = None
+) -> List[Target]:
+    """Resolve the clusters to query.
+
+    Args:
+        ecs: Base controller
+        regions: Regions to query, the base region if None
+        cluster: Cluster to query in every region; every cluster of each
+                 region if None
+
+    Returns:
+        Targets ordered by region, then cluster
+
+    Raises:
+        ECSCommandError: If the clusters of every region fail to list
+    """
+    controllers = regional_controllers(ecs, regions)
+    if cluster:
+        return [Target(controller, cluster) for controller in controllers]
+
+    listings = ecs.executor.map(
+        lambda controller: [Target(controller, name) for name in controller.get_clusters()],
+        controllers,
+        label='list_clusters'
+    )
+    return [target for targets in listings for target in targets]
+
+
+def fleet_rows(
+    ecs: ECSController,
+    targets: Sequence[Target],
+    fetch: Callable[[Target], List[Dict[str, Any]]],
+    label: str
+) -> Iterator[Dict[str, Any]]:
+    """Query every target concurrently and yield the merged rows.
+
+    Rows are yielded target by target in the order of ``targets`` as soon as
+    each target and its predecessors are done. A target that fails is
+    reported through ``ecs.errors`` instead of aborting the others.
+
+    Args:
+        ecs: Base controller whose executor runs the fan-out
+        targets: Clusters to query
+        fetch: Returns the rows of one target
+        label: Operation name recorded with per-target errors
+
+    Yields:
+        Rows prefixed with the ``Region`` and, for cluster targets, the
+        ``Cluster`` of their target
+
+    Raises:
+        Exception: The first error, if every target failed
+    """
+    def query(target: Target) -> List[Dict[str, Any]]:
+        context = {'Region': target.region}
+        if target.cluster:
+            context['Cluster'] = target.cluster
+        return [{**context, **row} for row in fetch(target)]
+
+    for rows in ecs.executor.imap(query, targets, label=label):
+        yield from rows
@@ -0,0 +1,240 @@
+"""Per-run lookup indexes shared by ECSController methods."""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ecsctl.concurrency import FanOutExecutor
+from ecsctl.models import Task
+from ecsctl.selectors import Selector
+from ecsctl.utils import chunked
+
+# describe_container_instances accepts at most 100 ARNs per call
+DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE = 100
+
+# Seconds the indexed tags of a resource are trusted before it is described again
+DEFAULT_TAG_TTL = 60
+
+
+class ContainerInstanceIndex:
+    """Maps container instance ARNs of one cluster to EC2 instance IDs.
+
+    Tasks only reference the container instance they run on, so showing the
+    host of a task needs a ``describe_container_instances`` lookup. The index
+    deduplicates those lookups: unknown ARNs are collected and resolved with
+    one batched describe call per 100 distinct ARNs, and every ARN is resolved
+    at most once for the lifetime of the index.
+
+    Attributes:
+        cluster_name (str): Cluster the container instances belong to
+
+    Example:
+        >>> index = ContainerInstanceIndex(ecs_client, 'prod')
+        >>> index.resolve(task['containerInstanceArn'] for task in tasks)
+        >>> index.get(tasks[0]['containerInstanceArn'])
+        'i-0123456789abcdef0'
+    """
+
+    def __init__(
+        self,
+        ecs_client: Any,
+        cluster_name: str,
+        executor: Optional[FanOutExecutor] = None
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            ecs_client: boto3 ECS client used to describe unknown ARNs
+            cluster_name: Name of the ECS cluster
+            executor: Executor running the describe batches; sequential if None
+        """
+        self._ecs_client = ecs_client
+        self.cluster_name = cluster_name
+        self._executor = executor or FanOutExecutor(max_workers=1)
+        # Batches of a streamed listing resolve their hosts from worker threads
+        self._lock = threading.Lock()
+        self._ec2_instance_ids: Dict[str, str] = {}
+
+    def __contains__(self, container_instance_arn: str) -> bool:
+        return container_instance_arn in self._ec2_instance_ids
+
+    def __len__(self) -> int:
+        return len(self._ec2_instance_ids)
+
+    def add(self, container_instances: Iterable[Dict[str, Any]]) -> None:
+        """Seed the index from ``describe_container_instances`` entries."""
+        for instance in container_instances:
+            arn = instance.get('containerInstanceArn')
+            if arn:
+                self._ec2_instance_ids[arn] = instance['ec2InstanceId']
+
+    def resolve(self, container_instance_arns: Iterable[Optional[str]]) -> Dict[str, str]:
+        """Resolve container instance ARNs to EC2 instance IDs.
+
+        Empty values are ignored, so the ``containerInstanceArn`` of Fargate
+        tasks can be passed through unfiltered. Only ARNs not already in the index are described.
+
+        Args:
+            container_instance_arns: ARNs to resolve, duplicates allowed
+
+        Returns:
+            Mapping of every resolvable ARN to its EC2 instance ID
+        """
+        requested = [arn for arn in dict.fromkeys(container_instance_arns) if arn]
+
+        with self._lock:
+            missing = [arn for arn in requested if arn not in self._ec2_instance_ids]
+            pages = self._executor.map(
+                lambda batch: self._ecs_client.describe_container_instances(
+                    cluster=self.cluster_name,
+                    containerInstances=batch
+                )['containerInstances'],
+                list(chunked(missing, DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE)),
+                label='describe_container_instances'
+            )
+            for page in pages:
+                self.add(page)
+
+        return {
+            arn: self._ec2_instance_ids[arn]
+            for arn in requested
+            if arn in self._ec2_instance_ids
+        }
+
+    def get(self, container_instance_arn: Optional[str], default: str = 'N/A') -> str:
+        """Return the EC2 instance ID of an already resolved ARN."""
+        if not container_instance_arn:
+            return default
+        return self._ec2_instance_ids.get(container_instance_arn, default)
+
+    def container_instance_arn(self, ec2_instance_id: str) -> Optional[str]:
+        """Return the ARN of an already resolved container instance by EC2 instance ID."""
+        with self._lock:
+            items = list(self._ec2_instance_ids.items())
+        return next((arn for arn, instance_id in items if instance_id == ec2_instance_id), None)
+
+    def ec2_instance_ids(self, container_instance_arns: Iterable[Optional[str]]) -> List[str]:
+        """Return the distinct EC2 instance IDs of resolved ARNs, in order."""
+        ids = (self._ec2_instance_ids.get(arn) for arn in container_instance_arns if arn)
+        return list(dict.fromkeys(i for i in ids if i))
+
+
+class TaskSnapshot:
+    """Point-in-time view of every task in a cluster, grouped by service.
+
+    ECS sets the ``group`` of a task started by a service to
+    ``service:<name>``, so a single cluster-wide listing is enough to know
+    the tasks of every service without a ``list_tasks`` call per service.
+
+    Attributes:
+        cluster_name (str): Cluster the tasks belong to
+        tasks (List[Task]): Every task in the cluster
+
+    Example:
+        >>> snapshot = TaskSnapshot('prod', tasks)
+        >>> snapshot.service_tasks('web')
+    """
+
+    def __init__(self, cluster_name: str, tasks: Iterable[Union[Task, Dict[str, Any]]]) -> None:
+        """Build the snapshot and its per-service grouping.
+
+        Args:
+            cluster_name: Name of the ECS cluster
+            tasks: Every task in the cluster, as models or ``describe_tasks``
+                   entries
+        """
+        self.cluster_name = cluster_name
+        self.tasks = [task if isinstance(task, Task) else Task.from_response(task) for task in tasks]
+        self._by_arn = {task.arn: task for task in self.tasks}
+        self._by_service: Dict[str, List[Task]] = defaultdict(list)
+        for task in self.tasks:
+            service_name = task.service_name
+            if service_name is not None:
+                self._by_service[service_name].append(task)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def get(self, task_arn: str) -> Optional[Task]:
+        """Return a task by ARN, or None if it is not in the snapshot."""
+        return self._by_arn.get(task_arn)
+
+    def service_tasks(self, service_name: str) -> List[Task]:
+        """Return the tasks started by a service."""
+        return self._by_service.get(service_name, [])
+
+    def container_instance_arns(self) -> List[str]:
+        """Return the distinct container instance ARNs hosting tasks."""
+        arns = (task.container_instance_arn for task in self.tasks)
+        return list(dict.fromkeys(arn for arn in arns if arn))
+
+
+class TagIndex:
+    """Tags of the resources described so far, by resource ARN or EC2 instance ID.
+
+    No ECS list call filters by tag, so label selectors are evaluated on
+    the described resources. Once a resource was described with its tags,
+    the index tells whether it can match a label selector without
+    describing it again; a long-lived controller only describes the
+    resources that are new or known to match. Tags are trusted for ``ttl``
+    seconds, after which the resource counts as unknown and is described
+    again, so a retagged resource shows up in a long-lived process too.
+    ``clear`` forgets the tags at once, e.g. after they were changed.
+
+    Example:
+        >>> tags = TagIndex()
+        >>> tags.add('i-1', {'team': 'payments'})
+        >>> tags.select(Selector.parse('team=payments'))
+        ['i-1']
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TAG_TTL) -> None:
+        """Initialize an empty index.
+
+        Args:
+            ttl: Seconds the tags of a resource are trusted
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tags: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
+    def __contains__(self, resource_id: str) -> bool:
+        return self._fresh(resource_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def _fresh(self, resource_id: str) -> Optional[Dict[str, str]]:
+        """Return the tags of a resource if they were indexed less than ``ttl`` ago."""
+        entry = self._tags.get(resource_id)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def add(self, resource_id: str, tags: Dict[str, str]) -> None:
+        """Record the current tags of a resource, replacing earlier ones."""
+        with self._lock:
+            self._tags[resource_id] = (time.monotonic(), dict(tags))
+
+    def clear(self) -> None:
+        """Forget the tags of every resource."""
+        with self._lock:
+            self._tags.clear()
+
+    def tags(self, resource_id: str) -> Dict[str, str]:
+        """Return the known tags of a resource, empty if it has none, is unknown or expired."""
+        return self._fresh(resource_id) or {}
+
+    def matches(self, resource_id: str, selector: Selector) -> bool:
+        """Return whether the known tags of a resource satisfy a label selector."""
+        return selector.matches(self.tags(resource_id))
+
+    def select(self, selector: Selector) -> List[str]:
+        """Return the known resources satisfying a label selector, in insertion order."""
+        with self._lock:
+            resource_ids = list(self._tags)
+        return [
+            resource_id for resource_id in resource_ids
+            if resource_id in self and self.matches(resource_id, selector)
+        ]
@@ -0,0 +1,292 @@
+"""Instrumentation of the AWS API calls made by ecsctl.
+
+``ApiProfiler`` hooks into the botocore event system of every client an
+``ECSController`` creates and records one span per API call: its operation,
+wall time, thread, retries, throttling errors and final error code. The
+spans are summarized per operation (call counts, latency percentiles and a
+latency histogram) for ``--profile-api``, and can be written to a file via
+``ECSCTL_API_TRACE``, either as JSON or in the Chrome trace event format
+(open it in ``chrome://tracing`` or https://ui.perfetto.dev).
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Error codes botocore's standard retry mode treats as throttling
+THROTTLING_ERROR_CODES = frozenset([
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'TransactionInProgressException',
+    'RequestLimitExceeded',
+    'BandwidthLimitExceeded',
+    'LimitExceededException',
+    'RequestThrottled',
+    'SlowDown',
+    'PriorRequestNotComplete',
+    'EC2ThrottledException',
+])
+
+# Upper bounds in milliseconds of the latency histogram buckets; slower
+# calls fall into a final open-ended bucket
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+TRACE_ENV_VAR = 'ECSCTL_API_TRACE'
+TRACE_FORMAT_ENV_VAR = 'ECSCTL_API_TRACE_FORMAT'
+TRACE_FORMATS = ('json', 'chrome')
+
+# Key of the profiler's state in botocore's per-call request context
+_CONTEXT_KEY = 'ecsctl_profile'
+
+
+class Span:
+    """A single API call.
+
+    Attributes:
+        operation (str): Service and operation, e.g. ``ecs.ListTasks``
+        start (float): Seconds since the profiler was created
+        duration (float): Wall time of the call in seconds, including retries
+        thread (int): Identifier of the calling thread
+        retries (int): Number of retried attempts
+        throttles (int): Attempts rejected with a throttling error
+        error (Optional[str]): Error code if the call failed
+    """
+
+    __slots__ = ('operation', 'start', 'duration', 'thread', 'retries', 'throttles', 'error')
+
+    def __init__(
+        self,
+        operation: str,
+        start: float,
+        duration: float,
+        thread: int,
+        retries: int = 0,
+        throttles: int = 0,
+        error: Optional[str] = None
+    ) -> None:
+        self.operation = operation
+        self.start = start
+        self.duration = duration
+        self.thread = thread
+        self.retries = retries
+        self.throttles = throttles
+        self.error = error
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable dictionary."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def latency_histogram(durations_ms: Sequence[float]) -> Dict[str, int]:
+    """Count latencies per bucket, keyed by the bucket's upper bound."""
+    counts = {f'<={bound}ms': 0 for bound in LATENCY_BUCKETS_MS}
+    counts[f'>{LATENCY_BUCKETS_MS[-1]}ms'] = 0
+    for duration in durations_ms:
+        bound = next((bound for bound in LATENCY_BUCKETS_MS if duration <= bound), None)
+        counts[f'<={bound}ms' if bound is not None else f'>{LATENCY_BUCKETS_MS[-1]}ms'] += 1
+    return counts
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class ApiProfiler:
+    """Records a span for every API call of the registered clients.
+
+    Thread-safe: the calls of concurrent fan-outs are recorded from their
+    worker threads.
+
+    Attributes:
+        spans (List[Span]): Recorded calls in completion order
+
+    Example:
+        >>> profiler = ApiProfiler()
+        >>> profiler.register(ecs_client)
+        >>> ecs_client.list_clusters()
+        >>> profiler.summary()['ecs.ListClusters']['calls']
+        1
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def register(self, client: Any) -> None:
+        """Instrument a botocore client."""
+        events = client.meta.events
+        # Ahead of handlers that answer the call themselves, e.g. stubs
+        events.register_first('before-call.*.*', self._before_call)
+        events.register('needs-retry', self._needs_retry)
+        events.register('after-call', self._after_call)
+        events.register('after-call-error', self._after_call_error)
+
+    def _before_call(self, model: Any, context: Dict[str, Any], **kwargs: Any) -> None:
+        context[_CONTEXT_KEY] = {
+            'operation': f'{model.service_model.service_name}.{model.name}',
+            'start': time.perf_counter(),
+            'attempts': 1,
+            'throttles': 0,
+        }
+
+    def _needs_retry(
+        self,
+        request_dict: Dict[str, Any],
+        attempts: int,
+        response: Optional[tuple] = None,
+        **kwargs: Any
+    ) -> None:
+        # Called after every attempt; returning None leaves the retry
+        # decision to botocore's own handlers
+        state = request_dict.get('context', {}).get(_CONTEXT_KEY)
+        if state is None:
+            return None
+        state['attempts'] = max(state['attempts'], attempts)
+        if response is not None:
+            error_code = response[1].get('Error', {}).get('Code')
+            if error_code in THROTTLING_ERROR_CODES:
+                state['throttles'] += 1
+        return None
+
+    def _after_call(self, context: Dict[str, Any], parsed: Dict[str, Any], **kwargs: Any) -> None:
+        retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts')
+        self._finish(context, parsed.get('Error', {}).get('Code'), retries)
+
+    def _after_call_error(self, context: Dict[str, Any], exception: Exception, **kwargs: Any) -> None:
+        # Raised before a response was parsed, e.g. connection errors
+        self._finish(context, type(exception).__name__)
+
+    def _finish(
+        self,
+        context: Dict[str, Any],
+        error: Optional[str],
+        retries: Optional[int] = None
+    ) -> None:
+        state = context.pop(_CONTEXT_KEY, None)
+        if state is None:
+            return
+        end = time.perf_counter()
+        span = Span(
+            operation=state['operation'],
+            start=state['start'] - self._origin,
+            duration=end - state['start'],
+            thread=threading.get_ident(),
+            retries=retries if retries is not None else state['attempts'] - 1,
+            throttles=state['throttles'],
+            error=error
+        )
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate the spans per operation, sorted by total time spent."""
+        with self._lock:
+            spans = list(self.spans)
+
+        by_operation: Dict[str, List[Span]] = {}
+        for span in spans:
+            by_operation.setdefault(span.operation, []).append(span)
+
+        summary = {}
+        for operation, operation_spans in by_operation.items():
+            durations = sorted(span.duration * 1000 for span in operation_spans)
+            summary[operation] = {
+                'calls': len(operation_spans),
+                'errors': sum(1 for span in operation_spans if span.error),
+                'retries': sum(span.retries for span in operation_spans),
+                'throttles': sum(span.throttles for span in operation_spans),
+                'total_ms': sum(durations),
+                'mean_ms': sum(durations) / len(durations),
+                'p50_ms': _percentile(durations, 0.50),
+                'p95_ms': _percentile(durations, 0.95),
+                'max_ms': durations[-1],
+                'histogram': latency_histogram(durations),
+            }
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['total_ms']))
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the spans in the Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            'traceEvents': [
+                {
+                    'name': span.operation,
+                    'cat': 'aws',
+                    'ph': 'X',
+                    'ts': round(span.start * 1e6),
+                    'dur': round(span.duration * 1e6),
+                    'pid': pid,
+                    'tid': span.thread,
+                    'args': {
+                        'retries': span.retries,
+                        'throttles': span.throttles,
+                        'error': span.error,
+                    },
+                }
+                for span in spans
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def write(self, path: str, trace_format: str = 'json') -> None:
+        """Write the spans to a file.
+
+        Args:
+            path: Destination file
+            trace_format: ``json`` for the summary and raw spans, ``chrome``
+                          for the Chrome trace event format
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if trace_format == 'chrome':
+            data = self.chrome_trace()
+        elif trace_format == 'json':
+            with self._lock:
+                spans = [span.as_dict() for span in self.spans]
+            data = {'summary': self.summary(), 'spans': spans}
+        else:
+            raise ValueError(f"Unknown trace format: {trace_format}")
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def print_summary(self, console: Any) -> None:
+        """Print the per-operation summary as a table."""
+        from rich.table import Table
+
+        summary = self.summary()
+        table = Table(
+            show_header=True, header_style="bold magenta",
+            title=f"{sum(stats['calls'] for stats in summary.values())} AWS API calls"
+        )
+        for column in ("Operation", "Calls", "Errors", "Retries", "Throttled",
+                       "Total ms", "Mean ms", "p50 ms", "p95 ms", "Max ms"):
+            table.add_column(column, justify="left" if column == "Operation" else "right")
+        for operation, stats in summary.items():
+            table.add_row(
+                operation,
+                str(stats['calls']),
+                str(stats['errors']),
+                str(stats['retries']),
+                str(stats['throttles']),
+                f"{stats['total_ms']:.0f}",
+                f"{stats['mean_ms']:.1f}",
+                f"{stats['p50_ms']:.1f}",
+                f"{stats['p95_ms']:.1f}",
+                f"{stats['max_ms']:.1f}",
+            )
+        console.print(table)
@@ -0,0 +1,418 @@
+"""Compact resource models built from AWS responses.
+
+boto3 responses carry far more than ecsctl shows: a described task holds
+attachments, network bindings, overrides and more for every container. The
+models below are slotted objects built directly from a response entry that
+keep only the fields the CLI and library callers use, so the raw payload of
+a page can be dropped as soon as the page is processed and memory use grows
+with the number of rows rather than the size of the responses.
+
+Every model is a read-only mapping from its row field names to its values,
+so ``row['InstanceId']``, ``row.get('SSM')``, ``dict(row)`` and comparisons
+with plain dictionaries keep working; ``as_dict`` returns a plain copy for
+serialization.
+
+Example:
+    >>> instance = Instance.from_response(container_instance, ec2_instance)
+    >>> instance.instance_id == instance['InstanceId']
+    True
+    >>> json.dumps(instance.as_dict())
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, ClassVar, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# SSM ping status of instances that are not registered with SSM
+SSM_NOT_REGISTERED = 'NotRegistered'
+# SSM ping status of instances whose lookup failed
+SSM_UNKNOWN = 'Unknown'
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format an AWS timestamp in local time for display."""
+    return datetime.fromtimestamp(value.timestamp()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def json_default(value: Any) -> Any:
+    """``default`` hook of ``json.dump`` serializing models as dictionaries.
+
+    Raises:
+        TypeError: If the value is not a model
+    """
+    if isinstance(value, Model):
+        return value.as_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Model(Mapping):
+    """Base class of the resource models.
+
+    Subclasses declare their attributes in ``__slots__`` and the row field of
+    each attribute, in display order, in ``FIELDS``. Fields listed in
+    ``OPTIONAL`` are left out of the row while their value is None.
+    """
+
+    __slots__ = ()
+
+    FIELDS: ClassVar[Tuple[Tuple[str, str], ...]] = ()
+    OPTIONAL: ClassVar[FrozenSet[str]] = frozenset()
+    _ATTRIBUTES: ClassVar[Dict[str, str]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._ATTRIBUTES = dict(cls.FIELDS)
+
+    def __init__(self, **values: Any) -> None:
+        for attribute in self.__slots__:
+            setattr(self, attribute, values.get(attribute))
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> 'Model':
+        """Rebuild a model from its row, e.g. one loaded from JSON."""
+        return cls(**{attribute: row.get(field) for field, attribute in cls.FIELDS})
+
+    def _present(self, field: str, attribute: str) -> bool:
+        return field not in self.OPTIONAL or getattr(self, attribute) is not None
+
+    def __getitem__(self, field: str) -> Any:
+        attribute = self._ATTRIBUTES.get(field)
+        if attribute is None or not self._present(field, attribute):
+            raise KeyError(field)
+        return getattr(self, attribute)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field, attribute in self.FIELDS if self._present(field, attribute))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the row as a plain dictionary."""
+        return {field: getattr(self, attribute) for field, attribute in self.FIELDS
+                if self._present(field, attribute)}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class Instance(Model):
+    """A container instance and its EC2 metadata.
+
+    Attributes:
+        instance_id (str): EC2 instance ID
+        instance_type (str): EC2 instance type
+        state (str): EC2 instance state, e.g. ``running``
+        status (str): Container instance status, e.g. ``ACTIVE``
+        running_tasks (int): Number of running tasks
+        ssm (Optional[str]): SSM ping status, None unless requested
+    """
+
+    __slots__ = ('instance_id', 'instance_type', 'state', 'status', 'running_tasks', 'ssm')
+
+    FIELDS = (
+        ('InstanceId', 'instance_id'),
+        ('InstanceType', 'instance_type'),
+        ('State', 'state'),
+        ('Status', 'status'),
+        ('RunningTasks', 'running_tasks'),
+        ('SSM', 'ssm'),
+    )
+    OPTIONAL = frozenset(['SSM'])
+
+    @classmethod
+    def from_response(
+        cls,
+        container_instance: Dict[str, Any],
+        ec2_instance: Dict[str, Any],
+        ssm_statuses: Optional[Dict[str, str]] = None
+    ) -> 'Instance':
+        """Build an instance from its ``describe_container_instances`` and
+        ``describe_instances`` entries.
+
+        The SSM ping status is only set when ``ssm_statuses`` is given;
+        instances missing from it are ``SSM_NOT_REGISTERED``.
+        """
+        instance_id = container_instance['ec2InstanceId']
+        return cls(
+            instance_id=instance_id,
+            instance_type=ec2_instance.get('InstanceType', 'N/A'),
+            state=ec2_instance.get('State', {}).get('Name', 'N/A'),
+            status=container_instance['status'],
+            running_tasks=container_instance['runningTasksCount'],
+            ssm=None if ssm_statuses is None else ssm_statuses.get(instance_id, SSM_NOT_REGISTERED)
+        )
+
+
+class Container(Model):
+    """A container of a task.
+
+    Attributes:
+        name (str): Container name
+        status (str): Last known status of the container
+        task_id (str): ID of the task running the container
+        cpu (Any): Reserved CPU units, ``N/A`` if not set
+        memory (Any): Hard memory limit in MiB, ``N/A`` if not set
+        ec2_instance (str): EC2 instance hosting the task
+        created (str): Creation time of the task
+    """
+
+    __slots__ = ('name', 'status', 'task_id', 'cpu', 'memory', 'ec2_instance', 'created')
+
+    FIELDS = (
+        ('Name', 'name'),
+        ('Status', 'status'),
+        ('TaskId', 'task_id'),
+        ('CPU', 'cpu'),
+        ('Memory', 'memory'),
+        ('EC2Instance', 'ec2_instance'),
+        ('Created', 'created'),
+    )
+
+
+class Task(Model):
+    """A task, reduced to what placement and container rows need.
+
+    Tasks are not shown as rows, so the mapping keeps the keys of the
+    ``describe_tasks`` entry it was built from.
+
+    Attributes:
+        arn (str): Task ARN
+        group (str): Task group, ``service:<name>`` for service tasks
+        container_instance_arn (Optional[str]): Host, None on Fargate
+        created_at (Optional[datetime]): Creation time
+        task_definition_arn (Optional[str]): ARN of the task definition
+        launch_type (Optional[str]): ``EC2``, ``FARGATE`` or ``EXTERNAL``
+        desired_status (Optional[str]): Desired status, e.g. ``RUNNING``
+        last_status (Optional[str]): Last known status
+        cpu (Optional[str]): Task-level CPU units, None if not set
+        memory (Optional[str]): Task-level memory in MiB, None if not set
+        containers (Tuple[Tuple[str, str, Any, Any], ...]): Name, status,
+            CPU and memory of every container
+    """
+
+    __slots__ = ('arn', 'group', 'container_instance_arn', 'created_at', 'task_definition_arn',
+                 'launch_type', 'desired_status', 'last_status', 'cpu', 'memory', 'containers')
+
+    FIELDS = (
+        ('taskArn', 'arn'),
+        ('group', 'group'),
+        ('containerInstanceArn', 'container_instance_arn'),
+        ('createdAt', 'created_at'),
+        ('taskDefinitionArn', 'task_definition_arn'),
+        ('launchType', 'launch_type'),
+        ('desiredStatus', 'desired_status'),
+        ('lastStatus', 'last_status'),
+        ('cpu', 'cpu'),
+        ('memory', 'memory'),
+    )
+    OPTIONAL = frozenset(['taskDefinitionArn', 'launchType', 'desiredStatus', 'lastStatus', 'cpu', 'memory'])
+
+    SERVICE_GROUP_PREFIX = 'service:'
+
+    @classmethod
+    def from_response(cls, task: Dict[str, Any]) -> 'Task':
+        """Build a task from its ``describe_tasks`` entry."""
+        return cls(
+            arn=task['taskArn'],
+            group=task.get('group') or '',
+            container_instance_arn=task.get('containerInstanceArn'),
+            created_at=task.get('createdAt'),
+            task_definition_arn=task.get('taskDefinitionArn'),
+            launch_type=task.get('launchType'),
+            desired_status=task.get('desiredStatus'),
+            last_status=task.get('lastStatus'),
+            cpu=task.get('cpu'),
+            memory=task.get('memory'),
+            containers=tuple(
+                (container['name'], container['lastStatus'],
+                 container.get('cpu', 'N/A'), container.get('memory', 'N/A'))
+                for container in task.get('containers', [])
+            )
+        )
+
+    @property
+    def service_name(self) -> Optional[str]:
+        """Name of the service that started the task, None for other tasks."""
+        if self.group.startswith(self.SERVICE_GROUP_PREFIX):
+            return self.group[len(self.SERVICE_GROUP_PREFIX):]
+        return None
+
+    @property
+    def family(self) -> Optional[str]:
+        """Family of the task definition, None if unknown."""
+        if not self.task_definition_arn:
+            return None
+        return self.task_definition_arn.split('/')[-1].rsplit(':', 1)[0]
+
+    def selector_fields(self, ec2_instance_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return the values of the task fields a field selector can compare.
+
+        Args:
+            ec2_instance_id: EC2 instance hosting the task, if resolved
+        """
+        return {
+            'service': self.service_name,
+            'family': self.family,
+            'desiredStatus': self.desired_status,
+            'lastStatus': self.last_status,
+            'launchType': self.launch_type,
+            'instance': ec2_instance_id,
+        }
+
+    def container_rows(self, ec2_instance_id: str) -> List[Container]:
+        """Return one row per container of the task."""
+        task_id = self.arn.split('/')[-1]
+        created = format_timestamp(self.created_at) if self.created_at else 'N/A'
+        return [
+            Container(name=name, status=status, task_id=task_id, cpu=cpu, memory=memory,
+                      ec2_instance=ec2_instance_id, created=created)
+            for name, status, cpu, memory in self.containers
+        ]
+
+
+class Service(Model):
+    """A service and the EC2 instances running its tasks.
+
+    Attributes:
+        name (str): Service name
+        status (str): Service status, e.g. ``ACTIVE``
+        task_definition (str): ARN of the task definition in use
+        desired_count (int): Desired number of tasks
+        running_count (int): Number of running tasks
+        pending_count (int): Number of pending tasks
+        ec2_instances (str): Comma-separated EC2 instance IDs
+    """
+
+    __slots__ = ('name', 'status', 'task_definition', 'desired_count', 'running_count',
+                 'pending_count', 'ec2_instances')
+
+    FIELDS = (
+        ('ServiceName', 'name'),
+        ('Status', 'status'),
+        ('TaskDefinition', 'task_definition'),
+        ('DesiredCount', 'desired_count'),
+        ('RunningCount', 'running_count'),
+        ('PendingCount', 'pending_count'),
+        ('EC2Instances', 'ec2_instances'),
+    )
+
+    @classmethod
+    def from_response(cls, service: Dict[str, Any], ec2_instance_ids: List[str]) -> 'Service':
+        """Build a service from its ``describe_services`` entry."""
+        return cls(
+            name=service['serviceName'],
+            status=service['status'],
+            task_definition=service['taskDefinition'],
+            desired_count=service['desiredCount'],
+            running_count=service['runningCount'],
+            pending_count=service['pendingCount'],
+            ec2_instances=', '.join(ec2_instance_ids)
+        )
+
+
+class TaskDefinition(Model):
+    """A task definition revision.
+
+    Attributes:
+        family (str): Family name
+        revision (int): Revision number
+        status (str): ``ACTIVE`` or ``INACTIVE``
+        cpu (Any): Task-level CPU, ``N/A`` if not set
+        memory (Any): Task-level memory, ``N/A`` if not set
+        last_updated (str): Registration time
+    """
+
+    __slots__ = ('family', 'revision', 'status', 'cpu', 'memory', 'last_updated')
+
+    FIELDS = (
+        ('Family', 'family'),
+        ('Revision', 'revision'),
+        ('Status', 'status'),
+        ('Cpu', 'cpu'),
+        ('Memory', 'memory'),
+        ('LastUpdated', 'last_updated'),
+    )
+
+    @classmethod
+    def from_response(cls, td: Dict[str, Any]) -> 'TaskDefinition':
+        """Build a revision from its ``describe_task_definition`` entry."""
+        return cls(
+            family=td['family'],
+            revision=td['revision'],
+            status=td['status'],
+            cpu=td.get('cpu', 'N/A'),
+            memory=td.get('memory', 'N/A'),
+            last_updated=format_timestamp(td['registeredAt'])
+        )
+
+    def revision_row(self) -> Dict[str, Any]:
+        """Return the row without ``Status``, the only field of a registered
+        revision that changes, when it is deregistered."""
+        row = self.as_dict()
+        del row['Status']
+        return row
+
+    @classmethod
+    def from_revision_row(cls, row: Dict[str, Any], status: str) -> 'TaskDefinition':
+        """Rebuild a revision from its stored row and its current status."""
+        task_definition = cls.from_dict(row)
+        task_definition.status = status
+        return task_definition
+
+
+class NodeCapacity(Model):
+    """Reserved and registered CPU and memory of a container instance.
+
+    Attributes:
+        instance_id (str): EC2 instance ID
+        status (str): Container instance status, e.g. ``ACTIVE``
+        running_tasks (int): Number of running tasks
+        cpu_registered (int): CPU units registered with ECS
+        cpu_used (int): CPU units reserved by tasks
+        cpu_utilization (float): Reserved share of the CPU, in percent
+        memory_registered (int): Memory registered with ECS, in MiB
+        memory_used (int): Memory reserved by tasks, in MiB
+        memory_utilization (float): Reserved share of the memory, in percent
+    """
+
+    __slots__ = ('instance_id', 'status', 'running_tasks', 'cpu_registered', 'cpu_used',
+                 'cpu_utilization', 'memory_registered', 'memory_used', 'memory_utilization')
+
+    FIELDS = (
+        ('InstanceId', 'instance_id'),
+        ('Status', 'status'),
+        ('RunningTasks', 'running_tasks'),
+        ('CpuRegistered', 'cpu_registered'),
+        ('CpuUsed', 'cpu_used'),
+        ('CpuUtilization', 'cpu_utilization'),
+        ('MemoryRegistered', 'memory_registered'),
+        ('MemoryUsed', 'memory_used'),
+        ('MemoryUtilization', 'memory_utilization'),
+    )
+
+
+class ServiceCapacity(Model):
+    """CPU and memory reserved by the tasks of a service.
+
+    Attributes:
+        name (str): Service name
+        tasks (int): Number of tasks
+        hosts (int): Number of container instances running the tasks
+        cpu (int): CPU units reserved by the tasks
+        cpu_share (float): Share of the cluster's registered CPU, in percent
+        memory (int): Memory reserved by the tasks, in MiB
+        memory_share (float): Share of the cluster's registered memory, in percent
+    """
+
+    __slots__ = ('name', 'tasks', 'hosts', 'cpu', 'cpu_share', 'memory', 'memory_share')
+
+    FIELDS = (
+        ('ServiceName', 'name'),
+        ('Tasks', 'tasks'),
+        ('Hosts', 'hosts'),
+        ('Cpu', 'cpu'),
+        ('CpuShare', 'cpu_share'),
+        ('Memory', 'memory'),
+        ('MemoryShare', 'memory_share'),
+    )
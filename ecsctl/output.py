@@ -0,0 +1,146 @@
+"""Output formats of the ``get`` commands.
+
+``table`` is the default, human-oriented view built by each command. The
+other formats print every field of a row:
+
+* ``wide`` renders all fields as a table without truncating any value.
+* ``json`` prints a single array once every row is known.
+* ``ndjson`` and ``tsv`` write and flush each row as soon as it is produced,
+  so a large listing starts printing after the first batch resolves and is
+  never held in memory as a whole.
+"""
+
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from ecsctl.models import Model
+
+OUTPUT_FORMATS = ('table', 'wide', 'json', 'ndjson', 'tsv')
+
+# Formats written row by row while the listing is still being fetched
+STREAMING_FORMATS = ('ndjson', 'tsv')
+
+# Fields identifying the origin of rows merged across regions and clusters
+CONTEXT_FIELDS = ('Region', 'Cluster')
+
+
+def context_fields(rows: List[Dict[str, Any]]) -> List[str]:
+    """Return the context fields present in merged rows, in display order."""
+    return [field for field in CONTEXT_FIELDS if rows and field in rows[0]]
+
+
+def _json_value(value: Any) -> Any:
+    """Serialize resource models as objects and any other value as a string."""
+    return value.as_dict() if isinstance(value, Model) else str(value)
+
+
+def _tsv_value(value: Any) -> str:
+    """Format a value as a single TSV field."""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        value = ','.join(str(item) for item in value)
+    return str(value).replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+
+
+def write_ndjson(rows: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write one JSON object per line, flushing after every row.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row, default=_json_value) + '\n')
+        stream.flush()
+        count += 1
+    return count
+
+
+def write_tsv(rows: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write a header and one tab-separated line per row, flushing after every row.
+
+    The columns are the fields of the first row.
+
+    Returns:
+        Number of rows written
+    """
+    columns: Optional[List[str]] = None
+    count = 0
+    for row in rows:
+        if columns is None:
+            columns = list(row)
+            stream.write('\t'.join(columns) + '\n')
+        stream.write('\t'.join(_tsv_value(row.get(column)) for column in columns) + '\n')
+        stream.flush()
+        count += 1
+    return count
+
+
+def write_json(rows: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write all rows as one indented JSON array.
+
+    Returns:
+        Number of rows written
+    """
+    rows = list(rows)
+    stream.write(json.dumps(rows, indent=2, default=_json_value) + '\n')
+    return len(rows)
+
+
+def print_wide(rows: Iterable[Dict[str, Any]], console: Any) -> int:
+    """Print every field of the rows as a table without truncating values.
+
+    Returns:
+        Number of rows printed
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    rows = list(rows)
+    table = Table(show_header=True, header_style="bold magenta")
+    columns = list(rows[0]) if rows else []
+    for column in columns:
+        table.add_column(column, no_wrap=True)
+    for row in rows:
+        table.add_row(*(_tsv_value(row.get(column)) for column in columns))
+
+    # Widen the console instead of letting rich shrink and crop the columns
+    width = console.measure(table, options=console.options.update_width(sys.maxsize)).maximum
+    if width > console.width:
+        console = Console(width=width, file=console.file)
+    console.print(table)
+    return len(rows)
+
+
+def write_rows(
+    rows: Iterable[Dict[str, Any]],
+    output: str,
+    console: Any,
+    stream: Optional[TextIO] = None
+) -> int:
+    """Write rows in one of the non-table output formats.
+
+    Args:
+        rows: Rows to write, consumed lazily by the streaming formats
+        output: One of ``wide``, ``json``, ``ndjson`` or ``tsv``
+        console: rich console used by ``wide``
+        stream: Destination of the text formats, stdout if None
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If the output format is unknown
+    """
+    stream = stream or sys.stdout
+    if output == 'wide':
+        return print_wide(rows, console)
+    if output == 'json':
+        return write_json(rows, stream)
+    if output == 'ndjson':
+        return write_ndjson(rows, stream)
+    if output == 'tsv':
+        return write_tsv(rows, stream)
+    raise ValueError(f"Unknown output format: {output}")
@@ -0,0 +1,163 @@
+"""Recording and replay of the AWS API responses seen by ecsctl.
+
+``--record <dir>`` stores the parsed response of every API call of a run,
+gzip-compressed, in a file keyed by region, service, operation and request
+parameters. ``--replay <dir>`` answers the calls of a later run from those
+files instead of AWS: no credentials or network are needed, and every
+response still goes through botocore's error handling and the same
+``ECSController`` code paths, so slow or broken cases can be reproduced
+deterministically and rendering can be profiled on production-sized
+snapshots at no API cost.
+
+Both modes hook the botocore event system of every client the controller
+creates, the way ``botocore.stub.Stubber`` does.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.session import Session as BotocoreSession
+
+logger = logging.getLogger(__name__)
+
+# Key of the response file path in botocore's per-call request context
+_CONTEXT_KEY = 'ecsctl_recording'
+
+# Marks timestamps in the stored JSON, which has no date type
+_DATETIME_TAG = '__datetime__'
+
+# Error code of calls that have no recorded response on replay
+REPLAY_MISS_ERROR_CODE = 'ReplayResponseNotFound'
+
+
+def _encode(value: Any) -> Any:
+    """JSON encoder for the values of parsed responses."""
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    """JSON object hook restoring the values encoded by ``_encode``."""
+    if len(obj) == 1 and _DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[_DATETIME_TAG])
+    return obj
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """Return a stable key of the parameters of an API call."""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:20]
+
+
+class ApiRecording:
+    """Records API responses to a directory, or replays them from it.
+
+    Thread-safe: the calls of concurrent fan-outs are recorded and replayed
+    from their worker threads.
+
+    Attributes:
+        directory (Path): Directory holding the recorded responses
+        replay (bool): Whether calls are answered from the recording
+        misses (List[str]): Calls without a recorded response on replay
+
+    Example:
+        >>> recording = ApiRecording('snapshots/prod')
+        >>> recording.register(ecs_client)
+        >>> ecs_client.list_clusters()  # written to snapshots/prod
+        >>> replay = ApiRecording('snapshots/prod', replay=True)
+        >>> client = replay.session('ap-southeast-1').client('ecs')
+        >>> replay.register(client)
+        >>> client.list_clusters()  # answered from snapshots/prod
+    """
+
+    def __init__(self, directory: os.PathLike, replay: bool = False) -> None:
+        self.directory = Path(directory)
+        self.replay = replay
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def revisions_dir(self) -> Path:
+        """Revision store of the recorded run, so recordings are self-contained."""
+        return self.directory / 'revisions'
+
+    def path(self, region: str, service_name: str, operation: str, params: Dict[str, Any]) -> Path:
+        """Return the file of the response to an API call."""
+        return self.directory / region / service_name / f'{operation}-{request_key(params)}.json.gz'
+
+    def session(self, region: str) -> boto3.Session:
+        """Return a session for replay, which needs neither credentials nor a profile."""
+        # Ignore AWS_PROFILE: the profile may not exist where the run is replayed
+        botocore_session = BotocoreSession(session_vars={'profile': (None, None, None, None)})
+        botocore_session.set_credentials('replay-access-key', 'replay-secret-key')
+        return boto3.Session(botocore_session=botocore_session, region_name=region)
+
+    def register(self, client: Any) -> None:
+        """Record or replay the calls of a botocore client."""
+        region = client.meta.region_name
+        service_name = client.meta.service_model.service_name
+
+        def locate(params: Dict[str, Any], model: Any, context: Dict[str, Any], **kwargs: Any) -> None:
+            # Later events only see the serialized request; key by the API parameters
+            context[_CONTEXT_KEY] = (
+                self.path(region, service_name, model.name, params),
+                f'{service_name}.{model.name}'
+            )
+
+        events = client.meta.events
+        events.register('before-parameter-build', locate)
+        if self.replay:
+            events.register('before-call.*.*', self._respond)
+        else:
+            events.register('after-call', self._record)
+
+    def _record(self, http_response: Any, parsed: Dict[str, Any], context: Dict[str, Any],
+                **kwargs: Any) -> None:
+        located = context.get(_CONTEXT_KEY)
+        if located is None:
+            return
+        path = located[0]
+        response = {key: value for key, value in parsed.items() if key != 'ResponseMetadata'}
+        data = json.dumps(
+            {'status': http_response.status_code, 'response': response}, default=_encode
+        ).encode()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to record {located[1]}: {str(e)}")
+
+    def _respond(self, context: Dict[str, Any], **kwargs: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Answer a call from the recording in place of the HTTP round trip."""
+        located = context.get(_CONTEXT_KEY)
+        if located is None:
+            return None
+        path, operation = located
+        try:
+            with gzip.open(path, 'rb') as f:
+                recorded = json.loads(f.read(), object_hook=_decode)
+            status, parsed = recorded['status'], recorded['response']
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses.append(operation)
+            status = 404
+            parsed = {'Error': {
+                'Code': REPLAY_MISS_ERROR_CODE,
+                'Message': f'No recorded response for {operation} in {self.directory}',
+            }}
+        parsed['ResponseMetadata'] = {'HTTPStatusCode': status, 'RetryAttempts': 0}
+        return AWSResponse(f'file://{path}', status, {}, None), parsed
@@ -0,0 +1,158 @@
+"""Field and label selectors of the get commands.
+
+Selectors follow kubectl's syntax: comma-separated requirements that must
+all hold. Field selectors compare a resource field (``status=ACTIVE``,
+``launchType!=FARGATE``); label selectors compare tags (``team=payments``,
+``env!=dev``) or test for their presence (``team``, ``!team``).
+
+``ECSController`` pushes equality requirements down into the API calls that
+accept them, e.g. ``list_tasks(serviceName=...)`` or the cluster query
+language filter of ``list_container_instances``, and evaluates every
+requirement locally on the described resources as well, so a selector never
+depends on what the server could filter.
+
+Example:
+    >>> selector = Selector.parse('status=ACTIVE,launchType!=FARGATE', SERVICE_FIELDS)
+    >>> selector.equals('status')
+    'ACTIVE'
+    >>> selector.matches({'status': 'ACTIVE', 'launchType': 'EC2'})
+    True
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+EQUALS = '='
+NOT_EQUALS = '!='
+EXISTS = 'exists'
+NOT_EXISTS = '!exists'
+
+# Fields accepted by --field-selector, per resource kind
+INSTANCE_FIELDS = ('instanceId', 'status', 'state', 'instanceType', 'availabilityZone')
+SERVICE_FIELDS = ('name', 'status', 'launchType', 'schedulingStrategy', 'taskDefinition')
+TASK_FIELDS = ('service', 'family', 'desiredStatus', 'lastStatus', 'launchType', 'instance')
+TASK_DEFINITION_FIELDS = ('family', 'status', 'revision')
+
+# Enum fields whose values AWS spells in one case; values given in any case
+# are normalized, so status=active matches ACTIVE
+FIELD_VALUE_CASE = {
+    'status': str.upper,
+    'launchType': str.upper,
+    'schedulingStrategy': str.upper,
+    'desiredStatus': str.upper,
+    'lastStatus': str.upper,
+    'state': str.lower,
+}
+
+
+class Requirement(NamedTuple):
+    """A single requirement of a selector.
+
+    Attributes:
+        key: Field or tag key
+        operator: ``EQUALS``, ``NOT_EQUALS``, ``EXISTS`` or ``NOT_EXISTS``
+        value: Compared value, None for the existence operators
+    """
+
+    key: str
+    operator: str
+    value: Optional[str] = None
+
+    def matches(self, values: Mapping[str, Any]) -> bool:
+        """Return whether the field or tag values satisfy the requirement."""
+        if self.operator == EXISTS:
+            return self.key in values
+        if self.operator == NOT_EXISTS:
+            return self.key not in values
+        value = values.get(self.key)
+        equal = value is not None and str(value) == self.value
+        return equal if self.operator == EQUALS else not equal
+
+    def __str__(self) -> str:
+        if self.operator == EXISTS:
+            return self.key
+        if self.operator == NOT_EXISTS:
+            return f'!{self.key}'
+        return f'{self.key}{self.operator}{self.value}'
+
+
+class Selector:
+    """Conjunction of requirements; an empty selector matches everything.
+
+    Attributes:
+        requirements (List[Requirement]): Requirements that must all hold
+    """
+
+    def __init__(self, requirements: Iterable[Requirement] = ()) -> None:
+        self.requirements = list(requirements)
+
+    @classmethod
+    def parse(cls, spec: Optional[str], fields: Optional[Iterable[str]] = None) -> 'Selector':
+        """Parse a selector.
+
+        Args:
+            spec: Comma-separated requirements; None or empty for no selector
+            fields: Keys allowed in a field selector, matched case-insensitively;
+                    None to parse a label selector. Values of the enum fields
+                    in ``FIELD_VALUE_CASE`` are normalized to AWS's spelling
+
+        Raises:
+            ValueError: If a requirement is malformed or names an unknown field
+        """
+        known = {field.lower(): field for field in fields} if fields is not None else None
+        requirements = []
+        for part in filter(None, (part.strip() for part in (spec or '').split(','))):
+            if NOT_EQUALS in part:
+                key, value = part.split(NOT_EQUALS, 1)
+                operator = NOT_EQUALS
+            elif EQUALS in part:
+                key, value = part.split('==', 1) if '==' in part else part.split(EQUALS, 1)
+                operator = EQUALS
+            elif known is None:
+                operator, key, value = (NOT_EXISTS, part[1:], None) if part.startswith('!') \
+                    else (EXISTS, part, None)
+            else:
+                raise ValueError(f"Expected field=value or field!=value, got '{part}'")
+            key = key.strip()
+            if not key:
+                raise ValueError(f"Missing key in '{part}'")
+            if known is not None:
+                if key.lower() not in known:
+                    raise ValueError(f"Unknown field '{key}', expected one of: {', '.join(known.values())}")
+                key = known[key.lower()]
+            if value is not None:
+                value = value.strip()
+                if known is not None and key in FIELD_VALUE_CASE:
+                    value = FIELD_VALUE_CASE[key](value)
+            requirements.append(Requirement(key, operator, value))
+        return cls(requirements)
+
+    def __bool__(self) -> bool:
+        return bool(self.requirements)
+
+    def __str__(self) -> str:
+        return ','.join(str(requirement) for requirement in self.requirements)
+
+    def keys(self) -> List[str]:
+        """Return the keys the requirements refer to."""
+        return [requirement.key for requirement in self.requirements]
+
+    def equals(self, key: str) -> Optional[str]:
+        """Return the value a key must equal, None if there is no such requirement."""
+        for requirement in self.requirements:
+            if requirement.key == key and requirement.operator == EQUALS:
+                return requirement.value
+        return None
+
+    def matches(self, values: Mapping[str, Any]) -> bool:
+        """Return whether the field or tag values satisfy every requirement."""
+        return all(requirement.matches(values) for requirement in self.requirements)
+
+
+def tag_dict(tags: Optional[List[Dict[str, str]]]) -> Dict[str, str]:
+    """Convert ECS (``key``/``value``) or EC2 (``Key``/``Value``) tags to a dict."""
+    result = {}
+    for tag in tags or []:
+        key = tag.get('key', tag.get('Key'))
+        if key is not None:
+            result[key] = tag.get('value', tag.get('Value', ''))
+    return result
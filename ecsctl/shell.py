@@ -0,0 +1,193 @@
+"""Interactive shell running ecsctl commands with one warm controller.
+
+During an incident, ``get services``, ``get ec2`` and ``exec`` are run back
+to back. As separate invocations, each one pays for interpreter start-up,
+session creation and a full cluster scan. ``EcsShell`` runs the same click
+commands in one process with one ``ECSController``, whose ``MemoryCache``
+serves the results of recent commands to the following ones, and completes
+names from the listings it already fetched.
+
+Example:
+    >>> EcsShell(ecs, cli, {'cached': True}).cmdloop()
+    ecsctl:prod> get ec2
+    ecsctl:prod> exec i-0123456789abcdef0
+"""
+
+import cmd
+import shlex
+from typing import Any, Dict, Iterable, List, Optional
+
+import click
+
+from ecsctl.cache import MemoryCache
+
+# Options whose value is completed from fetched listings, by listing kind
+# and row field
+VALUE_COMPLETIONS = {
+    '--service': ('services', 'ServiceName'),
+    '--instance': ('ec2', 'InstanceId'),
+    '--family': ('task-definitions', 'Family'),
+}
+# Positional arguments completed from fetched listings
+ARGUMENT_COMPLETIONS = {
+    'use-cluster': ('clusters', None),
+    'exec': ('ec2', 'InstanceId'),
+}
+
+
+class EcsShell(cmd.Cmd):
+    """Read-eval-print loop over the ecsctl click commands.
+
+    Every line is parsed like an ecsctl command line and run with the
+    shell's controller; ``refresh`` forgets the cached results and ``exit``
+    leaves the shell.
+
+    Attributes:
+        ecs (ECSController): Controller reused by every command
+        command (click.Group): The ecsctl command group
+        defaults (Dict[str, Any]): click ``default_map`` of every command
+    """
+
+    intro = "ecsctl shell. Type 'help' for commands, 'exit' or Ctrl-D to quit."
+
+    def __init__(self, ecs: Any, command: click.Group, defaults: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize the shell.
+
+        Args:
+            ecs: Controller reused by every command; its cache should be a
+                 ``MemoryCache``
+            command: The ecsctl command group
+            defaults: Option defaults of every command, as a click ``default_map``
+        """
+        super().__init__()
+        self.ecs = ecs
+        self.command = command
+        self.defaults = defaults or {}
+        self._update_prompt()
+
+    def _update_prompt(self) -> None:
+        cluster = self.ecs.config.get_current_cluster()
+        self.prompt = f"ecsctl:{cluster}> " if cluster else "ecsctl> "
+
+    def cmdloop(self, intro: Optional[str] = None) -> None:
+        """Read commands until ``exit``; Ctrl-C only abandons the current line."""
+        while True:
+            try:
+                super().cmdloop(intro)
+                return
+            except KeyboardInterrupt:
+                click.echo('^C')
+                intro = ''
+
+    def preloop(self) -> None:
+        try:
+            import readline
+        except ImportError:
+            return
+        # Complete whole words: command and option names contain dashes
+        readline.set_completer_delims(' \t\n')
+
+    def postcmd(self, stop: bool, line: str) -> bool:
+        self._update_prompt()
+        return stop
+
+    def emptyline(self) -> bool:
+        # Repeating the last command would repeat its API calls
+        return False
+
+    def run(self, args: List[str]) -> int:
+        """Run an ecsctl command line with the shell's controller.
+
+        Returns:
+            Exit code of the command
+        """
+        self.ecs.begin_command()
+        try:
+            self.command.main(args=args, prog_name='ecsctl', obj={'controller': self.ecs},
+                              default_map=self.defaults)
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except Exception as e:
+            # A failing command must not end the session and lose its state
+            click.echo(f"Error: {str(e)}", err=True)
+            return 1
+        return 0
+
+    def default(self, line: str) -> bool:
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            click.echo(f"Error: {str(e)}", err=True)
+            return False
+        self.run(args)
+        return False
+
+    def do_help(self, arg: str) -> None:
+        """Show the shell's commands, or the help of an ecsctl command."""
+        if arg:
+            self.run(shlex.split(arg) + ['--help'])
+            return
+        self.run(['--help'])
+        click.echo("\nShell commands:\n  refresh  Forget cached results and tags.\n  exit     Leave the shell.")
+
+    def do_refresh(self, arg: str) -> None:
+        """Forget cached results and tags, so the next commands fetch from AWS."""
+        if isinstance(self.ecs.cache, MemoryCache):
+            self.ecs.cache.clear()
+        self.ecs.tags.clear()
+
+    def do_exit(self, arg: str) -> bool:
+        """Leave the shell."""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg: str) -> bool:
+        click.echo()
+        return True
+
+    def names(self, kind: str, field: Optional[str]) -> List[str]:
+        """Return the distinct names found in the cached listings of a kind."""
+        if not isinstance(self.ecs.cache, MemoryCache):
+            return []
+        names: Dict[str, None] = {}
+        for listing in self.ecs.cache.listings(kind):
+            for row in listing:
+                names[row if field is None else row[field]] = None
+        return list(names)
+
+    def completenames(self, text: str, *ignored: Any) -> List[str]:
+        commands = list(self.command.list_commands(click.Context(self.command)))
+        commands += ['exit', 'help', 'refresh']
+        return [name for name in commands if name.startswith(text)]
+
+    def completedefault(self, text: str, line: str, begidx: int, endidx: int) -> List[str]:
+        words = line[:begidx].split()
+        return [name for name in self._candidates(words, text) if name.startswith(text)]
+
+    def _candidates(self, words: List[str], text: str) -> Iterable[str]:
+        """Return the completions of the word after ``words``."""
+        if words[-1] in VALUE_COMPLETIONS:
+            return self.names(*VALUE_COMPLETIONS[words[-1]])
+
+        ctx = click.Context(self.command)
+        command: Any = self.command
+        arguments = []
+        for word in words:
+            if isinstance(command, click.Group) and not word.startswith('-'):
+                subcommand = command.get_command(ctx, word)
+                if subcommand is not None:
+                    command = subcommand
+                    arguments = [word]
+                    continue
+            if not word.startswith('-'):
+                arguments.append(word)
+
+        if text.startswith('-'):
+            return [opt for param in command.params for opt in param.opts + param.secondary_opts
+                    if opt.startswith('-')]
+        if isinstance(command, click.Group):
+            return command.list_commands(ctx)
+        if len(arguments) == 1 and arguments[0] in ARGUMENT_COMPLETIONS:
+            return self.names(*ARGUMENT_COMPLETIONS[arguments[0]])
+        return []
@@ -0,0 +1,224 @@
+"""Client-side rate limiting and retry policy of the AWS API calls.
+
+ECS, EC2 and SSM throttle API requests per account and region, and the
+budget is shared with every other tool using the account. ``RateLimiter``
+keeps one token bucket per service and region that every client of an
+``ECSController`` (and its regional controllers) draws from, so adding
+parallelism never sends more than the configured rate.
+
+The buckets adapt like TCP congestion control: a throttling error halves the
+bucket's rate and drops its burst, and every successful call raises the rate
+again by a small step up to the configured maximum. Throughput settles just
+below the rate the service accepts instead of collapsing into retries.
+Retries themselves follow botocore's retry modes, configured by
+``retry_config``.
+
+Calls made with ``--record`` go to AWS and are limited like any other;
+only replayed calls, answered from the recording without reaching the
+network, are not.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from ecsctl.instrumentation import THROTTLING_ERROR_CODES
+
+# botocore is only needed once clients are created; the CLI imports this
+# module for its option defaults and must start fast
+if TYPE_CHECKING:
+    from botocore.config import Config
+
+# Sustained requests per second and burst size of each service's bucket.
+# They match the documented token buckets of the EC2 and ECS read APIs;
+# SSM's DescribeInstanceInformation accepts fewer requests.
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    'ecs': (20.0, 100),
+    'ec2': (20.0, 100),
+    'ssm': (10.0, 20),
+}
+
+# Adaptive rate control: multiplicative decrease on throttling, additive
+# increase of a fraction of the maximum rate on every success
+THROTTLE_BACKOFF = 0.5
+RECOVERY_STEP = 0.02
+MIN_RATE = 0.5
+
+# Throttles of calls already in flight when the rate was lowered reflect the
+# old rate, so the rate is lowered at most once per cooldown
+THROTTLE_COOLDOWN = 1.0
+
+RETRY_MODES = ('standard', 'adaptive', 'legacy')
+DEFAULT_RETRY_MODE = 'standard'
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def retry_config(max_attempts: int = DEFAULT_MAX_ATTEMPTS, mode: str = DEFAULT_RETRY_MODE) -> 'Config':
+    """Return the botocore client configuration of the retry policy.
+
+    Args:
+        max_attempts: Attempts per call, including the first one
+        mode: botocore retry mode, one of ``RETRY_MODES``
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    from botocore.config import Config
+
+    if mode not in RETRY_MODES:
+        raise ValueError(f"Unknown retry mode: {mode}")
+    return Config(retries={'total_max_attempts': max_attempts, 'mode': mode})
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, int]]:
+    """Parse rate limits given as ``service=rate[:burst]`` pairs.
+
+    A rate of 0 disables limiting of the service.
+
+    Example:
+        >>> parse_rate_limits('ecs=10:40,ssm=0')
+        {'ecs': (10.0, 40), 'ssm': (0.0, 0)}
+
+    Raises:
+        ValueError: If a pair is malformed or a value is negative
+    """
+    limits = {}
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        service, sep, value = pair.partition('=')
+        if not sep or not service.strip():
+            raise ValueError(f"Expected service=rate[:burst], got '{pair}'")
+        rate_text, _, burst_text = value.partition(':')
+        rate = float(rate_text)
+        burst = int(burst_text) if burst_text else max(1, int(rate))
+        if rate < 0 or burst < 0:
+            raise ValueError(f"Rate and burst must not be negative, got '{pair}'")
+        limits[service.strip().lower()] = (rate, burst if rate else 0)
+    return limits
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling.
+
+    Callers reserve a token and sleep until it is due, so concurrent callers
+    are paced in arrival order instead of polling the bucket.
+
+    Attributes:
+        max_rate (float): Configured requests per second
+        rate (float): Current requests per second
+        capacity (int): Burst size
+        throttles (int): Throttling errors reported
+        waited (float): Total seconds callers slept for a token
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.throttles = 0
+        self.waited = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._last_backoff: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            Seconds slept
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def throttled(self) -> None:
+        """Lower the rate after a throttling error and drop the burst."""
+        with self._lock:
+            self.throttles += 1
+            now = self._clock()
+            if self._last_backoff is not None and now - self._last_backoff < THROTTLE_COOLDOWN:
+                return
+            self._last_backoff = now
+            self._refill(now)
+            self.rate = max(MIN_RATE, self.rate * THROTTLE_BACKOFF)
+            self._tokens = min(self._tokens, 0.0)
+
+    def succeeded(self) -> None:
+        """Raise the rate again after a successful call."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(self._clock())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+
+class RateLimiter:
+    """Token buckets shared by all clients, one per service and region.
+
+    Example:
+        >>> limiter = RateLimiter({'ecs': (10.0, 40)})
+        >>> limiter.register(ecs_client)
+        >>> limiter.bucket('ecs', 'ap-southeast-1').rate
+        10.0
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None) -> None:
+        """Initialize the limiter.
+
+        Args:
+            limits: Rate and burst per service, overriding
+                    ``DEFAULT_RATE_LIMITS``; a rate of 0 disables limiting
+        """
+        self.limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service_name: str, region: str) -> Optional[TokenBucket]:
+        """Return the bucket of a service in a region, None if unlimited."""
+        rate, capacity = self.limits.get(service_name, (0.0, 0))
+        if rate <= 0:
+            return None
+        with self._lock:
+            key = (service_name, region)
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(rate, capacity)
+            return self._buckets[key]
+
+    def register(self, client: Any) -> None:
+        """Limit the requests of a botocore client, including its retries."""
+        bucket = self.bucket(client.meta.service_model.service_name, client.meta.region_name)
+        if bucket is None:
+            return
+
+        def before_send(**kwargs: Any) -> None:
+            # Every attempt costs a token; returning None lets the request go out
+            bucket.acquire()
+
+        def needs_retry(response: Optional[tuple] = None, **kwargs: Any) -> None:
+            if response is not None and response[1].get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+                bucket.throttled()
+
+        def after_call(http_response: Any, **kwargs: Any) -> None:
+            if http_response is not None and http_response.status_code < 300:
+                bucket.succeeded()
+
+        events = client.meta.events
+        events.register('before-send', before_send)
+        events.register('needs-retry', needs_retry)
+        events.register('after-call', after_call)
@@ -3,7 +3,11 @@ Utility functions and helpers for the ecsctl package.
 """
 
 import contextlib
+import itertools
 import signal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
 
 
 @contextlib.contextmanager
@@ -33,4 +37,83 @@ def ignore_user_entered_signals():
     finally:
         # Restore original signal handlers
         for sig, user_signal in enumerate(signal_list):
-            signal.signal(user_signal, actual_signals[sig]) 
\ No newline at end of file
+            signal.signal(user_signal, actual_signals[sig])
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into consecutive lists of at most ``size`` items.
+
+    Used to respect the per-call limits of AWS describe APIs, e.g. 100 ARNs
+    for ``describe_container_instances`` or 10 for ``describe_services``.
+    Items are consumed lazily, so a paginated listing can be batched while
+    later pages have not been fetched yet.
+
+    Example:
+        >>> list(chunked([1, 2, 3, 4, 5], 2))
+        [[1, 2], [3, 4], [5]]
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def paginate_pages(
+    operation: Callable[..., Dict[str, Any]],
+    result_key: str,
+    token_key: str = 'nextToken',
+    **kwargs: Any
+) -> Iterator[List[Any]]:
+    """
+    Yield the items of a paginated AWS list/describe operation page by page.
+
+    Pages are requested lazily, so a consumer that stops early stops the
+    remaining API calls as well.
+
+    Args:
+        operation: Bound client method, e.g. ``ecs_client.list_tasks``
+        result_key: Response key holding the page items
+        token_key: Name of the continuation token; ECS uses ``nextToken``,
+                   EC2 and SSM use ``NextToken``
+        **kwargs: Request parameters passed to every page call
+
+    Example:
+        >>> for arns in paginate_pages(ecs.list_tasks, 'taskArns', cluster='prod'):
+        ...     describe(arns)
+    """
+    while True:
+        response = operation(**kwargs)
+        yield response.get(result_key, [])
+        token = response.get(token_key)
+        if not token:
+            return
+        kwargs[token_key] = token
+
+
+def paginate(
+    operation: Callable[..., Dict[str, Any]],
+    result_key: str,
+    token_key: str = 'nextToken',
+    **kwargs: Any
+) -> Iterator[Any]:
+    """
+    Yield every item of a paginated AWS list/describe operation.
+
+    Follows the continuation token until the service stops returning one,
+    so callers see the complete result set instead of just the first page.
+
+    Args:
+        operation: Bound client method, e.g. ``ecs_client.list_tasks``
+        result_key: Response key holding the page items
+        token_key: Name of the continuation token; ECS uses ``nextToken``,
+                   EC2 and SSM use ``NextToken``
+        **kwargs: Request parameters passed to every page call
+
+    Example:
+        >>> arns = list(paginate(ecs.list_tasks, 'taskArns', cluster='prod'))
+    """
+    for page in paginate_pages(operation, result_key, token_key, **kwargs):
+        yield from page
@@ -0,0 +1,175 @@
+"""Incremental polling for ``get --watch``.
+
+A watcher keeps the state of the previous poll and only re-describes what
+its cheap signature says has changed:
+
+* services are described on every poll, since their counts and deployments
+  are the signature. The cluster's tasks are only listed again when a
+  service signature changed, and then only tasks not seen before are
+  described; task placement never changes, so known tasks are reused.
+* container instances are described on every poll for their status and task
+  counts, but the EC2 metadata of an instance is only described again when
+  the instance is new or its status or agent connection changed.
+
+The same controller, session and container instance index are reused for
+every poll.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ecsctl.ecs_controller import ECSController
+from ecsctl.exceptions import ECSCommandError
+from ecsctl.index import TaskSnapshot
+from ecsctl.models import Instance
+
+DEFAULT_INTERVAL = 2.0
+
+
+def _service_signature(service: Dict[str, Any]) -> Tuple:
+    """Fields of a service that change when its tasks change."""
+    return (
+        service['desiredCount'],
+        service['runningCount'],
+        service['pendingCount'],
+        tuple(
+            (deployment.get('id'), deployment.get('status'), deployment.get('rolloutState'),
+             deployment.get('runningCount'), deployment.get('pendingCount'))
+            for deployment in service.get('deployments', [])
+        ),
+    )
+
+
+def _instance_signature(container_instance: Dict[str, Any]) -> Tuple:
+    """Fields of a container instance that hint at an EC2 state change."""
+    return (container_instance['status'], container_instance.get('agentConnected'))
+
+
+class ServiceWatcher:
+    """Polls the services of a cluster incrementally.
+
+    Attributes:
+        key (str): Row field identifying a service
+    """
+
+    key = 'ServiceName'
+
+    def __init__(self, ecs: ECSController, cluster_name: str) -> None:
+        self.ecs = ecs
+        self.cluster_name = cluster_name
+        self._signatures: Optional[Dict[str, Tuple]] = None
+        self._snapshot: Optional[TaskSnapshot] = None
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Fetch the current service rows.
+
+        Raises:
+            ECSCommandError: If service retrieval fails
+        """
+        try:
+            services = self.ecs._describe_services(self.cluster_name)
+            signatures = {
+                service['serviceName']: _service_signature(service) for service in services
+            }
+            if self._snapshot is None or signatures != self._signatures:
+                self._snapshot = self.ecs._task_snapshot(self.cluster_name, previous=self._snapshot)
+            self._signatures = signatures
+            return self.ecs._service_infos(self.cluster_name, services, self._snapshot)
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get services: {str(e)}")
+
+
+class InstanceWatcher:
+    """Polls the EC2 instances of a cluster incrementally.
+
+    Attributes:
+        key (str): Row field identifying an instance
+    """
+
+    key = 'InstanceId'
+
+    def __init__(self, ecs: ECSController, cluster_name: str, ssm: bool = False) -> None:
+        self.ecs = ecs
+        self.cluster_name = cluster_name
+        self.ssm = ssm
+        self._signatures: Dict[str, Tuple] = {}
+        self._ec2_instances: Dict[str, Dict[str, Any]] = {}
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Fetch the current instance rows.
+
+        Raises:
+            ECSCommandError: If instance retrieval fails
+        """
+        try:
+            container_instances = self.ecs._describe_container_instances(self.cluster_name)
+            signatures = {
+                instance['ec2InstanceId']: _instance_signature(instance)
+                for instance in container_instances
+            }
+            changed = [
+                instance_id for instance_id, signature in signatures.items()
+                if self._signatures.get(instance_id) != signature
+            ]
+            self._ec2_instances.update(self.ecs._describe_ec2_instances(changed))
+            self._signatures = signatures
+            # Ping status can change at any time, but costs one call per 50 nodes
+            ssm_statuses = self.ecs.get_ssm_statuses(list(signatures)) if self.ssm else None
+            return [
+                Instance.from_response(
+                    instance, self._ec2_instances.get(instance['ec2InstanceId'], {}), ssm_statuses
+                )
+                for instance in container_instances
+            ]
+        except Exception as e:
+            raise ECSCommandError(f"Failed to get EC2 instances: {str(e)}")
+
+
+def changed_keys(
+    previous: Optional[List[Dict[str, Any]]],
+    current: List[Dict[str, Any]],
+    key: str
+) -> Set[str]:
+    """Return the keys of rows that are new or differ from the previous poll."""
+    if previous is None:
+        return set()
+    before = {row[key]: row for row in previous}
+    return {row[key] for row in current if before.get(row[key]) != row}
+
+
+def watch(
+    poll: Callable[[], List[Dict[str, Any]]],
+    render: Callable[[List[Dict[str, Any]], Set[str]], Any],
+    key: str,
+    console: Any,
+    interval: float = DEFAULT_INTERVAL,
+    iterations: Optional[int] = None
+) -> None:
+    """Re-poll at an interval and render the rows in place.
+
+    Rows that are new or changed since the previous poll are passed to
+    ``render`` so they can be highlighted. Stops on Ctrl-C.
+
+    Args:
+        poll: Returns the current rows
+        render: Builds a renderable from the rows and the changed row keys
+        key: Row field identifying a row across polls
+        console: rich console to draw on
+        interval: Seconds between the end of a poll and the start of the next
+        iterations: Number of polls before returning; unlimited if None
+    """
+    from rich.live import Live
+
+    previous = None
+    count = 0
+    with Live(console=console, auto_refresh=False, transient=False) as live:
+        try:
+            while iterations is None or count < iterations:
+                rows = poll()
+                live.update(render(rows, changed_keys(previous, rows, key)), refresh=True)
+                previous = rows
+                count += 1
+                if iterations is None or count < iterations:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
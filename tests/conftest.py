@@ -22,4 +22,16 @@ def mock_aws_credentials():
         'AWS_SECURITY_TOKEN': 'testing',
         'AWS_SESSION_TOKEN': 'testing'
     }):
-        yield 
\ No newline at end of file
+        yield
+
+@pytest.fixture(autouse=True)
+def isolated_credential_cache(tmp_path):
+    """Keep cached assumed-role credentials out of the user's home directory."""
+    with patch('ecsctl.aws_client.CREDENTIALS_DIR', tmp_path / 'credentials'):
+        yield
+
+@pytest.fixture(autouse=True)
+def isolated_revision_store(tmp_path):
+    """Keep stored task definition revisions out of the user's home directory."""
+    with patch('ecsctl.cache.REVISIONS_DIR', tmp_path / 'revisions'):
+        yield
@@ -0,0 +1,134 @@
+"""Unit tests for the asyncio ECS controller."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+import pytest
+from unittest.mock import patch, MagicMock
+from ecsctl.async_controller import AsyncECSController
+from ecsctl.ecs_controller import ECSController
+from ecsctl.exceptions import ECSCommandError
+
+@pytest.fixture
+def async_controller():
+    """Create AsyncECSController wrapping a mocked ECSController."""
+    with patch('ecsctl.ecs_controller.AWSClient'), \
+         patch('boto3.Session'), \
+         patch('ecsctl.ecs_controller.ClusterConfig'):
+        controller = AsyncECSController(ECSController(), concurrency=4)
+        yield controller
+    controller.close()
+
+def test_get_services_across_clusters(async_controller):
+    """Test that services of several clusters are fetched concurrently."""
+    ecs_client = async_controller.controller.ecs_client
+    in_flight = {'current': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def tracked(response_factory):
+        def call(**kwargs):
+            with lock:
+                in_flight['current'] += 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['current'])
+            time.sleep(0.01)
+            with lock:
+                in_flight['current'] -= 1
+            return response_factory(**kwargs)
+        return call
+
+    ecs_client.list_services = MagicMock(side_effect=tracked(lambda cluster: {
+        'serviceArns': [f'{cluster}-service-{i}' for i in range(25)]
+    }))
+    ecs_client.describe_services = MagicMock(side_effect=tracked(lambda cluster, services: {
+        'services': [{
+            'serviceName': name,
+            'status': 'ACTIVE',
+            'taskDefinition': f'task-definition/{name}:1',
+            'desiredCount': 1,
+            'runningCount': 1,
+            'pendingCount': 0
+        } for name in services]
+    }))
+    ecs_client.list_tasks = MagicMock(side_effect=tracked(lambda cluster: {
+        'taskArns': [f'{cluster}/task/{i}' for i in range(25)]
+    }))
+    ecs_client.describe_tasks = MagicMock(side_effect=tracked(lambda cluster, tasks: {
+        'tasks': [{
+            'taskArn': arn,
+            'group': f"service:{cluster}-service-{arn.split('/')[-1]}",
+            'containerInstanceArn': f"{cluster}/container-instance/{int(arn.split('/')[-1]) % 3}"
+        } for arn in tasks]
+    }))
+    ecs_client.describe_container_instances = MagicMock(
+        side_effect=tracked(lambda cluster, containerInstances: {'containerInstances': [{
+            'containerInstanceArn': arn,
+            'ec2InstanceId': f"i-{arn.split('/')[-1]}"
+        } for arn in containerInstances]})
+    )
+
+    async def run():
+        return await asyncio.gather(
+            async_controller.get_services('prod'),
+            async_controller.get_services('staging')
+        )
+
+    prod, staging = asyncio.run(run())
+    assert [service['ServiceName'] for service in prod][:2] == ['prod-service-0', 'prod-service-1']
+    assert staging[4]['EC2Instances'] == 'i-1'
+    assert ecs_client.describe_container_instances.call_count == 2
+    assert 1 < in_flight['peak'] <= 4
+
+def test_get_clusters_failure(async_controller):
+    """Test that client errors surface as ECSCommandError."""
+    async_controller.controller.ecs_client.list_clusters = MagicMock(
+        side_effect=Exception('AccessDenied')
+    )
+    with pytest.raises(ECSCommandError):
+        asyncio.run(async_controller.get_clusters())
+
+def test_get_task_definitions_keeps_store_io_off_the_loop(async_controller):
+    """Test that the revision store is read and flushed on worker threads."""
+    ecs_client = async_controller.controller.ecs_client
+    ecs_client.list_task_definitions = MagicMock(return_value={
+        'taskDefinitionArns': ['task-definition/web:1', 'task-definition/web:2']
+    })
+    ecs_client.describe_task_definition = MagicMock(side_effect=lambda taskDefinition: {
+        'taskDefinition': {
+            'taskDefinitionArn': taskDefinition,
+            'family': 'web',
+            'revision': int(taskDefinition.split(':')[-1]),
+            'status': 'ACTIVE',
+            'registeredAt': datetime(2024, 1, 1)
+        }
+    })
+    threads = []
+    store = MagicMock()
+    store.get.side_effect = lambda arn: threads.append(threading.current_thread())
+    store.flush.side_effect = lambda: threads.append(threading.current_thread())
+    store.put.side_effect = lambda arn, row: threads.append(threading.current_thread())
+    async_controller.controller.revisions = store
+
+    rows = asyncio.run(async_controller.get_task_definitions())
+
+    assert [row['Revision'] for row in rows] == [1, 2]
+    assert store.put.call_count == 2
+    assert len(threads) == 5
+    assert threading.main_thread() not in threads
+
+def test_clients_are_created_off_the_loop(async_controller):
+    """Test that the wrapped controller's clients are first touched on worker threads."""
+    threads = []
+    controller = async_controller.controller
+    client = MagicMock()
+    client.list_clusters.return_value = {'clusterArns': ['arn:aws:ecs:region:account:cluster/prod']}
+
+    def create_client(service_name):
+        threads.append(threading.current_thread())
+        return client
+
+    with patch.object(type(controller), '_client', side_effect=create_client):
+        controller._clients = {}
+        assert asyncio.run(async_controller.get_clusters()) == ['prod']
+
+    assert threads and threading.main_thread() not in threads
@@ -1,9 +1,12 @@
 """Unit tests for AWS client authentication and session management."""
 
+import os
+import stat
 import pytest
 import boto3
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
-from ecsctl.aws_client import AWSClient
+from ecsctl.aws_client import AWSClient, CredentialCache
 from ecsctl.exceptions import AuthenticationError
 
 @pytest.fixture
@@ -46,4 +49,74 @@ def test_authenticate_failure(aws_client):
 
     with patch('boto3.Session', return_value=mock_session):
         with pytest.raises(AuthenticationError):
-            aws_client.authenticate('arn:aws:iam::123456789012:role/TestRole') 
\ No newline at end of file
+            aws_client.authenticate('arn:aws:iam::123456789012:role/TestRole')
+
+def _assume_role_response():
+    return {
+        'Credentials': {
+            'AccessKeyId': 'test-key',
+            'SecretAccessKey': 'test-secret',
+            'SessionToken': 'test-token',
+            'Expiration': datetime.now(timezone.utc) + timedelta(hours=1)
+        }
+    }
+
+def test_authenticate_reuses_cached_credentials(aws_client):
+    """Test that a second authentication skips the STS call."""
+    mock_sts = MagicMock()
+    mock_sts.assume_role.return_value = _assume_role_response()
+    mock_session = MagicMock()
+    mock_session.client.return_value = mock_sts
+    role_arn = 'arn:aws:iam::123456789012:role/TestRole'
+
+    with patch('ecsctl.aws_client.boto3.Session', return_value=mock_session) as session_class:
+        aws_client.authenticate(role_arn)
+        AWSClient(profile_name='test-profile').authenticate(role_arn)
+
+    mock_sts.assume_role.assert_called_once()
+    botocore_session = session_class.call_args.kwargs['botocore_session']
+    assert botocore_session.get_credentials().access_key == 'test-key'
+
+    cache = aws_client.credential_cache
+    key = cache.key(role_arn, 'test-profile', 'ap-southeast-1', 'AssumeRoleSession')
+    assert stat.S_IMODE(os.stat(cache._path(key)).st_mode) == 0o600
+
+def test_authenticate_without_credential_cache(aws_client):
+    """Test that disabling the cache assumes the role every time."""
+    mock_sts = MagicMock()
+    mock_sts.assume_role.return_value = _assume_role_response()
+    mock_session = MagicMock()
+    mock_session.client.return_value = mock_sts
+    aws_client.use_credential_cache = False
+
+    with patch('ecsctl.aws_client.boto3.Session', return_value=mock_session):
+        aws_client.authenticate('arn:aws:iam::123456789012:role/TestRole')
+        aws_client.authenticate('arn:aws:iam::123456789012:role/TestRole')
+
+    assert mock_sts.assume_role.call_count == 2
+    assert not aws_client.credential_cache.cache_dir.exists()
+
+def test_credential_cache_ignores_expiring_entries(tmp_path):
+    """Test that credentials close to expiry are not served."""
+    cache = CredentialCache(tmp_path)
+    cache.set('soon', {'expiry_time': (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()})
+    cache.set('later', {'expiry_time': (datetime.now(timezone.utc) + timedelta(minutes=50)).isoformat()})
+    assert cache.get('soon') is None
+    assert cache.get('later') is not None
+    assert cache.get('missing') is None
+
+def test_authenticate_survives_unwritable_credential_cache(aws_client, tmp_path):
+    """Test that a failing cache write does not fail an assumed role."""
+    mock_sts = MagicMock()
+    mock_sts.assume_role.return_value = _assume_role_response()
+    mock_session = MagicMock()
+    mock_session.client.return_value = mock_sts
+    blocker = tmp_path / 'credentials'
+    blocker.write_text('')
+    aws_client.credential_cache = CredentialCache(blocker)
+
+    with patch('ecsctl.aws_client.boto3.Session', return_value=mock_session) as session_class:
+        aws_client.authenticate('arn:aws:iam::123456789012:role/TestRole')
+
+    botocore_session = session_class.call_args.kwargs['botocore_session']
+    assert botocore_session.get_credentials().access_key == 'test-key'
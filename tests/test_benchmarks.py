@@ -0,0 +1,49 @@
+"""Unit tests for the in-process AWS fake and the scale benchmark."""
+
+import pytest
+from botocore.exceptions import ClientError
+from benchmarks import scale
+from benchmarks.fake_aws import FakeAWS
+
+@pytest.fixture
+def fake(monkeypatch):
+    """Create a small fake cluster without latency."""
+    monkeypatch.delenv('AWS_PROFILE')
+    return FakeAWS(services=25, tasks=120, hosts=12, revisions=2)
+
+def test_fake_pages_and_enforces_batch_limits(fake):
+    """Test that the fake pages list calls and rejects oversized batches."""
+    ecs = fake.session('ap-southeast-1').client('ecs')
+
+    page = ecs.list_services(cluster=fake.cluster_name, maxResults=10)
+    assert len(page['serviceArns']) == 10
+    assert 'nextToken' in page
+
+    arns = ecs.list_services(cluster=fake.cluster_name, maxResults=100)['serviceArns']
+    with pytest.raises(ClientError) as excinfo:
+        ecs.describe_services(cluster=fake.cluster_name, services=arns[:11])
+    assert excinfo.value.response['Error']['Code'] == 'InvalidParameterException'
+    assert fake.calls['DescribeServices'] == 1
+
+def test_controller_methods_stay_within_call_budgets(fake, tmp_path):
+    """Test every benchmark against the fake's call budget."""
+    sizes = {'services': 25, 'tasks': 120, 'hosts': 12, 'revisions': 2}
+    for benchmark in scale.BENCHMARKS:
+        ecs = scale.make_controller(fake, concurrency=4, store_dir=str(tmp_path / benchmark.name))
+        if benchmark.setup:
+            benchmark.setup(ecs, fake)
+        fake.reset_calls()
+        benchmark.call(ecs, fake)
+        assert fake.total_calls <= benchmark.max_calls(sizes), benchmark.name
+        assert not ecs.errors, benchmark.name
+
+def test_scale_main_fails_when_budget_exceeded(monkeypatch, capsys):
+    """Test that the runner exits non-zero when a call budget is exceeded."""
+    monkeypatch.delenv('AWS_PROFILE')
+    args = ['--services', '5', '--tasks', '10', '--hosts', '3', '--latency-ms', '0',
+            '--only', 'get_clusters']
+    assert scale.main(args) == 0
+
+    monkeypatch.setattr(scale.BENCHMARKS[0], 'max_calls', lambda sizes: 0)
+    assert scale.main(args) == 1
+    assert 'get_clusters: 1 calls > 0' in capsys.readouterr().err
@@ -0,0 +1,111 @@
+"""Unit tests for the on-disk resource cache."""
+
+import json
+import time
+import pytest
+from unittest.mock import MagicMock
+from ecsctl.cache import MemoryCache, ResourceCache, RevisionStore, account_key
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create ResourceCache rooted in a temporary directory."""
+    return ResourceCache('123456789012', 'ap-southeast-1', cache_dir=tmp_path,
+                         ttls={'services': 60}, max_stale=600)
+
+def _age(cache, kind, scope, seconds):
+    """Backdate an entry by rewriting its fetch time."""
+    path = cache._path(kind, scope)
+    data = json.loads(path.read_text())
+    data['fetched_at'] = time.time() - seconds
+    path.write_text(json.dumps(data))
+
+def test_fresh_entry_is_served_without_loading(cache):
+    """Test that a fresh entry skips the loader."""
+    loader = MagicMock(return_value=[{'ServiceName': 'web'}])
+    assert cache.fetch('services', 'prod', loader) == [{'ServiceName': 'web'}]
+    assert cache.fetch('services', 'prod', loader) == [{'ServiceName': 'web'}]
+    loader.assert_called_once()
+
+def test_refresh_always_loads(cache):
+    """Test that use_cached=False bypasses and refreshes the entry."""
+    loader = MagicMock(side_effect=[['old'], ['new']])
+    cache.fetch('services', 'prod', loader, use_cached=False)
+    assert cache.fetch('services', 'prod', loader, use_cached=False) == ['new']
+    assert cache.get('services', 'prod').value == ['new']
+
+def test_stale_entry_is_served_and_revalidated(cache):
+    """Test stale-while-revalidate behaviour."""
+    cache.set('services', 'prod', ['old'])
+    _age(cache, 'services', 'prod', 120)
+
+    assert cache.fetch('services', 'prod', lambda: ['new']) == ['old']
+    cache.wait()
+    assert not cache.revalidating
+    assert cache.get('services', 'prod').value == ['new']
+
+def test_expired_entry_is_reloaded(cache):
+    """Test that entries older than max_stale are not served."""
+    cache.set('services', 'prod', ['old'])
+    _age(cache, 'services', 'prod', 3600)
+    assert cache.fetch('services', 'prod', lambda: ['new']) == ['new']
+
+def test_keys_are_isolated(cache, tmp_path):
+    """Test that accounts, regions and scopes do not share entries."""
+    cache.set('services', 'prod', ['prod'])
+    other_region = ResourceCache('123456789012', 'us-east-1', cache_dir=tmp_path)
+    assert other_region.get('services', 'prod') is None
+    assert cache.get('services', 'staging') is None
+
+def test_memory_cache_never_serves_expired_results():
+    """Test that the shell's cache reloads after its TTL but keeps names for completion."""
+    cache = MemoryCache('123456789012', 'ap-southeast-1', ttl=10)
+    rows = [{'InstanceId': 'i-1'}]
+    assert cache.fetch('ec2:ssm', 'prod', lambda: rows) is rows
+    assert cache.fresh('ec2:ssm', 'prod') is rows
+
+    cache.get('ec2:ssm', 'prod').fetched_at -= 11
+    assert cache.fresh('ec2:ssm', 'prod') is None
+    assert cache.for_region('us-east-1').listings('ec2') == [rows]
+    assert cache.fetch('ec2:ssm', 'prod', lambda: ['new']) == ['new']
+    assert not cache.revalidating
+
+def test_account_key():
+    """Test deriving the account key from role ARN or profile."""
+    assert account_key('arn:aws:iam::123456789012:role/Admin', 'dev') == '123456789012'
+    assert account_key(None, 'dev') == 'dev'
+    assert account_key(None, None, 'AKIAFIRST').startswith('key-')
+    assert account_key(None, None, 'AKIAFIRST') != account_key(None, None, 'AKIASECOND')
+    assert account_key(None, None) is None
+
+def test_unknown_identity_is_not_cached(tmp_path):
+    """Test that listings are not stored when the caller's identity is unknown."""
+    cache = ResourceCache(None, 'ap-southeast-1', cache_dir=tmp_path)
+    assert cache.fetch('services', 'prod', lambda: ['web']) == ['web']
+    assert cache.get('services', 'prod') is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_selector_kinds_do_not_share_entries(tmp_path):
+    """Test that kinds differing only in escaped characters are stored apart."""
+    cache = ResourceCache('123456789012', 'ap-southeast-1', cache_dir=tmp_path)
+    cache.set('services:labels=env=a,team', 'prod', ['web'])
+    cache.set('services:labels=env=a_team', 'prod', ['worker'])
+    assert cache.fresh('services:labels=env=a,team', 'prod') == ['web']
+    assert cache.fresh('services:labels=env=a_team', 'prod') == ['worker']
+
+def test_filtered_kinds_share_base_ttl(tmp_path):
+    """Test that a filtered listing uses the TTL of its resource kind."""
+    cache = ResourceCache('123456789012', 'ap-southeast-1', cache_dir=tmp_path)
+    assert cache.ttl('containers:service=web') == cache.ttl('containers')
+
+def test_revision_store_persists_revisions(tmp_path):
+    """Test that stored revisions are served by later store instances."""
+    arn = 'arn:aws:ecs:ap-southeast-1:123456789012:task-definition/web-api:42'
+    store = RevisionStore('123456789012', 'ap-southeast-1', store_dir=tmp_path)
+    assert store.get(arn) is None
+    store.put(arn, {'Family': 'web-api', 'Revision': 42})
+    store.flush()
+
+    reopened = RevisionStore('123456789012', 'ap-southeast-1', store_dir=tmp_path)
+    assert reopened.get(arn) == {'Family': 'web-api', 'Revision': 42}
+    assert RevisionStore.family(arn) == 'web-api'
+    assert RevisionStore('123456789012', 'us-east-1', store_dir=tmp_path).get(arn) is None
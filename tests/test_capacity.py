@@ -0,0 +1,89 @@
+"""Unit tests for the cluster capacity aggregates."""
+
+import pytest
+from ecsctl.capacity import CPU, MEMORY, ClusterCapacity, parse_units, task_reservation
+from ecsctl.models import Task
+
+def _host(instance_id, registered, remaining, status='ACTIVE'):
+    return {
+        'ec2InstanceId': instance_id,
+        'status': status,
+        'runningTasksCount': 1,
+        'registeredResources': [
+            {'name': 'CPU', 'integerValue': registered[0]},
+            {'name': 'MEMORY', 'integerValue': registered[1]},
+            {'name': 'PORTS', 'stringSetValue': ['22']},
+        ],
+        'remainingResources': [
+            {'name': 'CPU', 'integerValue': remaining[0]},
+            {'name': 'MEMORY', 'integerValue': remaining[1]},
+        ],
+    }
+
+def _task(n, service, host, cpu=None, memory=None, containers=()):
+    return Task.from_response({
+        'taskArn': f'task/{n}',
+        'group': f'service:{service}' if service else 'family:batch',
+        'containerInstanceArn': host,
+        'cpu': cpu,
+        'memory': memory,
+        'containers': [{'name': name, 'lastStatus': 'RUNNING', 'cpu': c, 'memory': m}
+                       for name, c, m in containers],
+    })
+
+@pytest.fixture
+def capacity():
+    """Three hosts, one draining, and tasks of two services."""
+    return ClusterCapacity('prod', [
+        _host('i-1', (4096, 8192), (1024, 4096)),
+        _host('i-2', (4096, 8192), (3072, 2048)),
+        _host('i-3', (4096, 8192), (4096, 8192), status='DRAINING'),
+    ], [
+        _task(1, 'web', 'ci/1', cpu='1 vCPU', memory='2 GB'),
+        _task(2, 'web', 'ci/2', cpu='1024', memory='2048'),
+        _task(3, 'worker', 'ci/1', containers=[('a', 512, 1024), ('b', 'N/A', 'N/A')]),
+        _task(4, None, 'ci/1', cpu='256', memory='512'),
+    ])
+
+def test_parse_units():
+    """Test plain numbers, vCPU and GB values."""
+    assert parse_units('256', 1024) == 256
+    assert parse_units('0.25 vCPU', 1024) == 256
+    assert parse_units('4 GB', 1024) == 4096
+    assert parse_units(None, 1024) == 0
+    assert parse_units('N/A', 1) == 0
+
+def test_task_reservation_falls_back_to_containers():
+    """Test that tasks without a task-level size add up their containers."""
+    task = _task(1, 'web', 'ci/1', containers=[('a', 128, 256), ('b', 256, 'N/A')])
+    assert task_reservation(task) == (384, 256)
+
+def test_nodes_are_sorted_by_utilisation(capacity):
+    """Test per-host usage and sorting by CPU or memory utilisation."""
+    nodes = capacity.nodes()
+    assert [node['InstanceId'] for node in nodes] == ['i-1', 'i-2', 'i-3']
+    assert (nodes[0]['CpuUsed'], nodes[0]['CpuUtilization']) == (3072, 75.0)
+    assert [node['InstanceId'] for node in capacity.nodes('memory')] == ['i-2', 'i-1', 'i-3']
+    assert [node['InstanceId'] for node in capacity.nodes('name')] == ['i-1', 'i-2', 'i-3']
+    with pytest.raises(ValueError):
+        capacity.nodes('tasks')
+
+def test_services_add_up_their_tasks(capacity):
+    """Test per-service reservations and shares of the registered capacity."""
+    services = {service['ServiceName']: service for service in capacity.services()}
+    assert set(services) == {'web', 'worker'}
+    assert services['web'].as_dict() == {
+        'ServiceName': 'web', 'Tasks': 2, 'Hosts': 2, 'Cpu': 2048, 'CpuShare': 16.7,
+        'Memory': 4096, 'MemoryShare': 16.7
+    }
+    assert (services['worker']['Cpu'], services['worker']['Memory']) == (512, 1024)
+
+def test_summary_measures_fragmentation(capacity):
+    """Test that only active hosts count as free capacity."""
+    assert capacity.total_used(CPU) == 3072 + 1024
+    assert capacity.largest_free(CPU) == 3072
+    assert capacity.fragmentation(CPU) == 0.25
+    assert capacity.fragmentation(MEMORY) == pytest.approx(0.33)
+    cpu, memory = capacity.summary()
+    assert cpu['Utilization'] == pytest.approx(33.3)
+    assert ClusterCapacity('empty', []).fragmentation(CPU) == 0.0
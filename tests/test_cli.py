@@ -0,0 +1,190 @@
+"""Unit tests for command line start-up behaviour."""
+
+import json
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from click.testing import CliRunner
+from ecsctl import __version__
+from ecsctl.cli import cli
+
+def test_version_matches_pyproject():
+    """Test that the hard-coded version follows pyproject.toml."""
+    pyproject = Path(__file__).parent.parent / 'pyproject.toml'
+    with open(pyproject, 'rb') as f:
+        assert __version__ == tomllib.load(f)['tool']['poetry']['version']
+
+def test_version_option():
+    """Test that --version prints the package version."""
+    result = CliRunner().invoke(cli, ['--version'])
+    assert result.exit_code == 0
+    assert __version__ in result.output
+
+def test_cli_import_defers_heavy_modules():
+    """Test that loading the CLI does not import boto3, rich or tomli."""
+    code = (
+        "import sys, ecsctl.cli; "
+        "print(sorted(m for m in ('boto3', 'botocore', 'rich', 'tomli') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+def test_get_services_streams_ndjson():
+    """Test that -o ndjson prints rows from the streaming listing."""
+    ecs = MagicMock()
+    ecs.config.get_current_cluster.return_value = 'prod'
+    ecs.errors = []
+    ecs.cache.revalidating = False
+    ecs.iter_services.return_value = iter([{'ServiceName': 'web'}, {'ServiceName': 'api'}])
+
+    with patch('ecsctl.cli._controller', return_value=ecs):
+        result = CliRunner().invoke(cli, ['get', 'services', '-o', 'ndjson'])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['{"ServiceName": "web"}', '{"ServiceName": "api"}']
+    ecs.get_services.assert_not_called()
+
+def test_watch_rejects_streaming_output():
+    """Test that --watch can only redraw the table format."""
+    result = CliRunner().invoke(cli, ['get', 'ec2', '--watch', '-o', 'json'])
+    assert result.exit_code == 2
+    assert '--watch only supports' in result.output
+
+def test_get_containers_passes_filters():
+    """Test that get containers forwards its filters to the controller."""
+    ecs = MagicMock()
+    ecs.config.get_current_cluster.return_value = 'prod'
+    ecs.errors = []
+    ecs.cache.revalidating = False
+    ecs.iter_containers.return_value = iter([{'Name': 'app', 'TaskId': '1'}])
+
+    with patch('ecsctl.cli._controller', return_value=ecs):
+        result = CliRunner().invoke(cli, [
+            'get', 'containers', '--service', 'web', '--desired-status', 'stopped', '-o', 'tsv'
+        ])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['Name\tTaskId', 'app\t1']
+    ecs.iter_containers.assert_called_once_with(
+        'prod', service='web', desired_status='STOPPED', instance_id=None
+    )
+
+def test_get_services_passes_selectors():
+    """Test that selectors are parsed and passed on, and cached under their own kind."""
+    from ecsctl.selectors import Selector
+
+    ecs = MagicMock()
+    ecs.config.get_current_cluster.return_value = 'prod'
+    ecs.errors = []
+    ecs.cache.revalidating = False
+    ecs.cache.fetch.side_effect = lambda kind, scope, loader, use_cached: loader()
+    ecs.get_services.return_value = []
+
+    with patch('ecsctl.cli._controller', return_value=ecs):
+        result = CliRunner().invoke(cli, [
+            'get', 'services', '--field-selector', 'launchtype=EC2', '-l', 'team=payments', '-o', 'json'
+        ])
+
+    assert result.exit_code == 0
+    args, kwargs = ecs.get_services.call_args
+    assert args == ('prod',)
+    assert str(kwargs['fields']) == 'launchType=EC2'
+    assert isinstance(kwargs['labels'], Selector)
+    assert ecs.cache.fetch.call_args[0][0] == 'services:fields=launchType=EC2:labels=team=payments'
+
+def test_selectors_are_validated():
+    """Test that unknown fields and watching a selection are usage errors."""
+    result = CliRunner().invoke(cli, ['get', 'ec2', '--field-selector', 'color=red'])
+    assert result.exit_code == 2
+    assert "Unknown field 'color'" in result.output
+
+    result = CliRunner().invoke(cli, ['get', 'services', '--watch', '-l', 'team'])
+    assert result.exit_code == 2
+    assert '--watch cannot be combined' in result.output
+
+def test_top_nodes_prints_capacity():
+    """Test that top nodes takes one capacity snapshot without tasks."""
+    from ecsctl.capacity import ClusterCapacity
+
+    ecs = MagicMock()
+    ecs.config.get_current_cluster.return_value = 'prod'
+    ecs.errors = []
+    ecs.cache.revalidating = False
+    ecs.get_capacity.return_value = ClusterCapacity('prod', [{
+        'ec2InstanceId': 'i-1', 'status': 'ACTIVE', 'runningTasksCount': 2,
+        'registeredResources': [{'name': 'CPU', 'integerValue': 2048}, {'name': 'MEMORY', 'integerValue': 4096}],
+        'remainingResources': [{'name': 'CPU', 'integerValue': 512}, {'name': 'MEMORY', 'integerValue': 1024}],
+    }])
+
+    with patch('ecsctl.cli._controller', return_value=ecs):
+        result = CliRunner().invoke(cli, ['top', 'nodes', '--sort-by', 'memory', '-o', 'tsv'])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1].split('\t') == [
+        'i-1', 'ACTIVE', '2', '2048', '1536', '75.0', '4096', '3072', '75.0'
+    ]
+    ecs.get_capacity.assert_called_once_with('prod', tasks=False)
+
+def test_exec_starts_bash_session_without_probing():
+    """Test that exec checks the target once and starts bash directly."""
+    ecs = MagicMock()
+    ecs.config.get_current_cluster.return_value = 'prod'
+    ecs.check_exec_target.return_value = (True, True)
+    ecs.aws_client.profile_name = None
+    ecs.aws_client.region = 'ap-southeast-1'
+
+    with patch('ecsctl.cli._controller', return_value=ecs), \
+         patch('ecsctl.cli.subprocess.run') as run:
+        result = CliRunner().invoke(cli, ['exec', 'i-1'])
+
+    assert result.exit_code == 0
+    ecs.check_exec_target.assert_called_once_with('prod', 'i-1')
+    run.assert_called_once()
+    assert run.call_args.args[0][-2:] == ['--parameters', 'command=bash']
+
+def test_api_trace_is_written_at_exit(tmp_path, monkeypatch):
+    """Test that ECSCTL_API_TRACE instruments the controller and writes the trace."""
+    trace = tmp_path / 'trace.json'
+    monkeypatch.setenv('ECSCTL_API_TRACE', str(trace))
+
+    with patch('ecsctl.ecs_controller.ECSController') as controller_class:
+        ecs = controller_class.return_value
+        ecs.get_clusters.return_value = []
+        ecs.cache.fetch.side_effect = lambda kind, scope, loader, use_cached: loader()
+        ecs.errors = []
+        ecs.cache.revalidating = False
+        result = CliRunner().invoke(cli, ['get-clusters', '-o', 'json'])
+
+    assert result.exit_code == 0
+    assert controller_class.call_args.kwargs['profiler'] is not None
+    assert json.loads(trace.read_text()) == {'summary': {}, 'spans': []}
+
+def test_replay_passes_recording_to_controller(tmp_path):
+    """Test that --replay answers the controller's calls from the recording."""
+    with patch('ecsctl.ecs_controller.ECSController') as controller_class:
+        ecs = controller_class.return_value
+        ecs.get_clusters.return_value = []
+        ecs.cache.fetch.side_effect = lambda kind, scope, loader, use_cached: loader()
+        ecs.errors = []
+        ecs.cache.revalidating = False
+        result = CliRunner().invoke(cli, ['--replay', str(tmp_path), 'get-clusters', '-o', 'json'])
+
+    assert result.exit_code == 0
+    recording = controller_class.call_args.kwargs['recording']
+    assert recording.replay
+    assert recording.directory == tmp_path
+
+def test_record_and_replay_are_exclusive(tmp_path):
+    """Test that a run cannot both record and replay."""
+    result = CliRunner().invoke(cli, ['--record', str(tmp_path), '--replay', str(tmp_path), 'get-clusters'])
+    assert result.exit_code == 2
+    assert 'cannot be used together' in result.output
+
+def test_exec_cannot_be_replayed(tmp_path):
+    """Test that exec refuses to run from a recording."""
+    with patch('ecsctl.cli._controller') as controller:
+        result = CliRunner().invoke(cli, ['--replay', str(tmp_path), 'exec', 'i-1'])
+    assert result.exit_code == 2
+    controller.assert_not_called()
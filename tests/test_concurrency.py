@@ -0,0 +1,101 @@
+"""Unit tests for the concurrent fan-out executor."""
+
+import threading
+import time
+import pytest
+from ecsctl.concurrency import FanOutExecutor
+
+def test_map_preserves_input_order():
+    """Test that results follow input order, not completion order."""
+    executor = FanOutExecutor(max_workers=8)
+
+    def slow_square(n):
+        time.sleep((10 - n) * 0.005)
+        return n * n
+
+    assert executor.map(slow_square, range(10)) == [n * n for n in range(10)]
+
+def test_map_collects_item_errors():
+    """Test that failing items are recorded without aborting the others."""
+    executor = FanOutExecutor(max_workers=4)
+
+    def describe(n):
+        if n % 3 == 0:
+            raise RuntimeError(f'boom {n}')
+        return n
+
+    assert executor.map(describe, range(7), label='describe') == [1, 2, 4, 5]
+    assert [error.item for error in executor.errors] == [0, 3, 6]
+    assert str(executor.errors[0]) == 'describe failed for 0: boom 0'
+
+def test_map_raises_when_every_item_fails():
+    """Test that a systemic failure is raised instead of collected."""
+    executor = FanOutExecutor(max_workers=2)
+
+    def denied(n):
+        raise PermissionError('AccessDenied')
+
+    with pytest.raises(PermissionError):
+        executor.map(denied, [1, 2])
+    assert executor.errors == []
+
+def test_invalid_worker_count():
+    """Test that a worker count below one is rejected."""
+    with pytest.raises(ValueError):
+        FanOutExecutor(max_workers=0)
+
+def test_imap_consumes_items_lazily():
+    """Test that imap yields early results before the input is exhausted."""
+    executor = FanOutExecutor(max_workers=2)
+    pulled = []
+
+    def items():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    results = executor.imap(lambda n: n * 2, items())
+    assert next(results) == 0
+    results.close()
+    assert len(pulled) <= 4
+
+def test_imap_preserves_order_and_collects_errors():
+    """Test that imap keeps input order and records failed items."""
+    executor = FanOutExecutor(max_workers=4)
+
+    def describe(n):
+        time.sleep((5 - n) * 0.002)
+        if n == 2:
+            raise RuntimeError('boom')
+        return n
+
+    assert list(executor.imap(describe, iter(range(5)), label='describe')) == [0, 1, 3, 4]
+    assert [error.item for error in executor.errors] == [2]
+
+def test_nested_fan_outs_share_the_worker_limit():
+    """Test that calls made from inside a fan-out do not exceed max_workers."""
+    executor = FanOutExecutor(max_workers=3)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def describe(n):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.002)
+        with lock:
+            in_flight -= 1
+        return n
+
+    def resolve(batch):
+        return sum(executor.map(describe, range(batch * 4, batch * 4 + 4)))
+
+    def fetch(cluster):
+        return sum(executor.imap(resolve, iter(range(3))))
+
+    results = executor.imap(fetch, iter(range(6)))
+    # Consume while also fanning out from the consuming thread
+    totals = [total + sum(executor.map(describe, range(4))) for total in results]
+    assert totals == [72] * 6
+    assert 1 < peak <= 3
@@ -0,0 +1,84 @@
+"""Unit tests for the long-lived daemon and command forwarding."""
+
+import io
+import json
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from ecsctl.daemon import SOCKET_ENV, DaemonServer, forward, forwardable, stop
+
+@pytest.fixture
+def socket_file(tmp_path, monkeypatch):
+    """Point the CLI at a socket in a temporary directory."""
+    path = tmp_path / 'daemon.sock'
+    monkeypatch.setenv(SOCKET_ENV, str(path))
+    monkeypatch.delenv('ECSCTL_NO_DAEMON', raising=False)
+    return path
+
+@pytest.fixture
+def daemon(socket_file):
+    """Serve commands from a thread until stopped."""
+    server = DaemonServer(socket_file, idle_timeout=0)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    yield server
+    stop(socket_file)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not socket_file.exists()
+
+def run(argv):
+    """Forward a command and return its exit code, stdout and stderr."""
+    stdout, stderr = io.BytesIO(), io.BytesIO()
+    code = forward(argv, stdout, stderr)
+    return code, stdout.getvalue().decode(), stderr.getvalue().decode()
+
+def test_forwardable_keeps_terminal_commands_local():
+    """Test that only commands not attached to the terminal are forwarded."""
+    assert forwardable(['get', 'services', '-o', 'json'])
+    assert forwardable(['--concurrency', '4', 'get-clusters'])
+    assert not forwardable(['--replay', 'exec', 'exec', 'i-1'])
+    assert not forwardable(['exec', 'i-1'])
+    assert not forwardable(['get', 'ec2', '--watch'])
+    assert not forwardable(['daemon', '--stop'])
+    assert not forwardable(['--version'])
+
+def test_forward_falls_back_without_daemon(socket_file):
+    """Test that commands run in-process when no daemon answers."""
+    assert run(['get-clusters']) == (None, '', '')
+    # A socket file left behind by a daemon that was killed
+    socket_file.touch()
+    assert run(['get-clusters']) == (None, '', '')
+    assert not stop(socket_file)
+
+def test_daemon_reuses_a_warm_controller(daemon):
+    """Test that forwarded commands share one controller and keep exit codes."""
+    ecs = MagicMock()
+    ecs.errors = []
+    ecs.cache.revalidating = False
+    ecs.cache.fetch.side_effect = lambda kind, scope, loader, use_cached: loader()
+    ecs.get_clusters.return_value = ['prod', 'batch']
+    ecs.config.get_current_cluster.return_value = 'prod'
+
+    with patch('ecsctl.ecs_controller.ECSController', return_value=ecs) as controller_class:
+        first = run(['get-clusters', '-o', 'json'])
+        second = run(['get-clusters', '-o', 'json'])
+        ecs.config.get_current_cluster.return_value = None
+        failed = run(['get', 'services'])
+
+    assert first == second
+    assert first[0] == 0
+    assert json.loads(first[1]) == [
+        {'ClusterName': 'prod', 'Current': True}, {'ClusterName': 'batch', 'Current': False}
+    ]
+    assert failed == (1, '', "Error: No cluster selected. Use 'ecsctl use-cluster' first.\n")
+    controller_class.assert_called_once()
+    assert ecs.begin_command.call_count == 2
+    assert len(daemon.pool) == 1
+
+def test_second_daemon_is_refused(daemon, socket_file):
+    """Test that a running daemon keeps its socket."""
+    from ecsctl.exceptions import ECSCommandError
+
+    with pytest.raises(ECSCommandError):
+        DaemonServer(socket_file)
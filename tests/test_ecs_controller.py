@@ -12,7 +12,7 @@ def ecs_controller():
     with patch('ecsctl.ecs_controller.AWSClient'), \
          patch('boto3.Session'), \
          patch('ecsctl.ecs_controller.ClusterConfig'):
-        return ECSController()
+        yield ECSController()
 
 def test_get_clusters(ecs_controller):
     """Test retrieving ECS clusters."""
@@ -43,6 +43,7 @@ def test_get_ec2_instances(ecs_controller):
     mock_ec2_response = {
         'Reservations': [{
             'Instances': [{
+                'InstanceId': 'i-1234567890',
                 'InstanceType': 't3.micro',
                 'State': {'Name': 'running'}
             }]
@@ -62,4 +63,588 @@ def test_get_ec2_instances(ecs_controller):
     instances = ecs_controller.get_ec2_instances('test-cluster')
     assert len(instances) == 1
     assert instances[0]['InstanceId'] == 'i-1234567890'
-    assert instances[0]['InstanceType'] == 't3.micro' 
\ No newline at end of file
+    assert instances[0]['InstanceType'] == 't3.micro'
+
+def test_get_ec2_instances_batches_large_clusters(ecs_controller):
+    """Test that instance resolution is paginated and batched, not per node."""
+    arns = [f'arn:aws:ecs:region:account:container-instance/{i}' for i in range(250)]
+    pages = [
+        {'containerInstanceArns': arns[:150], 'nextToken': 'page-2'},
+        {'containerInstanceArns': arns[150:]}
+    ]
+
+    def describe_container_instances(cluster, containerInstances):
+        return {'containerInstances': [{
+            'ec2InstanceId': f"i-{arn.split('/')[-1]}",
+            'status': 'ACTIVE',
+            'runningTasksCount': 1
+        } for arn in containerInstances]}
+
+    def describe_instances(InstanceIds):
+        return {'Reservations': [{'Instances': [{
+            'InstanceId': instance_id,
+            'InstanceType': 'm5.large',
+            'State': {'Name': 'running'}
+        } for instance_id in InstanceIds]}]}
+
+    ecs_controller.ecs_client.list_container_instances = MagicMock(side_effect=pages)
+    ecs_controller.ecs_client.describe_container_instances = MagicMock(
+        side_effect=describe_container_instances
+    )
+    ecs_controller.ec2_client.describe_instances = MagicMock(side_effect=describe_instances)
+
+    instances = ecs_controller.get_ec2_instances('test-cluster')
+    assert len(instances) == 250
+    assert instances[-1]['InstanceId'] == 'i-249'
+    assert instances[-1]['InstanceType'] == 'm5.large'
+    assert ecs_controller.ecs_client.list_container_instances.call_count == 2
+    assert ecs_controller.ecs_client.list_container_instances.call_args.kwargs['nextToken'] == 'page-2'
+    assert ecs_controller.ecs_client.describe_container_instances.call_count == 3
+    assert ecs_controller.ec2_client.describe_instances.call_count == 3
+
+def test_iter_containers_streams_before_listing_completes(ecs_controller):
+    """Test that container rows are yielded before later task pages are listed."""
+    pages = [
+        {'taskArns': [f'task/{i}' for i in range(100)], 'nextToken': 'page-2'},
+        {'taskArns': [f'task/{i}' for i in range(100, 150)]}
+    ]
+    ecs_controller.ecs_client.list_tasks = MagicMock(side_effect=pages)
+    ecs_controller.ecs_client.describe_tasks = MagicMock(
+        side_effect=lambda cluster, tasks: {'tasks': [{
+            'taskArn': arn,
+            'createdAt': datetime(2024, 1, 1),
+            'containers': [{'name': 'app', 'lastStatus': 'RUNNING'}]
+        } for arn in tasks]}
+    )
+
+    rows = ecs_controller.iter_containers('test-cluster')
+    first = next(rows)
+    assert first['TaskId'] == '0'
+    remaining = list(rows)
+    assert len(remaining) == 149
+    assert ecs_controller.ecs_client.list_tasks.call_args_list[0].kwargs['maxResults'] == 100
+    assert ecs_controller.ecs_client.describe_tasks.call_count == 2
+
+def test_get_containers_pushes_filters_into_list_tasks(ecs_controller):
+    """Test that container filters are applied server-side by list_tasks."""
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(
+        return_value={'containerInstanceArns': ['container-instance/abc']}
+    )
+    client.list_tasks = MagicMock(return_value={'taskArns': ['task/1']})
+    client.describe_tasks = MagicMock(return_value={'tasks': [{
+        'taskArn': 'task/1',
+        'containerInstanceArn': 'container-instance/abc',
+        'createdAt': datetime(2024, 1, 1),
+        'containers': [{'name': 'app', 'lastStatus': 'STOPPED'}]
+    }]})
+    client.describe_container_instances = MagicMock(return_value={'containerInstances': [
+        {'containerInstanceArn': 'container-instance/abc', 'ec2InstanceId': 'i-123'}
+    ]})
+
+    containers = ecs_controller.get_containers(
+        'test-cluster', service='web', desired_status='STOPPED', instance_id='i-123'
+    )
+
+    assert containers[0]['EC2Instance'] == 'i-123'
+    assert client.list_container_instances.call_args.kwargs['filter'] == 'ec2InstanceId == i-123'
+    list_kwargs = client.list_tasks.call_args.kwargs
+    assert list_kwargs['serviceName'] == 'web'
+    assert list_kwargs['desiredStatus'] == 'STOPPED'
+    assert list_kwargs['containerInstance'] == 'container-instance/abc'
+    client.describe_container_instances.assert_called_once()
+
+def test_get_containers_on_unknown_instance_is_empty(ecs_controller):
+    """Test that an instance outside the cluster lists no tasks."""
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': []})
+    client.list_tasks = MagicMock()
+
+    assert ecs_controller.get_containers('test-cluster', instance_id='i-404') == []
+    client.list_tasks.assert_not_called()
+
+def test_get_containers_never_puts_unsafe_instance_ids_into_a_query(ecs_controller):
+    """Test that an --instance value that is not a plain token is matched locally."""
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': ['container-instance/x']})
+    client.list_tasks = MagicMock()
+
+    assert ecs_controller.get_containers('test-cluster', instance_id='i-1 or ec2InstanceId exists') == []
+    client.list_container_instances.assert_not_called()
+    client.list_tasks.assert_not_called()
+
+def test_instance_field_selector_is_not_injected_into_the_index(ecs_controller):
+    """Test that an instance field value neither reaches a query nor seeds the index."""
+    from ecsctl.selectors import TASK_FIELDS, Selector
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': ['container-instance/x']})
+    client.list_tasks = MagicMock()
+
+    fields = Selector.parse('instance=i-1 or ec2InstanceId exists', TASK_FIELDS)
+    assert ecs_controller.get_containers('test-cluster', fields=fields) == []
+    client.list_container_instances.assert_not_called()
+
+    client.list_tasks = MagicMock(return_value={'taskArns': []})
+    ecs_controller.get_containers('test-cluster', fields=Selector.parse('instance=i-1', TASK_FIELDS))
+    assert client.list_container_instances.call_args.kwargs['filter'] == 'ec2InstanceId == i-1'
+    assert 'container-instance/x' not in ecs_controller.instance_index('test-cluster')
+
+def test_get_services_uses_cluster_task_snapshot(ecs_controller):
+    """Test that services are built from one cluster-wide, batched task listing."""
+    services = [f'service-{i}' for i in range(150)]
+    task_arns = [f'task/{i}' for i in range(2000)]
+    ecs_controller.ecs_client.list_services = MagicMock(side_effect=[
+        {'serviceArns': services[:100], 'nextToken': 'services-2'},
+        {'serviceArns': services[100:]}
+    ])
+    ecs_controller.ecs_client.describe_services = MagicMock(side_effect=lambda cluster, services: {
+        'services': [{
+            'serviceName': name,
+            'status': 'ACTIVE',
+            'taskDefinition': f'arn:aws:ecs:region:account:task-definition/{name}:1',
+            'desiredCount': 2,
+            'runningCount': 2,
+            'pendingCount': 0
+        } for name in services]
+    })
+    ecs_controller.ecs_client.list_tasks = MagicMock(side_effect=[
+        {'taskArns': task_arns[i:i + 100], 'nextToken': f'tasks-{i}'}
+        for i in range(0, 1900, 100)
+    ] + [{'taskArns': task_arns[1900:]}])
+    ecs_controller.ecs_client.describe_tasks = MagicMock(side_effect=lambda cluster, tasks: {
+        'tasks': [{
+            'taskArn': arn,
+            'group': f"service:service-{int(arn.split('/')[-1]) % 150}",
+            'containerInstanceArn': f"container-instance/{int(arn.split('/')[-1]) % 40}"
+        } for arn in tasks]
+    })
+    ecs_controller.ecs_client.describe_container_instances = MagicMock(
+        side_effect=lambda cluster, containerInstances: {'containerInstances': [{
+            'containerInstanceArn': arn,
+            'ec2InstanceId': f"i-{arn.split('/')[-1]}"
+        } for arn in containerInstances]}
+    )
+
+    result = ecs_controller.get_services('test-cluster')
+    assert len(result) == 150
+    assert result[0]['EC2Instances'].startswith('i-0, ')
+    assert ecs_controller.ecs_client.describe_services.call_count == 15
+    assert ecs_controller.ecs_client.list_tasks.call_count == 20
+    assert all('serviceName' not in call.kwargs
+               for call in ecs_controller.ecs_client.list_tasks.call_args_list)
+    assert ecs_controller.ecs_client.describe_tasks.call_count == 20
+    ecs_controller.ecs_client.describe_container_instances.assert_called_once()
+
+def _task_definition(arn):
+    family, revision = arn.split('/')[-1].split(':')
+    return {'taskDefinition': {
+        'taskDefinitionArn': arn,
+        'family': family,
+        'revision': int(revision),
+        'status': 'ACTIVE',
+        'registeredAt': datetime(2024, 1, 1)
+    }}
+
+def test_get_task_definitions_describes_each_revision_once(ecs_controller):
+    """Test that every page is listed and stored revisions are not described again."""
+    arns = [f'arn:aws:ecs:region:account:task-definition/web:{i}' for i in range(1, 151)]
+    client = ecs_controller.ecs_client
+    client.list_task_definitions = MagicMock(side_effect=lambda **kwargs: (
+        {'taskDefinitionArns': arns[100:]} if kwargs.get('nextToken')
+        else {'taskDefinitionArns': arns[:100], 'nextToken': 'page-2'}
+    ))
+    client.describe_task_definition = MagicMock(
+        side_effect=lambda taskDefinition: _task_definition(taskDefinition)
+    )
+
+    first = ecs_controller.get_task_definitions('web')
+    second = ecs_controller.get_task_definitions('web')
+
+    assert len(first) == 150
+    assert first == second
+    assert client.describe_task_definition.call_count == 150
+
+def test_get_task_definitions_reports_deregistered_stored_revisions(ecs_controller):
+    """Test that a stored revision takes its status from the listing, not the store."""
+    from ecsctl.selectors import TASK_DEFINITION_FIELDS, Selector
+    arn = 'arn:aws:ecs:region:account:task-definition/web:1'
+    client = ecs_controller.ecs_client
+    client.list_task_definitions = MagicMock(return_value={'taskDefinitionArns': [arn]})
+    client.describe_task_definition = MagicMock(
+        side_effect=lambda taskDefinition: _task_definition(taskDefinition)
+    )
+    assert ecs_controller.get_task_definitions()[0]['Status'] == 'ACTIVE'
+    assert 'Status' not in ecs_controller.revisions.get(arn)
+
+    # The revision is deregistered and now only listed as INACTIVE
+    client.list_task_definitions = MagicMock(side_effect=lambda **kwargs: {
+        'taskDefinitionArns': [arn] if kwargs.get('status') == 'INACTIVE' else []
+    })
+    rows = ecs_controller.get_task_definitions(
+        fields=Selector.parse('status=inactive', TASK_DEFINITION_FIELDS)
+    )
+
+    assert [(row['Revision'], row['Status']) for row in rows] == [(1, 'INACTIVE')]
+    assert ecs_controller.get_task_definitions() == []
+    assert client.describe_task_definition.call_count == 1
+
+def test_get_task_definitions_latest_describes_families(ecs_controller):
+    """Test that --latest describes one revision per active family."""
+    client = ecs_controller.ecs_client
+    client.list_task_definition_families = MagicMock(return_value={'families': ['api', 'web']})
+    client.list_task_definitions = MagicMock()
+    client.describe_task_definition = MagicMock(side_effect=lambda taskDefinition: _task_definition(
+        f'arn:aws:ecs:region:account:task-definition/{taskDefinition}:7'
+    ))
+
+    rows = ecs_controller.get_task_definitions(latest=True)
+
+    assert [(row['Family'], row['Revision']) for row in rows] == [('api', 7), ('web', 7)]
+    assert client.list_task_definition_families.call_args.kwargs['status'] == 'ACTIVE'
+    client.list_task_definitions.assert_not_called()
+
+def test_get_ssm_statuses_uses_bulk_filtered_calls(ecs_controller):
+    """Test that SSM status of many instances takes one call per 50 instances."""
+    instance_ids = [f'i-{n}' for n in range(120)]
+
+    def describe_instance_information(Filters, MaxResults):
+        return {'InstanceInformationList': [
+            {'InstanceId': instance_id, 'PingStatus': 'Online'}
+            for instance_id in Filters[0]['Values'] if instance_id != 'i-7'
+        ]}
+
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(
+        side_effect=describe_instance_information
+    )
+
+    statuses = ecs_controller.get_ssm_statuses(instance_ids + ['i-1'])
+
+    assert len(statuses) == 120
+    assert statuses['i-1'] == 'Online'
+    assert statuses['i-7'] == 'NotRegistered'
+    assert ecs_controller.ssm_client.describe_instance_information.call_count == 3
+
+def test_get_ssm_statuses_marks_failed_batches_unknown(ecs_controller):
+    """Test that instances of a failed batch are not reported as unregistered."""
+    instance_ids = [f'i-{n}' for n in range(100)]
+
+    def describe_instance_information(Filters, MaxResults):
+        if 'i-60' in Filters[0]['Values']:
+            raise RuntimeError('Throttling')
+        return {'InstanceInformationList': [
+            {'InstanceId': instance_id, 'PingStatus': 'Online'}
+            for instance_id in Filters[0]['Values'] if instance_id != 'i-7'
+        ]}
+
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(
+        side_effect=describe_instance_information
+    )
+
+    statuses = ecs_controller.get_ssm_statuses(instance_ids)
+
+    assert statuses['i-7'] == 'NotRegistered'
+    assert statuses['i-60'] == 'Unknown'
+    assert statuses['i-99'] == 'Unknown'
+    assert len(ecs_controller.errors) == 1
+
+def test_get_ec2_instances_with_ssm_column(ecs_controller):
+    """Test that --ssm adds the ping status of each instance."""
+    ecs_controller.ecs_client.list_container_instances = MagicMock(
+        return_value={'containerInstanceArns': ['container-instance/1']}
+    )
+    ecs_controller.ecs_client.describe_container_instances = MagicMock(return_value={
+        'containerInstances': [{
+            'containerInstanceArn': 'container-instance/1',
+            'ec2InstanceId': 'i-1',
+            'status': 'ACTIVE',
+            'runningTasksCount': 0
+        }]
+    })
+    ecs_controller.ec2_client.describe_instances = MagicMock(return_value={'Reservations': []})
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(return_value={
+        'InstanceInformationList': [{'InstanceId': 'i-1', 'PingStatus': 'ConnectionLost'}]
+    })
+
+    assert 'SSM' not in ecs_controller.get_ec2_instances('test-cluster')[0]
+    assert ecs_controller.get_ec2_instances('test-cluster', ssm=True)[0]['SSM'] == 'ConnectionLost'
+
+def test_get_ec2_instances_survives_denied_ssm(ecs_controller):
+    """Test that a denied SSM lookup shows Unknown instead of failing the listing."""
+    ecs_controller.ecs_client.list_container_instances = MagicMock(
+        return_value={'containerInstanceArns': ['container-instance/1', 'container-instance/2']}
+    )
+    ecs_controller.ecs_client.describe_container_instances = MagicMock(side_effect=lambda cluster, containerInstances: {
+        'containerInstances': [{
+            'containerInstanceArn': arn,
+            'ec2InstanceId': f"i-{arn.split('/')[-1]}",
+            'status': 'ACTIVE',
+            'runningTasksCount': 0
+        } for arn in containerInstances]
+    })
+    ecs_controller.ec2_client.describe_instances = MagicMock(return_value={'Reservations': []})
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(
+        side_effect=Exception('AccessDenied')
+    )
+
+    instances = ecs_controller.get_ec2_instances('test-cluster', ssm=True)
+
+    assert [(instance['InstanceId'], instance['SSM']) for instance in instances] == [
+        ('i-1', 'Unknown'), ('i-2', 'Unknown')
+    ]
+    assert [str(error.error) for error in ecs_controller.errors] == ['AccessDenied']
+
+def test_check_exec_target_uses_targeted_lookup(ecs_controller):
+    """Test that exec checks one instance without scanning the cluster."""
+    ecs_controller.ecs_client.list_container_instances = MagicMock(
+        return_value={'containerInstanceArns': ['container-instance/1']}
+    )
+    ecs_controller.ecs_client.describe_container_instances = MagicMock()
+    ecs_controller.ec2_client.describe_instances = MagicMock()
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(return_value={
+        'InstanceInformationList': [{'InstanceId': 'i-1', 'PingStatus': 'Online'}]
+    })
+
+    assert ecs_controller.check_exec_target('test-cluster', 'i-1') == (True, True)
+    ecs_controller.ecs_client.list_container_instances.assert_called_once_with(
+        cluster='test-cluster', filter='ec2InstanceId == i-1'
+    )
+    ecs_controller.ecs_client.describe_container_instances.assert_not_called()
+    ecs_controller.ec2_client.describe_instances.assert_not_called()
+
+def test_clients_are_created_on_first_use():
+    """Test that only the clients a command uses are created."""
+    with patch('ecsctl.ecs_controller.AWSClient'), \
+         patch('boto3.Session') as session_class, \
+         patch('ecsctl.ecs_controller.ClusterConfig'):
+        controller = ECSController()
+        session_class.assert_not_called()
+
+        controller.ecs_client.list_clusters.return_value = {'clusterArns': []}
+        controller.get_clusters()
+        session = session_class.return_value
+        session.client.assert_called_once_with('ecs', config=controller.client_config)
+        assert controller.ecs_client is controller.ecs_client
+        assert session_class.call_count == 1
+
+def test_iterators_stop_api_calls_on_early_exit(ecs_controller):
+    """Test that the public iterators list and describe only what is consumed."""
+    ecs_controller.executor.max_workers = 1
+    client = ecs_controller.ecs_client
+    client.list_clusters = MagicMock(side_effect=[
+        {'clusterArns': ['cluster/a'], 'nextToken': 'page-2'}, {'clusterArns': ['cluster/b']}
+    ])
+    client.list_services = MagicMock(side_effect=lambda **kwargs: {
+        'serviceArns': [f'service/{i}' for i in range(100)], 'nextToken': 'more'
+    })
+    client.describe_services = MagicMock(side_effect=lambda cluster, services: {'services': [{
+        'serviceName': arn.split('/')[-1], 'status': 'ACTIVE', 'taskDefinition': 'web:1',
+        'desiredCount': 1, 'runningCount': 1, 'pendingCount': 0
+    } for arn in services]})
+    client.list_tasks = MagicMock(side_effect=lambda **kwargs: {
+        'taskArns': [f'task/{i}' for i in range(100)], 'nextToken': 'more'
+    })
+    client.describe_tasks = MagicMock(side_effect=lambda cluster, tasks: {
+        'tasks': [{'taskArn': arn, 'group': 'service:web'} for arn in tasks]
+    })
+
+    assert next(ecs_controller.iter_clusters()) == 'a'
+    assert client.list_clusters.call_count == 1
+
+    services = ecs_controller.iter_services('prod', ec2_instances=False)
+    assert next(s for s in services if s.name == '12').ec2_instances == ''
+    services.close()
+    assert client.list_services.call_count == 1
+    assert client.describe_services.call_count == 2
+    client.list_tasks.assert_not_called()
+
+    tasks = ecs_controller.iter_tasks('prod', service='web')
+    assert next(tasks).service_name == 'web'
+    tasks.close()
+    assert client.list_tasks.call_count == 1
+    assert client.list_tasks.call_args.kwargs['serviceName'] == 'web'
+    assert client.describe_tasks.call_count == 1
+
+def test_iterators_raise_command_errors(ecs_controller):
+    """Test that listing failures surface as ECSCommandError from the iterators."""
+    ecs_controller.ecs_client.list_tasks = MagicMock(side_effect=RuntimeError('AccessDenied'))
+    with pytest.raises(ECSCommandError, match='Failed to get tasks: AccessDenied'):
+        next(ecs_controller.iter_tasks('prod'))
+
+def test_get_ec2_instances_pushes_field_selector_into_listing(ecs_controller):
+    """Test that instance fields are filtered by list_container_instances and checked locally."""
+    from ecsctl.selectors import INSTANCE_FIELDS, Selector
+
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': ['ci/1', 'ci/2']})
+    client.describe_container_instances = MagicMock(return_value={'containerInstances': [
+        {'containerInstanceArn': f'ci/{n}', 'ec2InstanceId': f'i-{n}', 'status': 'ACTIVE',
+         'runningTasksCount': 1}
+        for n in (1, 2)
+    ]})
+    ecs_controller.ec2_client.describe_instances = MagicMock(return_value={'Reservations': [{'Instances': [
+        {'InstanceId': 'i-1', 'InstanceType': 't3.large', 'State': {'Name': 'running'},
+         'Tags': [{'Key': 'pool', 'Value': 'web'}]},
+        {'InstanceId': 'i-2', 'InstanceType': 't3.large', 'State': {'Name': 'stopped'},
+         'Tags': [{'Key': 'pool', 'Value': 'web'}]},
+    ]}]})
+    ecs_controller.ssm_client.describe_instance_information = MagicMock(
+        return_value={'InstanceInformationList': []}
+    )
+
+    instances = ecs_controller.get_ec2_instances(
+        'test-cluster', ssm=True,
+        fields=Selector.parse('status=ACTIVE,instanceType=t3.large,state=running', INSTANCE_FIELDS),
+        labels=Selector.parse('pool=web')
+    )
+
+    assert [instance['InstanceId'] for instance in instances] == ['i-1']
+    list_kwargs = client.list_container_instances.call_args.kwargs
+    assert list_kwargs['status'] == 'ACTIVE'
+    assert list_kwargs['filter'] == 'attribute:ecs.instance-type == t3.large'
+    # Only the instances kept are looked up in SSM
+    ssm_filters = ecs_controller.ssm_client.describe_instance_information.call_args.kwargs['Filters']
+    assert ssm_filters[0]['Values'] == ['i-1']
+
+def test_instance_selectors_push_down_only_safe_values(ecs_controller):
+    """Test that unsafe query values and unknown statuses are only matched locally."""
+    from ecsctl.selectors import INSTANCE_FIELDS, Selector
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': []})
+
+    ecs_controller.get_ec2_instances('test-cluster', fields=Selector.parse(
+        'status=active,instanceType=t3.large or attribute:ecs.os-type exists,availabilityZone=us-east-1a',
+        INSTANCE_FIELDS
+    ))
+    list_kwargs = client.list_container_instances.call_args.kwargs
+    assert list_kwargs['status'] == 'ACTIVE'
+    assert list_kwargs['filter'] == 'attribute:ecs.availability-zone == us-east-1a'
+
+    ecs_controller.get_ec2_instances('test-cluster', fields=Selector.parse('status=bogus', INSTANCE_FIELDS))
+    assert 'status' not in client.list_container_instances.call_args.kwargs
+
+def _service(name, tags=()):
+    return {
+        'serviceArn': f'service/{name}',
+        'serviceName': name,
+        'status': 'ACTIVE',
+        'taskDefinition': f'arn:aws:ecs:region:account:task-definition/{name}:1',
+        'launchType': 'EC2',
+        'desiredCount': 1,
+        'runningCount': 1,
+        'pendingCount': 0,
+        'tags': [{'key': key, 'value': value} for key, value in tags],
+    }
+
+def test_get_services_by_name_skips_the_cluster_listing(ecs_controller):
+    """Test that a name selector describes one service and lists only its tasks."""
+    from ecsctl.selectors import SERVICE_FIELDS, Selector
+
+    client = ecs_controller.ecs_client
+    client.list_services = MagicMock()
+    client.describe_services = MagicMock(return_value={'services': [_service('web')]})
+    client.list_tasks = MagicMock(return_value={'taskArns': ['task/1']})
+    client.describe_tasks = MagicMock(return_value={'tasks': [
+        {'taskArn': 'task/1', 'group': 'service:web', 'containerInstanceArn': 'ci/1'}
+    ]})
+    client.describe_container_instances = MagicMock(return_value={'containerInstances': [
+        {'containerInstanceArn': 'ci/1', 'ec2InstanceId': 'i-1'}
+    ]})
+
+    services = ecs_controller.get_services('test-cluster', fields=Selector.parse('name=web', SERVICE_FIELDS))
+
+    assert [(s['ServiceName'], s['EC2Instances']) for s in services] == [('web', 'i-1')]
+    client.list_services.assert_not_called()
+    assert client.describe_services.call_args.kwargs['services'] == ['web']
+    assert client.list_tasks.call_args.kwargs['serviceName'] == 'web'
+
+def test_get_services_by_label_skips_known_mismatches(ecs_controller):
+    """Test that tags are described once and services known not to match are skipped."""
+    from ecsctl.selectors import Selector
+
+    services = {
+        'web': _service('web', [('team', 'payments')]),
+        'search': _service('search', [('team', 'search')]),
+    }
+    client = ecs_controller.ecs_client
+    client.list_services = MagicMock(return_value={'serviceArns': ['service/web', 'service/search']})
+    client.describe_services = MagicMock(side_effect=lambda **kwargs: {
+        'services': [services[arn.split('/')[-1]] for arn in kwargs['services']]
+    })
+
+    labels = Selector.parse('team=payments')
+    first = ecs_controller.iter_services('test-cluster', ec2_instances=False, labels=labels)
+    assert [s['ServiceName'] for s in first] == ['web']
+    assert client.describe_services.call_args.kwargs['include'] == ['TAGS']
+
+    second = ecs_controller.iter_services('test-cluster', ec2_instances=False, labels=labels)
+    assert [s['ServiceName'] for s in second] == ['web']
+    assert client.describe_services.call_args.kwargs['services'] == ['service/web']
+
+def test_get_containers_pushes_field_selector_into_list_tasks(ecs_controller):
+    """Test that task field equalities become list_tasks filters."""
+    from ecsctl.selectors import TASK_FIELDS, Selector
+
+    client = ecs_controller.ecs_client
+    client.list_tasks = MagicMock(return_value={'taskArns': ['task/1', 'task/2']})
+    client.describe_tasks = MagicMock(return_value={'tasks': [{
+        'taskArn': f'task/{n}',
+        'taskDefinitionArn': 'arn:aws:ecs:region:account:task-definition/web:3',
+        'launchType': 'FARGATE',
+        'lastStatus': status,
+        'desiredStatus': 'RUNNING',
+        'containers': [{'name': 'app', 'lastStatus': status}]
+    } for n, status in ((1, 'RUNNING'), (2, 'PENDING'))]})
+
+    containers = ecs_controller.get_containers(
+        'test-cluster', fields=Selector.parse('family=web,launchType=FARGATE,lastStatus=RUNNING', TASK_FIELDS)
+    )
+
+    assert [container['TaskId'] for container in containers] == ['1']
+    list_kwargs = client.list_tasks.call_args.kwargs
+    assert list_kwargs['family'] == 'web'
+    assert list_kwargs['launchType'] == 'FARGATE'
+    assert 'include' not in client.describe_tasks.call_args.kwargs
+
+def test_get_task_definitions_pushes_status_and_family(ecs_controller):
+    """Test that task definition fields are listed with server-side filters."""
+    from ecsctl.selectors import TASK_DEFINITION_FIELDS, Selector
+
+    client = ecs_controller.ecs_client
+    client.list_task_definitions = MagicMock(return_value={'taskDefinitionArns': [
+        'arn:aws:ecs:region:account:task-definition/web:1',
+        'arn:aws:ecs:region:account:task-definition/web-canary:1',
+    ]})
+    client.describe_task_definition = MagicMock(
+        side_effect=lambda taskDefinition: _task_definition(taskDefinition)
+    )
+
+    rows = ecs_controller.get_task_definitions(
+        fields=Selector.parse('family=web,status=ACTIVE', TASK_DEFINITION_FIELDS)
+    )
+
+    assert [row['Family'] for row in rows] == ['web']
+    list_kwargs = client.list_task_definitions.call_args.kwargs
+    assert list_kwargs['familyPrefix'] == 'web'
+    assert list_kwargs['status'] == 'ACTIVE'
+
+def test_get_capacity_takes_one_batched_snapshot(ecs_controller):
+    """Test that capacity comes from batched container instance and task listings."""
+    client = ecs_controller.ecs_client
+    client.list_container_instances = MagicMock(return_value={'containerInstanceArns': ['ci/1']})
+    client.describe_container_instances = MagicMock(return_value={'containerInstances': [{
+        'containerInstanceArn': 'ci/1', 'ec2InstanceId': 'i-1', 'status': 'ACTIVE',
+        'registeredResources': [{'name': 'CPU', 'integerValue': 2048}, {'name': 'MEMORY', 'integerValue': 4096}],
+        'remainingResources': [{'name': 'CPU', 'integerValue': 1024}, {'name': 'MEMORY', 'integerValue': 2048}],
+    }]})
+    client.list_tasks = MagicMock(return_value={'taskArns': ['task/1']})
+    client.describe_tasks = MagicMock(return_value={'tasks': [{
+        'taskArn': 'task/1', 'group': 'service:web', 'containerInstanceArn': 'ci/1',
+        'cpu': '1024', 'memory': '2048'
+    }]})
+
+    capacity = ecs_controller.get_capacity('test-cluster')
+
+    assert capacity.nodes()[0]['CpuUtilization'] == 50.0
+    assert capacity.services()[0]['MemoryShare'] == 50.0
+    ecs_controller.ec2_client.describe_instances.assert_not_called()
+    assert client.describe_tasks.call_count == 1
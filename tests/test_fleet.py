@@ -0,0 +1,65 @@
+"""Unit tests for multi-cluster and multi-region queries."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from ecsctl.ecs_controller import ECSController
+from ecsctl.fleet import fleet_rows, resolve_targets
+
+@pytest.fixture
+def ecs_controller():
+    """Create an ECSController whose clients are separate mocks per region."""
+    clients = {}
+
+    def client(service_name, region_name='ap-southeast-1', config=None):
+        return clients.setdefault((service_name, region_name), MagicMock())
+
+    with patch('ecsctl.ecs_controller.AWSClient') as aws_client_class, \
+         patch('boto3.Session') as session_class, \
+         patch('ecsctl.ecs_controller.ClusterConfig'):
+        aws_client_class.return_value.region = 'ap-southeast-1'
+        session_class.return_value.client.side_effect = client
+        controller = ECSController(concurrency=4)
+        controller.clients = clients
+        controller.session_class = session_class
+        yield controller
+
+def test_resolve_targets_lists_clusters_of_every_region(ecs_controller):
+    """Test that --all-clusters lists clusters per region with one session."""
+    for region, names in [('ap-southeast-1', ['prod']), ('us-east-1', ['prod', 'batch'])]:
+        ecs_controller.for_region(region).ecs_client.list_clusters.return_value = {
+            'clusterArns': [f'arn:aws:ecs:{region}:123456789012:cluster/{name}' for name in names]
+        }
+
+    targets = resolve_targets(ecs_controller, ['ap-southeast-1', 'us-east-1'])
+
+    assert [str(target) for target in targets] == [
+        'prod (ap-southeast-1)', 'prod (us-east-1)', 'batch (us-east-1)'
+    ]
+    assert ecs_controller.session_class.call_count == 1
+
+def test_fleet_rows_merges_targets_and_reports_failures(ecs_controller):
+    """Test that rows carry their region and cluster and failures are collected."""
+    targets = resolve_targets(ecs_controller, ['ap-southeast-1', 'us-east-1', 'eu-west-1'], 'prod')
+
+    def fetch(target):
+        if target.region == 'eu-west-1':
+            raise RuntimeError('ClusterNotFoundException')
+        return [{'ServiceName': f'web-{target.region}'}]
+
+    rows = list(fleet_rows(ecs_controller, targets, fetch, label='get services'))
+
+    assert rows == [
+        {'Region': 'ap-southeast-1', 'Cluster': 'prod', 'ServiceName': 'web-ap-southeast-1'},
+        {'Region': 'us-east-1', 'Cluster': 'prod', 'ServiceName': 'web-us-east-1'},
+    ]
+    assert [str(error) for error in ecs_controller.errors] == [
+        'get services failed for prod (eu-west-1): ClusterNotFoundException'
+    ]
+
+def test_regional_controllers_share_the_rate_limiter(ecs_controller):
+    """Test that every region draws from the same limiter, bucketed by region."""
+    regional = ecs_controller.for_region('us-east-1')
+    assert regional.rate_limiter is ecs_controller.rate_limiter
+    assert regional.client_config is ecs_controller.client_config
+    assert ecs_controller.for_region('us-east-1') is regional
+    assert regional.for_region('ap-southeast-1') is ecs_controller
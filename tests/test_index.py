@@ -0,0 +1,92 @@
+"""Unit tests for the container instance index."""
+
+import pytest
+from unittest.mock import MagicMock
+from ecsctl.index import ContainerInstanceIndex, TagIndex, TaskSnapshot
+from ecsctl.selectors import Selector
+
+def _describe_container_instances(cluster, containerInstances):
+    return {'containerInstances': [{
+        'containerInstanceArn': arn,
+        'ec2InstanceId': f"i-{arn.split('/')[-1]}"
+    } for arn in containerInstances]}
+
+@pytest.fixture
+def ecs_client():
+    """Create a mocked ECS client answering describe_container_instances."""
+    client = MagicMock()
+    client.describe_container_instances = MagicMock(side_effect=_describe_container_instances)
+    return client
+
+def test_resolve_deduplicates_arns(ecs_client):
+    """Test that repeated ARNs are described once in a single batch."""
+    index = ContainerInstanceIndex(ecs_client, 'test-cluster')
+    arns = [f'arn:aws:ecs:region:account:container-instance/{i % 10}' for i in range(500)]
+
+    resolved = index.resolve(arns + [None])
+    assert len(resolved) == 10
+    assert index.get(arns[3]) == 'i-3'
+    ecs_client.describe_container_instances.assert_called_once()
+    assert len(ecs_client.describe_container_instances.call_args.kwargs['containerInstances']) == 10
+
+def test_resolve_skips_known_arns(ecs_client):
+    """Test that seeded and previously resolved ARNs are not described again."""
+    index = ContainerInstanceIndex(ecs_client, 'test-cluster')
+    index.add([{'containerInstanceArn': 'arn/known', 'ec2InstanceId': 'i-known'}])
+
+    index.resolve(['arn/known'])
+    ecs_client.describe_container_instances.assert_not_called()
+
+    index.resolve([f'arn/{i}' for i in range(150)])
+    index.resolve(['arn/1', 'arn/149'])
+    assert ecs_client.describe_container_instances.call_count == 2
+    assert index.ec2_instance_ids(['arn/1', 'arn/1', 'arn/known', None]) == ['i-1', 'i-known']
+    assert index.get('arn/unknown') == 'N/A'
+
+def test_task_snapshot_groups_by_service():
+    """Test that tasks are grouped by their service group."""
+    tasks = [
+        {'taskArn': 'task/1', 'group': 'service:web', 'containerInstanceArn': 'ci/1'},
+        {'taskArn': 'task/2', 'group': 'service:web', 'containerInstanceArn': 'ci/1'},
+        {'taskArn': 'task/3', 'group': 'family:batch', 'containerInstanceArn': 'ci/2'},
+        {'taskArn': 'task/4', 'group': 'service:worker'}
+    ]
+    snapshot = TaskSnapshot('test-cluster', tasks)
+
+    assert len(snapshot) == 4
+    assert [task['taskArn'] for task in snapshot.service_tasks('web')] == ['task/1', 'task/2']
+    assert snapshot.service_tasks('batch') == []
+    assert snapshot.container_instance_arns() == ['ci/1', 'ci/2']
+
+def test_tag_index_tells_which_resources_can_match():
+    """Test that the index keeps the latest tags of each described resource."""
+    tags = TagIndex()
+    tags.add('service/web', {'team': 'payments'})
+    tags.add('service/worker', {'team': 'search'})
+    tags.add('service/worker', {'team': 'payments', 'env': 'dev'})
+
+    selector = Selector.parse('team=payments,env!=dev')
+    assert tags.select(selector) == ['service/web']
+    assert not tags.matches('service/worker', selector)
+    assert 'service/unknown' not in tags
+    assert tags.tags('service/unknown') == {}
+
+    tags.clear()
+    assert len(tags) == 0
+
+def test_tag_index_expires_tags(monkeypatch):
+    """Test that expired tags count as unknown, so the resource is described again."""
+    now = [1000.0]
+    monkeypatch.setattr('ecsctl.index.time.monotonic', lambda: now[0])
+    tags = TagIndex(ttl=60)
+    tags.add('service/web', {'team': 'search'})
+    selector = Selector.parse('team=payments')
+    assert 'service/web' in tags and not tags.matches('service/web', selector)
+
+    now[0] += 60
+    assert 'service/web' not in tags
+    assert tags.tags('service/web') == {}
+    assert tags.select(Selector.parse('team=search')) == []
+
+    tags.add('service/web', {'team': 'payments'})
+    assert tags.select(selector) == ['service/web']
@@ -0,0 +1,73 @@
+"""Unit tests for AWS API call instrumentation."""
+
+import json
+import boto3
+import pytest
+from botocore.stub import Stubber
+from ecsctl.instrumentation import ApiProfiler, latency_histogram
+
+@pytest.fixture
+def ecs_client(monkeypatch):
+    """Create a real ECS client that never reaches AWS."""
+    monkeypatch.delenv('AWS_PROFILE')
+    return boto3.Session(
+        aws_access_key_id='testing',
+        aws_secret_access_key='testing',
+        region_name='ap-southeast-1'
+    ).client('ecs')
+
+def test_profiler_records_calls_and_errors(ecs_client):
+    """Test that every call of a registered client becomes a span."""
+    profiler = ApiProfiler()
+    profiler.register(ecs_client)
+
+    with Stubber(ecs_client) as stubber:
+        stubber.add_response('list_clusters', {'clusterArns': []})
+        stubber.add_response('list_clusters', {'clusterArns': []})
+        stubber.add_client_error('list_tasks', service_error_code='ClusterNotFoundException')
+        ecs_client.list_clusters()
+        ecs_client.list_clusters()
+        with pytest.raises(Exception):
+            ecs_client.list_tasks(cluster='missing')
+
+    summary = profiler.summary()
+    assert summary['ecs.ListClusters']['calls'] == 2
+    assert summary['ecs.ListClusters']['errors'] == 0
+    assert summary['ecs.ListTasks']['errors'] == 1
+    assert sum(summary['ecs.ListClusters']['histogram'].values()) == 2
+
+def test_profiler_counts_retries_and_throttles():
+    """Test that throttled attempts are counted against their call."""
+    profiler = ApiProfiler()
+    model = type('Model', (), {'name': 'DescribeTasks'})()
+    model.service_model = type('ServiceModel', (), {'service_name': 'ecs'})()
+    context = {}
+    throttled = (None, {'Error': {'Code': 'ThrottlingException'}})
+
+    profiler._before_call(model=model, context=context)
+    profiler._needs_retry(request_dict={'context': context}, attempts=1, response=throttled)
+    profiler._needs_retry(request_dict={'context': context}, attempts=2, response=throttled)
+    profiler._after_call(context=context, parsed={'ResponseMetadata': {'RetryAttempts': 2}})
+
+    span = profiler.spans[0]
+    assert (span.operation, span.retries, span.throttles) == ('ecs.DescribeTasks', 2, 2)
+
+def test_profiler_writes_chrome_trace(ecs_client, tmp_path):
+    """Test that spans can be exported in the Chrome trace event format."""
+    profiler = ApiProfiler()
+    profiler.register(ecs_client)
+    with Stubber(ecs_client) as stubber:
+        stubber.add_response('list_clusters', {'clusterArns': []})
+        ecs_client.list_clusters()
+
+    path = tmp_path / 'trace.json'
+    profiler.write(str(path), 'chrome')
+    events = json.loads(path.read_text())['traceEvents']
+    assert [(event['name'], event['ph']) for event in events] == [('ecs.ListClusters', 'X')]
+
+def test_latency_histogram_buckets():
+    """Test that latencies are counted in their upper-bound bucket."""
+    histogram = latency_histogram([5, 10, 11, 7000])
+    assert histogram['<=10ms'] == 2
+    assert histogram['<=25ms'] == 1
+    assert histogram['>5000ms'] == 1
@@ -0,0 +1,84 @@
+"""Unit tests for the compact resource models."""
+
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from ecsctl.models import Instance, Service, Task, TaskDefinition
+from ecsctl.output import write_json
+
+@pytest.fixture
+def task():
+    """Create a describe_tasks entry with fields ecsctl does not use."""
+    return {
+        'taskArn': 'arn:aws:ecs:ap-southeast-1:123456789012:task/prod/abc',
+        'group': 'service:web',
+        'containerInstanceArn': 'ci/1',
+        'createdAt': datetime(2024, 1, 1, tzinfo=timezone.utc),
+        'attachments': [{'details': [{'name': 'eni', 'value': 'eni-1'}] * 10}],
+        'containers': [
+            {'name': 'app', 'lastStatus': 'RUNNING', 'cpu': '256', 'networkBindings': [{}] * 5},
+            {'name': 'sidecar', 'lastStatus': 'RUNNING'}
+        ]
+    }
+
+def test_models_behave_like_row_dictionaries():
+    """Test that models can be read, compared and serialized like dict rows."""
+    instance = Instance.from_response(
+        {'ec2InstanceId': 'i-1', 'status': 'ACTIVE', 'runningTasksCount': 2},
+        {'InstanceType': 't3.large', 'State': {'Name': 'running'}}
+    )
+
+    assert instance['InstanceId'] == instance.instance_id == 'i-1'
+    assert instance.get('SSM') is None
+    assert 'SSM' not in instance
+    assert list(instance) == ['InstanceId', 'InstanceType', 'State', 'Status', 'RunningTasks']
+    assert instance == {
+        'InstanceId': 'i-1', 'InstanceType': 't3.large', 'State': 'running',
+        'Status': 'ACTIVE', 'RunningTasks': 2
+    }
+    assert {'Region': 'us-east-1', **instance}['Region'] == 'us-east-1'
+    assert not hasattr(instance, '__dict__')
+    with pytest.raises(KeyError):
+        instance['Missing']
+
+    stream = io.StringIO()
+    write_json([instance], stream)
+    assert json.loads(stream.getvalue()) == [instance.as_dict()]
+
+def test_optional_ssm_field_is_included_when_requested():
+    """Test that the SSM field appears once statuses are resolved."""
+    instance = Instance.from_response(
+        {'ec2InstanceId': 'i-2', 'status': 'ACTIVE', 'runningTasksCount': 0}, {}, {}
+    )
+    assert instance['SSM'] == 'NotRegistered'
+    assert instance['InstanceType'] == 'N/A'
+
+def test_task_keeps_only_used_fields(task):
+    """Test that a task drops the raw payload but still builds container rows."""
+    model = Task.from_response(task)
+
+    assert model.service_name == 'web'
+    assert model['containerInstanceArn'] == 'ci/1'
+    assert not hasattr(model, 'attachments')
+    rows = model.container_rows('i-1')
+    assert [row['Name'] for row in rows] == ['app', 'sidecar']
+    assert rows[0]['TaskId'] == 'abc'
+    assert rows[0]['EC2Instance'] == 'i-1'
+    assert rows[1]['CPU'] == 'N/A'
+
+def test_models_round_trip_through_json():
+    """Test that stored rows rebuild equal models."""
+    td = TaskDefinition.from_response({
+        'family': 'web', 'revision': 3, 'status': 'ACTIVE', 'cpu': '256',
+        'registeredAt': datetime(2024, 1, 1, tzinfo=timezone.utc)
+    })
+    service = Service.from_response(
+        {'serviceName': 'web', 'status': 'ACTIVE', 'taskDefinition': 'web:3',
+         'desiredCount': 2, 'runningCount': 2, 'pendingCount': 0},
+        ['i-1', 'i-2']
+    )
+
+    assert TaskDefinition.from_dict(json.loads(json.dumps(td.as_dict()))) == td
+    assert td['Memory'] == 'N/A'
+    assert service['EC2Instances'] == 'i-1, i-2'
@@ -0,0 +1,57 @@
+"""Unit tests for the get command output formats."""
+
+import io
+import json
+import pytest
+from rich.console import Console
+from ecsctl.output import write_rows
+
+ROWS = [
+    {'ServiceName': 'web', 'RunningCount': 2, 'EC2Instances': 'i-1, i-2'},
+    {'ServiceName': 'worker', 'RunningCount': 1, 'EC2Instances': 'i-3'},
+]
+
+def test_ndjson_writes_each_row_before_the_next_is_produced():
+    """Test that ndjson rows are flushed as soon as they are produced."""
+    stream = io.StringIO()
+
+    def rows():
+        for row in ROWS:
+            yield row
+            # The previous row is already written when the next one is requested
+            assert stream.getvalue().count('\n') >= 1
+
+    assert write_rows(rows(), 'ndjson', None, stream) == 2
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+def test_tsv_writes_header_and_rows():
+    """Test that tsv uses the fields of the first row as header."""
+    stream = io.StringIO()
+    rows = ROWS + [{'ServiceName': 'bad\tname', 'RunningCount': 0, 'EC2Instances': None}]
+    write_rows(iter(rows), 'tsv', None, stream)
+    assert stream.getvalue().splitlines() == [
+        'ServiceName\tRunningCount\tEC2Instances',
+        'web\t2\ti-1, i-2',
+        'worker\t1\ti-3',
+        'bad name\t0\t',
+    ]
+
+def test_json_writes_array():
+    """Test that json prints all rows as one array."""
+    stream = io.StringIO()
+    write_rows(iter(ROWS), 'json', None, stream)
+    assert json.loads(stream.getvalue()) == ROWS
+
+def test_wide_does_not_truncate_values():
+    """Test that wide output keeps long values intact on narrow terminals."""
+    file = io.StringIO()
+    console = Console(file=file, width=40)
+    long_value = 'arn:aws:ecs:ap-southeast-1:123456789012:task-definition/web:42'
+    write_rows([{'Family': 'web', 'TaskDefinitionArn': long_value}], 'wide', console)
+    assert long_value in file.getvalue()
+
+def test_unknown_format_is_rejected():
+    """Test that unknown output formats raise ValueError."""
+    with pytest.raises(ValueError):
+        write_rows([], 'yaml', None, io.StringIO())
@@ -0,0 +1,94 @@
+"""Unit tests for recording and replaying AWS API responses."""
+
+import gzip
+import json
+import boto3
+import pytest
+from datetime import datetime, timezone
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+from benchmarks.fake_aws import FakeAWS
+from ecsctl.ecs_controller import ECSController
+from ecsctl.recording import REPLAY_MISS_ERROR_CODE, ApiRecording
+
+@pytest.fixture
+def ecs_client(monkeypatch):
+    """Create a real ECS client that never reaches AWS."""
+    monkeypatch.delenv('AWS_PROFILE')
+    return boto3.Session(
+        aws_access_key_id='testing',
+        aws_secret_access_key='testing',
+        region_name='ap-southeast-1'
+    ).client('ecs')
+
+def _replay_client(tmp_path):
+    recording = ApiRecording(tmp_path, replay=True)
+    client = recording.session('ap-southeast-1').client('ecs')
+    recording.register(client)
+    return recording, client
+
+def test_recorded_responses_are_replayed(ecs_client, tmp_path):
+    """Test that responses, including timestamps and errors, replay per request."""
+    registered_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    ApiRecording(tmp_path).register(ecs_client)
+    with Stubber(ecs_client) as stubber:
+        stubber.add_response('list_clusters', {'clusterArns': ['arn:a']})
+        stubber.add_response('list_clusters', {'clusterArns': ['arn:b']}, {'nextToken': 't1'})
+        stubber.add_response(
+            'describe_task_definition',
+            {'taskDefinition': {'family': 'web', 'revision': 3, 'registeredAt': registered_at}},
+            {'taskDefinition': 'web:3'}
+        )
+        stubber.add_client_error('list_tasks', service_error_code='ClusterNotFoundException')
+        ecs_client.list_clusters()
+        ecs_client.list_clusters(nextToken='t1')
+        ecs_client.describe_task_definition(taskDefinition='web:3')
+        with pytest.raises(ClientError):
+            ecs_client.list_tasks(cluster='missing')
+
+    files = list(tmp_path.glob('ap-southeast-1/ecs/*.json.gz'))
+    assert len(files) == 4
+    assert 'status' in json.loads(gzip.decompress(files[0].read_bytes()))
+
+    recording, client = _replay_client(tmp_path)
+    assert client.list_clusters()['clusterArns'] == ['arn:a']
+    assert client.list_clusters(nextToken='t1')['clusterArns'] == ['arn:b']
+    task_definition = client.describe_task_definition(taskDefinition='web:3')['taskDefinition']
+    assert task_definition['registeredAt'] == registered_at
+    with pytest.raises(ClientError) as excinfo:
+        client.list_tasks(cluster='missing')
+    assert excinfo.value.response['Error']['Code'] == 'ClusterNotFoundException'
+    assert recording.misses == []
+
+def test_replay_reports_missing_responses(tmp_path, monkeypatch):
+    """Test that calls that were never recorded fail and are counted."""
+    monkeypatch.delenv('AWS_PROFILE')
+    recording, client = _replay_client(tmp_path)
+
+    with pytest.raises(ClientError) as excinfo:
+        client.list_services(cluster='web')
+
+    assert excinfo.value.response['Error']['Code'] == REPLAY_MISS_ERROR_CODE
+    assert recording.misses == ['ecs.ListServices']
+
+def test_controller_replays_recorded_run(tmp_path, monkeypatch):
+    """Test that a replayed controller returns the recorded rows without AWS calls."""
+    monkeypatch.delenv('AWS_PROFILE')
+    fake = FakeAWS(services=12, tasks=30, hosts=4, revisions=2)
+    recording = ApiRecording(tmp_path / 'run')
+    recorder = ECSController(concurrency=4, recording=recording)
+    recorder._session = fake.session(recorder.region)
+    services = recorder.get_services(fake.cluster_name)
+    task_definitions = recorder.get_task_definitions()
+    assert fake.total_calls > 0
+
+    # Replays work where the recorded profile and credentials do not exist
+    monkeypatch.setenv('AWS_PROFILE', 'missing-profile')
+    fake.reset_calls()
+    replayer = ECSController(concurrency=4, recording=ApiRecording(tmp_path / 'run', replay=True))
+
+    assert replayer.get_services(fake.cluster_name) == services
+    assert replayer.get_task_definitions() == task_definitions
+    assert replayer.errors == []
+    assert replayer.recording.misses == []
+    assert fake.total_calls == 0
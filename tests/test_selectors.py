@@ -0,0 +1,63 @@
+"""Unit tests for field and label selectors."""
+
+import pytest
+from ecsctl.selectors import (
+    EXISTS,
+    INSTANCE_FIELDS,
+    NOT_EQUALS,
+    NOT_EXISTS,
+    SERVICE_FIELDS,
+    Requirement,
+    Selector,
+    tag_dict,
+)
+
+def test_parse_field_selector():
+    """Test that field keys are matched case-insensitively and canonicalized."""
+    selector = Selector.parse('STATUS==ACTIVE, launchtype!=FARGATE', SERVICE_FIELDS)
+    assert selector.requirements == [
+        Requirement('status', '=', 'ACTIVE'),
+        Requirement('launchType', NOT_EQUALS, 'FARGATE'),
+    ]
+    assert selector.equals('status') == 'ACTIVE'
+    assert selector.equals('launchType') is None
+    assert str(selector) == 'status=ACTIVE,launchType!=FARGATE'
+
+def test_parse_normalizes_enum_values():
+    """Test that enum field values are spelled like AWS spells them."""
+    selector = Selector.parse('status=active,launchType!=fargate,state=Running', INSTANCE_FIELDS + SERVICE_FIELDS)
+    assert selector.equals('status') == 'ACTIVE'
+    assert selector.matches({'status': 'ACTIVE', 'launchType': 'EC2', 'state': 'running'})
+    assert Selector.parse('name=Web', SERVICE_FIELDS).equals('name') == 'Web'
+    assert Selector.parse('status=active').equals('status') == 'active'
+
+@pytest.mark.parametrize('spec', ['status', 'color=red', '=ACTIVE'])
+def test_parse_rejects_invalid_field_selectors(spec):
+    """Test that unknown fields and requirements without a value are rejected."""
+    with pytest.raises(ValueError):
+        Selector.parse(spec, SERVICE_FIELDS)
+
+def test_label_selector_matches_tags():
+    """Test equality, inequality and existence requirements on tags."""
+    selector = Selector.parse('team=payments,env!=dev,!deprecated')
+    assert [requirement.operator for requirement in selector.requirements][2] == NOT_EXISTS
+    assert Selector.parse('team').requirements == [Requirement('team', EXISTS)]
+
+    assert selector.matches({'team': 'payments'})
+    assert selector.matches({'team': 'payments', 'env': 'prod'})
+    assert not selector.matches({'team': 'payments', 'env': 'dev'})
+    assert not selector.matches({'team': 'payments', 'deprecated': 'true'})
+    assert not selector.matches({})
+
+def test_empty_selector_matches_everything():
+    """Test that no selector is falsy and matches any resource."""
+    assert not Selector.parse(None)
+    assert not Selector.parse(' , ')
+    assert Selector().matches({'anything': 'goes'})
+
+def test_tag_dict_reads_ecs_and_ec2_tags():
+    """Test that both tag spellings are converted."""
+    assert tag_dict([{'key': 'team', 'value': 'payments'}, {'Key': 'Name', 'Value': 'web-1'}]) == {
+        'team': 'payments', 'Name': 'web-1'
+    }
+    assert tag_dict(None) == {}
@@ -0,0 +1,81 @@
+"""Unit tests for the interactive shell."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from ecsctl.cache import MemoryCache
+from ecsctl.cli import cli
+from ecsctl.models import Instance, Service
+from ecsctl.shell import EcsShell
+
+@pytest.fixture
+def ecs():
+    """Create a controller mock with an in-memory result cache."""
+    controller = MagicMock()
+    controller.cache = MemoryCache('123456789012', 'ap-southeast-1', ttl=60)
+    controller.errors = []
+    controller.config.get_current_cluster.return_value = 'prod'
+    controller.aws_client.profile_name = None
+    controller.aws_client.region = 'ap-southeast-1'
+    controller.get_clusters.return_value = ['prod', 'batch']
+    controller.get_ec2_instances.return_value = [
+        Instance(instance_id=f'i-{n}', instance_type='t3.large', state='running',
+                 status='ACTIVE', running_tasks=1, ssm='Online')
+        for n in range(2)
+    ]
+    controller.get_services.return_value = [
+        Service(name=name, status='ACTIVE', task_definition=f'{name}:1', desired_count=1,
+                running_count=1, pending_count=0, ec2_instances='i-0')
+        for name in ('web', 'worker')
+    ]
+    return controller
+
+@pytest.fixture
+def shell(ecs):
+    """Create a shell with the defaults of ecsctl shell."""
+    return EcsShell(ecs, cli, {'cached': True})
+
+def test_commands_reuse_recent_results(shell, ecs):
+    """Test that a repeated listing is served from the shell's cache until refreshed."""
+    shell.onecmd('get services')
+    shell.onecmd('get services -o json')
+    assert ecs.get_services.call_count == 1
+    assert ecs.begin_command.call_count == 2
+
+    shell.onecmd('refresh')
+    shell.onecmd('get services')
+    assert ecs.get_services.call_count == 2
+    assert shell.prompt == 'ecsctl:prod> '
+
+def test_exec_after_get_ec2_needs_no_lookup(shell, ecs):
+    """Test that exec trusts the SSM status listed by the previous get ec2 --ssm."""
+    shell.onecmd('get ec2')
+    ecs.get_ec2_instances.assert_called_once_with('prod', False)
+    with patch('ecsctl.cli.subprocess.run'):
+        shell.onecmd('exec i-1')
+    ecs.check_exec_target.assert_called_once_with('prod', 'i-1')
+    ecs.check_exec_target.reset_mock()
+
+    shell.onecmd('get ec2 --ssm')
+    ecs.get_ec2_instances.assert_called_with('prod', True)
+
+    with patch('ecsctl.cli.subprocess.run') as run:
+        assert shell.run(['exec', 'i-1']) == 0
+        shell.onecmd('exec i-9')
+
+    ecs.check_exec_target.assert_called_once_with('prod', 'i-9')
+    assert run.call_args_list[0][0][0][:5] == ['aws', 'ssm', 'start-session', '--target', 'i-1']
+
+def test_completion_uses_fetched_names(shell):
+    """Test that commands, options and names from earlier listings complete."""
+    assert shell.completenames('use') == ['use-cluster']
+    assert shell.completedefault('', 'get ', 4, 4) == ['containers', 'ec2', 'services', 'task-definitions']
+    assert shell.completedefault('', 'exec ', 5, 5) == []
+
+    shell.onecmd('get-clusters')
+    shell.onecmd('get ec2')
+    shell.onecmd('get services')
+
+    assert shell.completedefault('b', 'use-cluster b', 12, 13) == ['batch']
+    assert shell.completedefault('i-', 'exec i-', 5, 7) == ['i-0', 'i-1']
+    assert shell.completedefault('w', 'get containers --service w', 25, 26) == ['web', 'worker']
+    assert '--desired-status' in shell.completedefault('--d', 'get containers --d', 15, 18)
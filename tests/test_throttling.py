@@ -0,0 +1,86 @@
+"""Unit tests for client-side rate limiting and the retry policy."""
+
+import pytest
+from ecsctl.throttling import (
+    MIN_RATE,
+    THROTTLE_COOLDOWN,
+    RateLimiter,
+    TokenBucket,
+    parse_rate_limits,
+    retry_config,
+)
+
+class FakeClock:
+    """Monotonic clock advanced by the sleeps it is asked for."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+def test_bucket_paces_callers_after_the_burst():
+    """Test that tokens beyond the burst are handed out at the sustained rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(4)]
+
+    # Callers reserve tokens in order, so each one waits a tenth of a second longer
+    assert waits == pytest.approx([0.0, 0.0, 0.1, 0.2])
+    assert clock.slept == pytest.approx([0.1, 0.2])
+    clock.now = 10.0
+    assert bucket.acquire() == 0.0
+
+def test_bucket_backs_off_on_throttling_and_recovers():
+    """Test that throttling halves the rate once per cooldown and successes restore it."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=20.0, capacity=100, clock=clock, sleep=clock.sleep)
+
+    bucket.throttled()
+    bucket.throttled()
+    assert bucket.rate == 10.0
+    assert bucket.throttles == 2
+    # The burst is dropped, so the next call is already paced
+    assert bucket.acquire() == pytest.approx(0.1)
+
+    clock.now += THROTTLE_COOLDOWN
+    for _ in range(10):
+        bucket.throttled()
+        clock.now += THROTTLE_COOLDOWN
+    assert bucket.rate == MIN_RATE
+
+    for _ in range(100):
+        bucket.succeeded()
+    assert bucket.rate == 20.0
+
+def test_limiter_shares_buckets_per_service_and_region():
+    """Test that clients of a service and region draw from the same bucket."""
+    limiter = RateLimiter({'ssm': (0.0, 0), 'ecs': (5.0, 10)})
+
+    assert limiter.bucket('ecs', 'us-east-1') is limiter.bucket('ecs', 'us-east-1')
+    assert limiter.bucket('ecs', 'us-east-1') is not limiter.bucket('ecs', 'eu-west-1')
+    assert limiter.bucket('ecs', 'us-east-1').rate == 5.0
+    assert limiter.bucket('ec2', 'us-east-1').rate == 20.0
+    assert limiter.bucket('ssm', 'us-east-1') is None
+    assert limiter.bucket('sts', 'us-east-1') is None
+
+def test_parse_rate_limits():
+    """Test the --rate-limit syntax."""
+    assert parse_rate_limits('ecs=10:40, SSM=2.5,ec2=0') == {
+        'ecs': (10.0, 40), 'ssm': (2.5, 2), 'ec2': (0.0, 0)
+    }
+    for spec in ('ecs', 'ecs=fast', 'ecs=-1', '=5'):
+        with pytest.raises(ValueError):
+            parse_rate_limits(spec)
+
+def test_retry_config():
+    """Test that retry settings map to botocore's client configuration."""
+    config = retry_config(max_attempts=8, mode='adaptive')
+    assert config.retries == {'total_max_attempts': 8, 'mode': 'adaptive'}
+    with pytest.raises(ValueError):
+        retry_config(mode='aggressive')
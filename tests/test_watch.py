@@ -0,0 +1,103 @@
+"""Unit tests for incremental watch polling."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from ecsctl.ecs_controller import ECSController
+from ecsctl.watch import InstanceWatcher, ServiceWatcher, changed_keys
+
+@pytest.fixture
+def ecs_controller():
+    """Create ECSController instance for testing."""
+    with patch('ecsctl.ecs_controller.AWSClient'), \
+         patch('boto3.Session'), \
+         patch('ecsctl.ecs_controller.ClusterConfig'):
+        yield ECSController(concurrency=1)
+
+def _service(name, running):
+    return {
+        'serviceName': name,
+        'status': 'ACTIVE',
+        'taskDefinition': f'task-definition/{name}:1',
+        'desiredCount': 2,
+        'runningCount': running,
+        'pendingCount': 0,
+        'deployments': [{'id': 'ecs-svc/1', 'status': 'PRIMARY'}]
+    }
+
+def test_service_watcher_skips_unchanged_polls(ecs_controller):
+    """Test that tasks are only re-listed and described when services change."""
+    client = ecs_controller.ecs_client
+    client.list_services = MagicMock(return_value={'serviceArns': ['web']})
+    client.describe_services = MagicMock(side_effect=[
+        {'services': [_service('web', 1)]},
+        {'services': [_service('web', 1)]},
+        {'services': [_service('web', 2)]},
+    ])
+    client.list_tasks = MagicMock(side_effect=[
+        {'taskArns': ['task/1']},
+        {'taskArns': ['task/1', 'task/2']},
+    ])
+    client.describe_tasks = MagicMock(side_effect=lambda cluster, tasks: {'tasks': [{
+        'taskArn': arn,
+        'group': 'service:web',
+        'containerInstanceArn': f"ci/{arn.split('/')[-1]}"
+    } for arn in tasks]})
+    client.describe_container_instances = MagicMock(
+        side_effect=lambda cluster, containerInstances: {'containerInstances': [{
+            'containerInstanceArn': arn,
+            'ec2InstanceId': f"i-{arn.split('/')[-1]}"
+        } for arn in containerInstances]}
+    )
+
+    watcher = ServiceWatcher(ecs_controller, 'test-cluster')
+    first = watcher.poll()
+    second = watcher.poll()
+    third = watcher.poll()
+
+    assert first == second
+    assert first[0]['EC2Instances'] == 'i-1'
+    assert third[0]['EC2Instances'] == 'i-1, i-2'
+    assert client.list_tasks.call_count == 2
+    assert [call.kwargs['tasks'] for call in client.describe_tasks.call_args_list] == [
+        ['task/1'], ['task/2']
+    ]
+    assert changed_keys(second, third, ServiceWatcher.key) == {'web'}
+
+def test_instance_watcher_describes_changed_instances_only(ecs_controller):
+    """Test that EC2 metadata is only fetched for new or changed instances."""
+    def container_instance(instance_id, status, tasks):
+        return {
+            'containerInstanceArn': f'ci/{instance_id}',
+            'ec2InstanceId': instance_id,
+            'status': status,
+            'agentConnected': True,
+            'runningTasksCount': tasks
+        }
+
+    ecs_controller.ecs_client.list_container_instances = MagicMock(
+        return_value={'containerInstanceArns': ['ci/i-1', 'ci/i-2']}
+    )
+    ecs_controller.ecs_client.describe_container_instances = MagicMock(side_effect=[
+        {'containerInstances': [container_instance('i-1', 'ACTIVE', 1),
+                                container_instance('i-2', 'ACTIVE', 1)]},
+        {'containerInstances': [container_instance('i-1', 'ACTIVE', 3),
+                                container_instance('i-2', 'DRAINING', 0)]},
+    ])
+    ecs_controller.ec2_client.describe_instances = MagicMock(side_effect=lambda InstanceIds: {
+        'Reservations': [{'Instances': [{
+            'InstanceId': instance_id,
+            'InstanceType': 'm5.large',
+            'State': {'Name': 'running'}
+        } for instance_id in InstanceIds]}]
+    })
+
+    watcher = InstanceWatcher(ecs_controller, 'test-cluster')
+    first = watcher.poll()
+    second = watcher.poll()
+
+    assert [row['RunningTasks'] for row in second] == [3, 0]
+    assert second[0]['InstanceType'] == 'm5.large'
+    assert [call.kwargs['InstanceIds'] for call in
+            ecs_controller.ec2_client.describe_instances.call_args_list] == [['i-1', 'i-2'], ['i-2']]
+    assert changed_keys(first, second, InstanceWatcher.key) == {'i-1', 'i-2'}
+    assert changed_keys(None, second, InstanceWatcher.key) == set()